@@ -21,32 +21,53 @@ exports.predictAttrition = async (req, res, next) => {
   }
 };
 
+const isValidThreshold = (value) => !Number.isNaN(value) && value > 0 && value < 1;
+
 exports.getAttritionOverview = async (req, res, next) => {
   try {
     const limit = Number(req.query.limit) || 50;
     const threshold = Number(req.query.threshold ?? 0.5);
+    // ?thresholds=0.3,0.5,0.7 compares several cut-offs from one scoring pass
+    const thresholds = req.query.thresholds
+      ? String(req.query.thresholds).split(',').map(Number)
+      : [];
+    // ?top_k=20 returns only the 20 highest-risk samples, sorted by probability
+    const topK = req.query.top_k !== undefined ? Number(req.query.top_k) : null;
 
-    if (Number.isNaN(threshold) || threshold <= 0 || threshold >= 1) {
+    if (!isValidThreshold(threshold) || !thresholds.every(isValidThreshold)) {
       return res.status(400).json({
         message: 'threshold must be a number between 0 and 1',
       });
     }
+    if (topK !== null && (!Number.isInteger(topK) || topK < 1)) {
+      return res.status(400).json({
+        message: 'top_k must be a positive integer',
+      });
+    }
 
     const samples = await loadAttritionSamples(limit);
-    const predictions = await predictAttritionBatch(
+    const result = await predictAttritionBatch(
       samples.map((sample) => ({ components: sample.components })),
-      threshold
+      threshold,
+      { thresholds: [threshold, ...thresholds], topK, layout: 'columns' }
     );
 
-    const items = samples.map((sample, index) => {
-      const prediction = predictions[index] || {};
+    // Columnar response: "index" (only with top_k) maps each row back to its sample
+    const order = result.index || samples.map((_, index) => index);
+    const items = order.map((sampleIndex, position) => {
+      const sample = samples[sampleIndex];
       const metadata = sample.metadata || {};
       const duLieuGiaLap = metadata.du_lieu_gia_lap || {};
+      const labels = {};
+      Object.entries(result.labels || {}).forEach(([key, values]) => {
+        labels[key] = values[position];
+      });
       return {
         ten_mo_hinh: sample.ten_mo_hinh,
         phien_ban: sample.phien_ban,
-        probability: prediction.probability ?? null,
-        label: prediction.label ?? null,
+        probability: result.probability[position] ?? null,
+        label: result.label[position] ?? null,
+        labels,
         trang_thai: metadata.trang_thai,
         ung_dung: metadata.ung_dung,
         thong_tin_ca_nhan: duLieuGiaLap.thong_tin_ca_nhan,
@@ -56,21 +77,24 @@ exports.getAttritionOverview = async (req, res, next) => {
       };
     });
 
-    const total = items.length;
-    const highRisk = items.filter((item) => item.label === 1).length;
-    const averageProbability =
-      total > 0
-        ? Number(
-            (
-              items.reduce((sum, item) => sum + (item.probability ?? 0), 0) /
-              total
-            ).toFixed(4)
-          )
-        : 0;
+    // Whole-batch positives per threshold, also correct when top_k trims the items
+    const highRiskByThreshold = result.positives || {};
+    const total = samples.length;
+    const thresholdKey = Object.keys(highRiskByThreshold).find((key) => Number(key) === threshold);
+    const highRisk = thresholdKey !== undefined
+      ? highRiskByThreshold[thresholdKey]
+      : items.filter((item) => item.label === 1).length;
+    // Whole-batch mean from the service: the items only cover the top_k when it is set
+    const meanProbability =
+      typeof result.mean_probability === 'number'
+        ? result.mean_probability
+        : items.reduce((sum, item) => sum + (item.probability ?? 0), 0) / (items.length || 1);
+    const averageProbability = Number(meanProbability.toFixed(4));
 
     res.json({
       total,
       high_risk: highRisk,
+      high_risk_by_threshold: highRiskByThreshold,
       average_probability: averageProbability,
       items,
     });
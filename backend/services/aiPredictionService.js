@@ -3,6 +3,22 @@ const axios = require('axios');
 const ML_SERVICE_URL =
   process.env.ML_SERVICE_URL || 'http://localhost:8001';
 
+/**
+ * /predict URL with the main threshold plus optional extra thresholds,
+ * top-k selection and response layout ("rows" | "columns")
+ */
+function buildPredictUrl(threshold, { thresholds, topK, layout } = {}) {
+  const params = new URLSearchParams({ threshold: String(threshold) });
+  (thresholds || []).forEach((value) => params.append('thresholds', String(value)));
+  if (topK) {
+    params.append('top_k', String(topK));
+  }
+  if (layout) {
+    params.append('layout', layout);
+  }
+  return `${ML_SERVICE_URL}/predict?${params.toString()}`;
+}
+
 async function predictAttrition(components, threshold = 0.5) {
   if (!Array.isArray(components) || components.length === 0) {
     throw new Error('components must be a non-empty array');
@@ -27,7 +43,7 @@ async function predictAttrition(components, threshold = 0.5) {
   }
 }
 
-async function predictAttritionBatch(samples, threshold = 0.5) {
+async function predictAttritionBatch(samples, threshold = 0.5, options = {}) {
   if (!Array.isArray(samples) || samples.length === 0) {
     throw new Error('samples must be a non-empty array');
   }
@@ -35,7 +51,7 @@ async function predictAttritionBatch(samples, threshold = 0.5) {
   try {
     const payload = { samples };
     const response = await axios.post(
-      `${ML_SERVICE_URL}/predict?threshold=${threshold}`,
+      buildPredictUrl(threshold, options),
       payload,
       { timeout: 10000 }
     );
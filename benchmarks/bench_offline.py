@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark the offline dataset scripts end to end on synthetic data
+
+For each --sizes N a raw export of N records is generated (synthetic.py) and
+the pipeline runs as separate processes, exactly as documented:
+
+    clean_dataset -> reduce_dim -> prepare_train_test -> train_model -> infer_attrition
+                  -> reduce_dim_cnn
+
+Each step is timed (wall clock) and its peak RSS is read from the child's
+rusage. Results are per step and size; items_per_s is input records per second.
+The last size's model is published to <workdir>/registry, so bench_predict.py
+can score with it (--model-dir).
+
+Usage
+-----
+python benchmarks/bench_offline.py --sizes 1000 10000 --workdir /tmp/bench --report offline.json
+"""
+
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import DATASET_DIR, REPO_ROOT, print_row, summarize, write_report
+from synthetic import generate_records, write_records
+
+STEPS = ["clean_dataset", "reduce_dim", "prepare_train_test", "train_model", "infer_attrition", "reduce_dim_cnn"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the offline dataset scripts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=STEPS)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per step (percentiles over runs)")
+    parser.add_argument("--components", type=int, default=20, help="PCA / CNN components")
+    parser.add_argument("--cnn-epochs", type=int, default=3, help="reduce_dim_cnn --epochs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=pathlib.Path, help="Keep inputs/outputs here (default: temp dir)")
+    parser.add_argument("--report", type=pathlib.Path, help="Optional path to write the JSON report")
+    return parser.parse_args()
+
+
+def commands(work, components, cnn_epochs):
+    script = lambda name: str(DATASET_DIR / f"{name}.py")  # noqa: E731
+    return {
+        "clean_dataset": [
+            script("clean_dataset"), "--input", work / "raw.json", "--output", work / "clean.json", "--dedupe",
+        ],
+        "reduce_dim": [
+            script("reduce_dim"), "--input", work / "clean.json", "--output", work / "pca.csv",
+            "--components", components, "--pipeline-out", work / "features.joblib",
+        ],
+        "prepare_train_test": [
+            script("prepare_train_test"), "--clean", work / "clean.json", "--pca", work / "pca.csv",
+            "--train-out", work / "train.csv", "--val-out", work / "val.csv",
+        ],
+        "train_model": [
+            script("train_model"), "--train", work / "train.csv", "--val", work / "val.csv",
+            "--model-out", work / "model.joblib", "--metrics-out", work / "metrics.json",
+            "--features", work / "features.joblib",
+            "--registry", work / "registry", "--version", "bench", "--activate",
+        ],
+        "infer_attrition": [
+            script("infer_attrition"), "--model", work / "model.joblib",
+            "--input", work / "val.csv", "--output", work / "val_scored.csv",
+        ],
+        "reduce_dim_cnn": [
+            script("reduce_dim_cnn"), "--input", work / "clean.json", "--output", work / "cnn.csv",
+            "--components", components, "--epochs", cnn_epochs,
+        ],
+    }
+
+
+def run_step(command, log_path):
+    """Run one script; returns (seconds, peak RSS in MB of the child)"""
+    with open(log_path, "w", encoding="utf-8") as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, *map(str, command)], cwd=str(REPO_ROOT), stdout=log, stderr=subprocess.STDOUT
+        )
+        # wait4 returns the rusage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{pathlib.Path(command[0]).name} failed ({process.returncode}); see {log_path}")
+    rss_kb = usage.ru_maxrss if sys.platform != "darwin" else usage.ru_maxrss / 1024
+    return seconds, rss_kb / 1024
+
+
+def main():
+    args = parse_args()
+    workdir = args.workdir or pathlib.Path(tempfile.mkdtemp(prefix="bench-offline-"))
+    results = []
+    for size in args.sizes:
+        work = workdir / f"n{size}"
+        work.mkdir(parents=True, exist_ok=True)
+        write_records(work / "raw.json", generate_records(size, seed=args.seed))
+        steps = commands(work, args.components, args.cnn_epochs)
+        for step in STEPS:
+            if step not in args.steps:
+                continue
+            durations, peaks = [], []
+            for run in range(args.repeat):
+                seconds, peak = run_step(steps[step], work / f"{step}.{run}.log")
+                durations.append(seconds)
+                peaks.append(peak)
+            result = {"name": f"{step}/{size}", "step": step, "records": size, **summarize(durations, size)}
+            result["peak_rss_mb"] = max(peaks)
+            results.append(result)
+            print_row(result)
+
+    print(f"Work directory: {workdir}")
+    write_report(args.report, "offline", vars(args), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /predict: latency percentiles and rows/s per batch size and body format
+
+Formats: "json" ({"samples": [{"components": [...]}]}, rows layout),
+"columns" (JSON body, ?layout=columns) and "npy" (application/x-npy in and out).
+
+By default the service runs in-process (FastAPI TestClient, no network); with
+--url a running server is measured instead. In-process runs score with the
+registry in --model-dir (e.g. <workdir>/n10000/registry from bench_offline.py)
+or the service's default model location.
+
+Usage
+-----
+python benchmarks/bench_predict.py --sizes 1 100 10000 100000 --model-dir /tmp/bench/n10000/registry
+python benchmarks/bench_predict.py --url http://127.0.0.1:8001 --components 20
+"""
+
+import argparse
+import io
+import json
+import os
+import pathlib
+import sys
+
+import numpy as np
+
+from common import ServiceClient, print_row, summarize, time_calls, write_report
+
+FORMATS = ("json", "columns", "npy")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark /predict")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000, 100_000])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--min-seconds", type=float, default=2.0, help="Minimum time spent per case")
+    parser.add_argument("--min-requests", type=int, default=5)
+    parser.add_argument("--max-requests", type=int, default=2000)
+    parser.add_argument("--url", help="Base URL of a running service (default: in-process)")
+    parser.add_argument("--model-dir", type=pathlib.Path, help="Registry directory for in-process runs")
+    parser.add_argument("--components", type=int, help="Components per sample (default: from the loaded model)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", type=pathlib.Path, help="Optional path to write the JSON report")
+    return parser.parse_args()
+
+
+def build_request(matrix, fmt):
+    """(path, body, headers) for one /predict call"""
+    if fmt == "npy":
+        buffer = io.BytesIO()
+        np.save(buffer, matrix, allow_pickle=False)
+        return "/predict", buffer.getvalue(), {"Content-Type": "application/x-npy"}
+    body = json.dumps({"samples": [{"components": row} for row in matrix.tolist()]}).encode()
+    path = "/predict?layout=columns" if fmt == "columns" else "/predict"
+    return path, body, {"Content-Type": "application/json"}
+
+
+def main():
+    args = parse_args()
+    if args.url is None:
+        # Only the attrition model is benchmarked here; do not load PhoBERT
+        os.environ.setdefault("ML_WARMUP_SENTIMENT", "0")
+        if args.model_dir:
+            os.environ["ATTRITION_MODEL_DIR"] = str(args.model_dir)
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+    with ServiceClient(args.url) as client:
+        if not client.wait_ready():
+            raise RuntimeError("service did not become ready")
+        components = args.components
+        if components is None:
+            if args.url:
+                raise SystemExit("--components is required with --url")
+            components = int(client.app.registry.active.compiled["weights"].shape[0])
+
+        for size in args.sizes:
+            matrix = rng.standard_normal((size, components))
+            for fmt in args.formats:
+                path, body, headers = build_request(matrix, fmt)
+
+                def call():
+                    status, content = client.request("POST", path, body, headers)
+                    if status != 200:
+                        raise RuntimeError(f"/predict returned {status}: {content[:200]!r}")
+
+                durations = time_calls(call, args.min_seconds, args.min_requests, args.max_requests)
+                result = {
+                    "name": f"{fmt}/{size}",
+                    "format": fmt,
+                    "rows": size,
+                    "request_bytes": len(body),
+                    **summarize(durations, size),
+                }
+                results.append(result)
+                print_row(result)
+
+    write_report(args.report, "predict", vars(args), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark /predict response serialization
+
+Compares, for 1 / 100 / 10k / 100k predictions:
+
+- legacy:  list of {"probability": float(p), "label": int(l)} dicts returned
+           from the endpoint, i.e. jsonable_encoder + JSONResponse (stdlib json)
+- rows:    prediction_response(layout="rows")    (orjson, same JSON shape)
+- columns: prediction_response(layout="columns") (orjson, numpy arrays serialized natively)
+
+Usage
+-----
+python benchmarks/bench_response.py --sizes 1 100 10000 100000 --report response.json
+"""
+
+import argparse
+import os
+import pathlib
+import sys
+
+# Only the serialization helpers are needed; do not load PhoBERT
+os.environ.setdefault("ML_WARMUP_SENTIMENT", "0")
+
+import numpy as np
+
+from common import ML_SERVICE_DIR, print_row, summarize, time_calls, write_report
+
+sys.path.insert(0, str(ML_SERVICE_DIR))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app import prediction_response  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark /predict response serialization")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000, 100_000])
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Minimum time spent per case")
+    parser.add_argument("--report", type=pathlib.Path, help="Optional path to write the JSON report")
+    return parser.parse_args()
+
+
+def legacy_response(probs, labels):
+    content = [
+        {"probability": float(prob), "label": int(label)}
+        for prob, label in zip(probs, labels)
+    ]
+    return JSONResponse(content=jsonable_encoder(content))
+
+
+CASES = {
+    "legacy": legacy_response,
+    "rows": lambda probs, labels: prediction_response(probs, labels, "rows"),
+    "columns": lambda probs, labels: prediction_response(probs, labels, "columns"),
+}
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(0)
+    results = []
+    for size in args.sizes:
+        probs = rng.random(size)
+        labels = (probs >= 0.5).astype(int)
+        for name, fn in CASES.items():
+            durations = time_calls(lambda: fn(probs, labels), args.min_seconds)
+            result = {
+                "name": f"{name}/{size}",
+                "case": name,
+                "rows": size,
+                "bytes": len(fn(probs, labels).body),
+                **summarize(durations, size),
+            }
+            results.append(result)
+            print_row(result)
+
+    write_report(args.report, "response", vars(args), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
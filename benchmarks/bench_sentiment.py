@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /sentiment: rule-based vs BERT, short vs long texts
+
+Every request carries a distinct synthetic feedback text (synthetic.py) and
+the result cache is off by default, so each request really runs the model.
+With --concurrency > 1 requests are sent from that many threads, which lets
+the micro-batcher coalesce them; items_per_s is then requests per wall-clock
+second.
+
+--mode rules sets SENTIMENT_BACKEND=rules (keyword rules, no model); --mode bert
+uses the configured backend (SENTIMENT_BACKEND, default torch). One mode per
+process, since the backend is chosen when the analyzer is built. In-process
+runs report the scoring path that actually served the requests ("model"), so a
+BERT run that fell back to rules (e.g. PhoBERT could not be downloaded) shows up.
+
+Usage
+-----
+python benchmarks/bench_sentiment.py --mode rules --report sentiment-rules.json
+python benchmarks/bench_sentiment.py --mode bert --lengths short long --concurrency 1 8
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import ServiceClient, print_row, summarize, write_report
+from synthetic import generate_texts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark /sentiment")
+    parser.add_argument("--mode", choices=["rules", "bert"], default="rules")
+    parser.add_argument("--lengths", nargs="+", choices=["short", "long"], default=["short", "long"])
+    parser.add_argument("--requests", type=int, default=200, help="Requests (distinct texts) per case")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--cache", action="store_true", help="Keep the sentiment result cache on")
+    parser.add_argument("--url", help="Base URL of a running service (default: in-process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", type=pathlib.Path, help="Optional path to write the JSON report")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.url is None:
+        if args.mode == "rules":
+            os.environ["SENTIMENT_BACKEND"] = "rules"
+        if not args.cache:
+            os.environ["SENTIMENT_CACHE"] = "off"
+        os.environ["ML_WARMUP_SENTIMENT"] = "1"
+
+    results = []
+    with ServiceClient(args.url) as client:
+        if not client.wait_ready("sentiment"):
+            raise RuntimeError("sentiment model did not become ready")
+
+        def send(text):
+            body = json.dumps({"text": text}, ensure_ascii=False).encode()
+            started = time.perf_counter()
+            status, content = client.request("POST", "/sentiment", body, {"Content-Type": "application/json"})
+            if status != 200:
+                raise RuntimeError(f"/sentiment returned {status}: {content[:200]!r}")
+            return time.perf_counter() - started
+
+        # Untimed request: loads the analyzer when no startup warmup ran
+        send("Khởi động")
+        model = None
+        if args.url is None:
+            model = client.app.get_analyzer().model_version
+
+        for length in args.lengths:
+            for concurrency in args.concurrency:
+                texts = generate_texts(args.requests, length, seed=args.seed + concurrency)
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    durations = list(executor.map(send, texts))
+                wall = time.perf_counter() - started
+                result = {
+                    "name": f"{args.mode}/{length}/c{concurrency}",
+                    "mode": args.mode,
+                    "model": model,
+                    "length": length,
+                    "concurrency": concurrency,
+                    "mean_chars": sum(map(len, texts)) / len(texts),
+                    **summarize(durations, 1),
+                }
+                result["items_per_s"] = len(texts) / wall
+                results.append(result)
+                print_row(result)
+
+    if args.mode == "bert" and model is not None and "rule-based" in model:
+        print("Warning: BERT was not available; these numbers are for the rule-based fallback")
+    write_report(args.report, "sentiment", vars(args), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
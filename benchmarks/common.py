@@ -0,0 +1,178 @@
+"""
+Shared helpers for the benchmark scripts
+
+Every script writes one JSON report:
+
+    {
+        "benchmark": "predict",
+        "environment": {"commit": ..., "python": ..., "cpu_count": ..., ...},
+        "params": {...},                      # command line of the run
+        "results": [
+            {"name": "json/10000", ..., "count": 12, "p50_ms": ..., "p95_ms": ..., "items_per_s": ...},
+        ],
+    }
+
+`name` identifies a case across runs, so compare.py can diff two reports
+(e.g. from two commits) case by case.
+"""
+
+import json
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+ML_SERVICE_DIR = REPO_ROOT / "ml-service"
+DATASET_DIR = REPO_ROOT / "dataset"
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def environment():
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def summarize(durations, items=1):
+    """Latency percentiles (ms) and throughput for per-call durations in seconds"""
+    samples = np.asarray(durations, dtype=float)
+    total = float(samples.sum())
+    p50, p90, p95, p99 = np.percentile(samples, [50, 90, 95, 99]) * 1000
+    return {
+        "count": int(samples.size),
+        "items": int(items),
+        "mean_ms": float(samples.mean() * 1000),
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(samples.max() * 1000),
+        "items_per_s": items * samples.size / total if total > 0 else None,
+    }
+
+
+def time_calls(fn, min_seconds=1.0, min_calls=5, max_calls=10_000, warmup=1):
+    """Call fn() repeatedly; returns per-call durations in seconds"""
+    for _ in range(warmup):
+        fn()
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < max_calls:
+        call_started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - call_started)
+        if len(durations) >= min_calls and time.perf_counter() - started >= min_seconds:
+            break
+    return durations
+
+
+def write_report(path, benchmark, params, results):
+    report = {
+        "benchmark": benchmark,
+        "environment": environment(),
+        "params": {key: str(value) if isinstance(value, pathlib.Path) else value for key, value in params.items()},
+        "results": results,
+    }
+    if path:
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, ensure_ascii=False)
+        print(f"Report saved to {path}")
+    return report
+
+
+def print_row(result):
+    rate = result.get("items_per_s")
+    print(
+        f"{result['name']:<32} n={result['count']:<6} p50 {result['p50_ms']:>10.3f} ms  "
+        f"p95 {result['p95_ms']:>10.3f} ms  p99 {result['p99_ms']:>10.3f} ms  "
+        + (f"{rate:>14,.0f} items/s" if rate else "")
+    )
+    sys.stdout.flush()
+
+
+class ServiceClient:
+    """
+    POST/GET against the ML service: in-process through FastAPI's TestClient,
+    or over HTTP against a running server when `url` is given
+    """
+
+    def __init__(self, url=None):
+        self.url = url.rstrip("/") if url else None
+        self._client = None
+
+    def __enter__(self):
+        if self.url is None:
+            sys.path.insert(0, str(ML_SERVICE_DIR))
+            from fastapi.testclient import TestClient
+
+            import app
+
+            self.app = app
+            self._client = TestClient(app.app)
+            self._client.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if self._client is not None:
+            self._client.__exit__(*exc)
+
+    def wait_ready(self, model=None, timeout=600.0):
+        """
+        Wait for /readyz, or only for `model`'s warmup step when given
+
+        A model the service does not warm up at startup counts as ready (it
+        loads on its first request). Returns False on timeout or failed warmup.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            status, body = self.request("GET", "/readyz")
+            if model is None:
+                if status == 200:
+                    return True
+            else:
+                state = json.loads(body).get("models", {}).get(model, {"status": "ready"})["status"]
+                if state in ("ready", "failed"):
+                    return state == "ready"
+            time.sleep(0.2)
+        return False
+
+    def request(self, method, path, body=None, headers=None):
+        """(status code, response bytes)"""
+        if self._client is not None:
+            response = self._client.request(method, path, content=body, headers=headers)
+            return response.status_code, response.content
+        import urllib.error
+        import urllib.request
+
+        request = urllib.request.Request(self.url + path, data=body, headers=headers or {}, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=600) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.read()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Diff two benchmark reports case by case
+
+Accepts single-benchmark reports (bench_*.py --report) or run_all.py suites and
+matches results by (benchmark, name). Latency metrics (*_ms) regress when they
+grow, throughput (items_per_s) when it shrinks. Exits with 1 when any case
+regressed by more than --threshold, so it can gate CI.
+
+Usage
+-----
+python benchmarks/compare.py results/base.json results/head.json --metric p50_ms --threshold 0.10
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("base", type=pathlib.Path)
+    parser.add_argument("head", type=pathlib.Path)
+    parser.add_argument("--metric", default="p50_ms", help="Result field to compare (default: p50_ms)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    return parser.parse_args()
+
+
+def load_cases(path):
+    with path.open("r", encoding="utf-8") as handle:
+        report = json.load(handle)
+    reports = report.get("reports", [report])
+    cases = {}
+    for item in reports:
+        for result in item["results"]:
+            cases[(item["benchmark"], result["name"])] = result
+    commit = (report.get("environment") or {}).get("commit")
+    return cases, commit
+
+
+def main():
+    args = parse_args()
+    base, base_commit = load_cases(args.base)
+    head, head_commit = load_cases(args.head)
+    higher_is_better = not args.metric.endswith("_ms")
+
+    print(f"{args.metric}: {base_commit or args.base} -> {head_commit or args.head}")
+    regressions = 0
+    for key in sorted(base.keys() & head.keys()):
+        before, after = base[key].get(args.metric), head[key].get(args.metric)
+        if not before or after is None:
+            continue
+        change = (after - before) / before
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif worse < -args.threshold:
+            flag = "improved"
+        print(f"{key[0]:<10} {key[1]:<32} {before:>14.3f} {after:>14.3f} {change:>+8.1%}  {flag}")
+
+    for key in sorted(base.keys() - head.keys()):
+        print(f"{key[0]:<10} {key[1]:<32} only in base")
+    for key in sorted(head.keys() - base.keys()):
+        print(f"{key[0]:<10} {key[1]:<32} only in head")
+
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Run the whole benchmark suite and merge the reports into one JSON file
+
+Order: offline scripts (which also train the model) -> /predict with that
+model -> /sentiment (rules, then BERT unless --skip-bert) -> response
+serialization. Each benchmark runs in its own process so configuration read
+at import time (SENTIMENT_BACKEND, ATTRITION_MODEL_DIR, ...) cannot leak
+between them.
+
+The suite is written to benchmarks/results/<UTC time>-<commit>.json (or --out);
+diff two suites with compare.py.
+
+Usage
+-----
+python benchmarks/run_all.py               # full sizes
+python benchmarks/run_all.py --quick       # small sizes, a few minutes
+python benchmarks/compare.py benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import environment
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent
+
+SIZES = {
+    "full": {
+        "offline": ["1000", "10000", "100000"],
+        "predict": ["1", "100", "10000", "100000"],
+        "sentiment_requests": "200",
+        "response": ["1", "100", "10000", "100000"],
+    },
+    "quick": {
+        "offline": ["1000"],
+        "predict": ["1", "100", "10000"],
+        "sentiment_requests": "40",
+        "response": ["1", "100", "10000"],
+    },
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run every benchmark and merge the JSON reports")
+    parser.add_argument("--quick", action="store_true", help="Small sizes for a fast smoke run")
+    parser.add_argument("--skip-bert", action="store_true", help="Only benchmark rule-based sentiment")
+    parser.add_argument("--workdir", type=pathlib.Path, help="Work directory (default: temp dir)")
+    parser.add_argument("--out", type=pathlib.Path, help="Suite report path (default: benchmarks/results/...)")
+    return parser.parse_args()
+
+
+def run(script, *arguments):
+    """Run one benchmark script; returns its report"""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        report_path = pathlib.Path(handle.name)
+    command = [sys.executable, str(BENCH_DIR / script), *map(str, arguments), "--report", str(report_path)]
+    print(f"$ {' '.join(command[1:])}", flush=True)
+    subprocess.run(command, check=True)
+    try:
+        with report_path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    finally:
+        report_path.unlink()
+
+
+def main():
+    args = parse_args()
+    sizes = SIZES["quick" if args.quick else "full"]
+    workdir = args.workdir or pathlib.Path(tempfile.mkdtemp(prefix="bench-"))
+    started = time.time()
+
+    reports = [run("bench_offline.py", "--sizes", *sizes["offline"], "--workdir", workdir)]
+    model_dir = workdir / f"n{sizes['offline'][-1]}" / "registry"
+    reports.append(run("bench_predict.py", "--sizes", *sizes["predict"], "--model-dir", model_dir))
+    for mode in ["rules"] if args.skip_bert else ["rules", "bert"]:
+        reports.append(run("bench_sentiment.py", "--mode", mode, "--requests", sizes["sentiment_requests"]))
+    reports.append(run("bench_response.py", "--sizes", *sizes["response"]))
+
+    env = environment()
+    out = args.out or BENCH_DIR / "results" / f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{env['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    suite = {
+        "environment": env,
+        "quick": args.quick,
+        "seconds": round(time.time() - started, 1),
+        "reports": reports,
+    }
+    with out.open("w", encoding="utf-8") as handle:
+        json.dump(suite, handle, indent=2, ensure_ascii=False)
+    print(f"Suite report saved to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
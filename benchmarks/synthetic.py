@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Synthetic, seeded test data for the benchmarks
+
+- raw ai_model_metadata records with a nested du_lieu_gia_lap block, shaped
+  like the export clean_dataset.py reads (allowed values are imported from it
+  so the generator follows its validation rules); a share of invalid records
+  and duplicate (ten_mo_hinh, phien_ban) keys exercises the skip/dedupe paths
+- Vietnamese employee feedback, short (one sentence) or long (a paragraph
+  well past 256 PhoBERT tokens), mixing the topics sentiment_bert.py knows
+
+The same seed always produces the same data.
+
+Usage
+-----
+python benchmarks/synthetic.py records --n 100000 --out /tmp/raw.json [--format array]
+python benchmarks/synthetic.py texts --n 1000 --length long --out /tmp/texts.json
+"""
+
+import argparse
+import json
+import pathlib
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "dataset"))
+
+from clean_dataset import (  # noqa: E402
+    ALLOWED_GENDER,
+    ALLOWED_MARITAL,
+    ALLOWED_MODEL_TYPES,
+    ALLOWED_STATUS,
+    ALLOWED_USE_CASES,
+)
+
+MODEL_TYPES = sorted(ALLOWED_MODEL_TYPES)
+USE_CASES = sorted(ALLOWED_USE_CASES)
+STATUSES = sorted(ALLOWED_STATUS)
+GENDERS = sorted(ALLOWED_GENDER)
+MARITAL = sorted(ALLOWED_MARITAL)
+
+DEPARTMENTS = ["Kỹ thuật", "Nhân sự", "Kinh doanh", "Tài chính", "Marketing", "Chăm sóc khách hàng", "Vận hành"]
+POSITIONS = [
+    "Intern", "Junior Developer", "Senior Developer", "Tech Lead", "Designer", "QA Engineer",
+    "DevOps Engineer", "Data Engineer", "Data Scientist", "Product Manager", "HR Specialist",
+    "Sales Executive", "Customer Support", "Marketing Specialist", "Team Lead", "Manager",
+]
+LEVELS = ["Intern", "Junior", "Middle", "Senior", "Lead", "Manager"]
+EDUCATION = ["Trung cấp", "Cao đẳng", "Đại học", "Thạc sĩ", "Tiến sĩ"]
+PERFORMANCE = ["Xuất sắc", "Tốt", "Khá", "Trung bình", "Yếu"]
+SURVEY = ["Rất hài lòng", "Hài lòng", "Bình thường", "Không hài lòng", "Rất không hài lòng"]
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp(rng, days=365):
+    moment = EPOCH + timedelta(seconds=rng.randrange(days * 86400))
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def raw_record(rng, index, key_index=None):
+    """One valid raw record; `key_index` reuses another record's (ten_mo_hinh, phien_ban)"""
+    key = index if key_index is None else key_index
+    satisfaction = rng.randint(1, 5)
+    overtime = round(rng.uniform(0, 40), 1)
+    # Unhappy, overworked employees are more often "Deprecated" (the attrition label)
+    risk = 0.1 + 0.12 * (5 - satisfaction) + overtime / 100
+    status = "Deprecated" if rng.random() < risk else rng.choice(["Active", "Testing"])
+    created = _timestamp(rng)
+    return {
+        "ten_mo_hinh": f"attrition-{key:07d}",
+        "phien_ban": f"{1 + key % 3}.{key % 10}",
+        "loai_mo_hinh": rng.choice(MODEL_TYPES),
+        "ung_dung": rng.choice(USE_CASES),
+        "tom_tat_du_lieu": rng.choice(["", "Dữ liệu mô phỏng nhân sự", "Khảo sát gắn kết quý"]),
+        "accuracy": round(rng.uniform(0.6, 0.99), 4),
+        "f1_score": round(rng.uniform(0.5, 0.97), 4),
+        "mo_ta_model_uri": f"ipfs://bafy{key:010d}",
+        "last_trained": _timestamp(rng),
+        "trang_thai": status,
+        "du_lieu_gia_lap": {
+            "thong_tin_ca_nhan": {
+                "ma_nhan_vien": f"NV{index:07d}",
+                "tuoi": rng.randint(20, 60),
+                "gioi_tinh": rng.choice(GENDERS),
+                "trinh_do_hoc_van": rng.choice(EDUCATION),
+                "tinh_trang_hon_nhan": rng.choice(MARITAL),
+                "so_nam_lam_viec": rng.randint(0, 30),
+                "phong_ban": rng.choice(DEPARTMENTS),
+            },
+            "thong_tin_cong_viec": {
+                "vi_tri_cong_viec": rng.choice(POSITIONS),
+                "cap_bac": rng.choice(LEVELS),
+                "muc_luong_hien_tai": rng.randrange(6, 80) * 1_000_000,
+                "tang_luong_nam_truoc": round(rng.uniform(0, 20), 1),
+                "so_gio_moi_tuan": rng.randint(35, 60),
+                "gio_ot": overtime,
+                "so_du_an_tham_gia": rng.randint(1, 8),
+                "ma_quan_ly": f"QL{rng.randrange(500):04d}",
+            },
+            "thong_tin_hieu_suat": {
+                "diem_kpi": round(rng.uniform(40, 100), 1),
+                "xep_loai_hieu_suat": rng.choice(PERFORMANCE),
+                "gio_dao_tao": rng.randint(0, 80),
+                "so_lan_thang_chuc": rng.randint(0, 5),
+                "thang_tu_lan_thang_chuc_cuoi": rng.randint(0, 60),
+            },
+            "thai_do_phuc_loi": {
+                "muc_do_hai_long": satisfaction,
+                "can_bang_cong_viec": rng.randint(1, 5),
+                "so_ngay_nghi_phep": rng.randint(0, 20),
+                "so_lan_di_muon": rng.randint(0, 12),
+                "diem_gan_ket": round(rng.uniform(20, 100), 1),
+                "ket_qua_khao_sat": rng.choice(SURVEY),
+            },
+        },
+        "createdAt": created,
+        "updatedAt": created,
+    }
+
+
+def _break(rng, record):
+    """Make a record fail one of clean_record's checks"""
+    choice = rng.randrange(5)
+    if choice == 0:
+        record["ten_mo_hinh"] = "  "
+    elif choice == 1:
+        record["loai_mo_hinh"] = "RNN"
+    elif choice == 2:
+        record["accuracy"] = "n/a"
+    elif choice == 3:
+        record["du_lieu_gia_lap"]["thong_tin_ca_nhan"]["gioi_tinh"] = "?"
+    else:
+        del record["du_lieu_gia_lap"]["thong_tin_cong_viec"]["muc_luong_hien_tai"]
+    return record
+
+
+def generate_records(n, seed=0, invalid_rate=0.05, duplicate_rate=0.02):
+    """Yield n raw records; about invalid_rate of them are rejected and duplicate_rate repeat a key"""
+    rng = random.Random(seed)
+    for index in range(n):
+        key_index = rng.randrange(index) if index and rng.random() < duplicate_rate else None
+        record = raw_record(rng, index, key_index)
+        if rng.random() < invalid_rate:
+            record = _break(rng, record)
+        yield record
+
+
+def write_records(path, records, fmt="ndjson"):
+    """Write records as NDJSON (default) or one JSON array; returns the count"""
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("w", encoding="utf-8") as handle:
+        if fmt == "array":
+            handle.write("[\n")
+        for record in records:
+            if fmt == "array" and count:
+                handle.write(",\n")
+            handle.write(json.dumps(record, ensure_ascii=False))
+            if fmt != "array":
+                handle.write("\n")
+            count += 1
+        if fmt == "array":
+            handle.write("\n]\n")
+    return count
+
+
+# Feedback sentences per topic and tone; topics follow sentiment_bert.TOPIC_KEYWORDS
+SENTENCES = {
+    "Lương": {
+        "neg": ["Lương thấp so với mặt bằng chung, {n} năm rồi chưa được tăng lương.",
+                "Mức lương hiện tại không đủ trang trải, thưởng cuối năm bị cắt."],
+        "pos": ["Chính sách lương thưởng rõ ràng, tăng lương đúng hạn.",
+                "Tiền lương được trả đầy đủ và đúng ngày, bonus hợp lý."],
+    },
+    "Môi trường": {
+        "neg": ["Văn phòng chật chội, tiếng ồn nhiều, khó tập trung làm việc.",
+                "Môi trường làm việc áp lực, tăng ca {n} giờ mỗi tuần."],
+        "pos": ["Môi trường làm việc thân thiện, văn phòng sạch sẽ và thoáng mát.",
+                "Không khí làm việc thoải mái, mọi người hỗ trợ nhau nhiệt tình."],
+    },
+    "Quản lý": {
+        "neg": ["Quản lý không lắng nghe ý kiến nhân viên, giao việc thiếu rõ ràng.",
+                "Sếp trực tiếp hay thay đổi yêu cầu vào phút chót."],
+        "pos": ["Trưởng nhóm tận tâm, luôn góp ý cụ thể để em tiến bộ.",
+                "Ban lãnh đạo minh bạch và sẵn sàng đối thoại với nhân viên."],
+    },
+    "Phúc lợi": {
+        "neg": ["Bảo hiểm sức khỏe chỉ ở mức tối thiểu, ngày phép quá ít.",
+                "Chế độ phúc lợi kém hơn nhiều công ty cùng ngành."],
+        "pos": ["Phúc lợi tốt, có khám sức khỏe định kỳ và du lịch hằng năm.",
+                "Công ty hỗ trợ đào tạo, cho nghỉ phép linh hoạt."],
+    },
+    "Góp ý": {
+        "neu": ["Em đề xuất nên có thêm buổi chia sẻ kiến thức mỗi tháng.",
+                "Quy trình duyệt nghỉ phép nên chuyển sang hệ thống trực tuyến."],
+    },
+}
+
+
+def feedback_text(rng, length="short"):
+    """One feedback text: "short" is a single sentence, "long" a ~25-sentence paragraph"""
+    count = 1 if length == "short" else 25
+    parts = []
+    for _ in range(count):
+        topic = rng.choice(list(SENTENCES))
+        tone = rng.choice(list(SENTENCES[topic]))
+        parts.append(rng.choice(SENTENCES[topic][tone]).format(n=rng.randint(2, 20)))
+    return " ".join(parts)
+
+
+def generate_texts(n, length="short", seed=0):
+    """n feedback texts; a numbered prefix keeps them distinct so no result cache can collapse them"""
+    rng = random.Random(seed)
+    return [f"Phản hồi {index + 1}: {feedback_text(rng, length)}" for index in range(n)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark data")
+    sub = parser.add_subparsers(dest="kind", required=True)
+
+    records = sub.add_parser("records", help="Raw ai_model_metadata records with du_lieu_gia_lap")
+    records.add_argument("--n", type=int, default=10_000)
+    records.add_argument("--seed", type=int, default=0)
+    records.add_argument("--invalid-rate", type=float, default=0.05)
+    records.add_argument("--duplicate-rate", type=float, default=0.02)
+    records.add_argument("--format", choices=["ndjson", "array"], default="ndjson")
+    records.add_argument("--out", type=pathlib.Path, required=True)
+
+    texts = sub.add_parser("texts", help="Vietnamese feedback texts (JSON list)")
+    texts.add_argument("--n", type=int, default=1000)
+    texts.add_argument("--seed", type=int, default=0)
+    texts.add_argument("--length", choices=["short", "long"], default="short")
+    texts.add_argument("--out", type=pathlib.Path, required=True)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.kind == "records":
+        count = write_records(
+            args.out,
+            generate_records(args.n, args.seed, args.invalid_rate, args.duplicate_rate),
+            args.format,
+        )
+        print(f"Wrote {count:,} records to {args.out}")
+    else:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        with args.out.open("w", encoding="utf-8") as handle:
+            json.dump(generate_texts(args.n, args.length, args.seed), handle, ensure_ascii=False, indent=0)
+        print(f"Wrote {args.n:,} {args.length} texts to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
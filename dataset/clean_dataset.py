@@ -10,14 +10,78 @@ python dataset/clean_dataset.py \
 
 The script accepts JSON array or newline-delimited JSON (one object per line)
 and always writes the cleaned output as newline-delimited JSON to avoid
-loading the entire dataset into memory.
+loading the entire dataset into memory. A JSON array is streamed element by
+element (see iter_array), so it is never loaded whole either. NDJSON lines are
+decoded and records encoded through json_codec (orjson/msgspec when installed;
+the output bytes are the same as with the stdlib).
+
+Parallel cleaning
+-----------------
+python dataset/clean_dataset.py --input raw.json --output clean.json --workers 8
+
+--workers N (0 = one per CPU) cleans in a process pool. NDJSON input is split
+into byte ranges of about --chunk-mb MiB, aligned on newlines, and each worker
+parses, cleans and serializes its own range; a JSON array is streamed in the
+main process and handed out in batches of records. The main process writes the
+chunks back in input order, so the output is identical to a serial run, and
+applies --dedupe itself, so duplicates are caught across chunks. --unordered
+writes chunks as they finish instead: the same records and totals, but in a
+different order, and with --dedupe the occurrence that is kept may differ.
+
+Dedupe stores
+-------------
+python dataset/clean_dataset.py --dedupe --dedupe-store sqlite --bloom --bloom-capacity 50000000
+
+--dedupe-store memory (default) keeps 64-bit digests of the keys in a set;
+sqlite keeps the exact keys in an on-disk table (--dedupe-db, default a temp
+file) when they do not fit in RAM. --bloom puts a Bloom filter in front, so
+keys seen for the first time skip the store lookup. The store's memory (and
+disk) footprint is printed at the end. See dedupe_store.py.
+
+Incremental runs
+----------------
+python dataset/clean_dataset.py --input export.json --output clean.json --incremental
+
+Keeps a state file next to the output (--state, default <output>.state.json)
+with the watermark, the max updatedAt cleaned so far. A run cleans only the
+records with updatedAt at or after the watermark (or without a usable
+updatedAt), writes them to <output>.delta, then merges the delta into the
+existing output by (ten_mo_hinh, phien_ban): a changed key is replaced in
+place, a new key is appended, and for a key seen several times the newest
+updatedAt wins. The merged file replaces the output atomically.
+
+The scan checkpoints its input byte offset and delta size every
+--checkpoint-every records, so an interrupted run resumes where it stopped,
+and an interrupted merge is simply redone. Whether the input was replaced
+meanwhile is judged by its size and a hash of its first and last 64 KiB only
+(see fingerprint): an edit in the middle of a same-size file between the
+interruption and the resume goes unnoticed. The first run (no state) cleans
+everything. Records deleted from the export are not removed from the output;
+run without --incremental to rebuild it. NDJSON input only.
+
+--append-only tells the script that the export is only ever appended to, never
+edited in place: when the input is the same file as last time, grown, the head
+cleaned last time is skipped and only the new tail is read. The same
+ends-only fingerprint guards this, so an in-place edit that keeps the size
+(an updatedAt bumped in a middle record) would be skipped too; leave the flag
+off unless the exporter guarantees appends.
 """
 
 import argparse
+import hashlib
 import json
 import math
+import os
 import pathlib
-from datetime import datetime
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from contextlib import nullcontext
+from itertools import islice
+
+from dedupe_store import STORES, make_store
+from json_codec import LineWriter, dumps, iter_ndjson, loads
 
 
 ALLOWED_MODEL_TYPES = {"BERT", "CNN", "Hybrid"}
@@ -37,6 +101,19 @@ ALLOWED_STATUS = {"Active", "Testing", "Deprecated"}
 ALLOWED_GENDER = {"Nam", "Nữ", "Khác"}
 ALLOWED_MARITAL = {"Độc thân", "Đã kết hôn", "Khác"}
 
+STATE_VERSION = 1
+# Bytes hashed at each end of the input to tell whether it was replaced
+FINGERPRINT_BYTES = 64 * 1024
+
+# Records per task when a JSON array is cleaned with --workers
+ARRAY_BATCH = 5_000
+# Characters read per block when streaming a JSON array / sniffing the format
+READ_SIZE = 1 << 20
+SNIFF_SIZE = 4096
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What may follow a number cut at the end of the buffer
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Clean ai_model_metadata dataset")
@@ -57,30 +134,159 @@ def parse_args():
         action="store_true",
         help="Drop duplicate records based on (ten_mo_hinh, phien_ban)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--dedupe-store",
+        choices=STORES,
+        default="memory",
+        help="Seen-key store for --dedupe: 64-bit digests in memory, or exact keys in SQLite on disk",
+    )
+    parser.add_argument(
+        "--dedupe-db",
+        type=pathlib.Path,
+        help="New SQLite file for --dedupe-store sqlite, must not exist (default: a temp file, removed afterwards)",
+    )
+    parser.add_argument(
+        "--bloom",
+        action="store_true",
+        help="Bloom-filter pre-check in front of the dedupe store",
+    )
+    parser.add_argument(
+        "--bloom-capacity",
+        type=int,
+        default=10_000_000,
+        help="Expected number of keys the Bloom filter is sized for (default: 10M)",
+    )
+    parser.add_argument(
+        "--bloom-error",
+        type=float,
+        default=0.01,
+        help="Bloom filter false-positive rate at capacity (default: 0.01)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (default: 1 = serial, 0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=float,
+        default=16.0,
+        help="NDJSON byte range handed to a worker, in MiB (default: 16)",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="With --workers, write chunks as they finish instead of in input order",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only clean records updated since the last run and merge them into --output by key",
+    )
+    parser.add_argument(
+        "--state",
+        type=pathlib.Path,
+        help="Watermark/checkpoint file for --incremental (default: <output>.state.json)",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=50_000,
+        help="Input records between --incremental checkpoints (default: 50000)",
+    )
+    parser.add_argument(
+        "--append-only",
+        action="store_true",
+        help="With --incremental: the input is only appended to, so skip the part cleaned last time",
+    )
+    args = parser.parse_args()
+    if args.incremental and (args.workers != 1 or args.unordered):
+        parser.error("--incremental runs serially; drop --workers/--unordered")
+    if args.append_only and not args.incremental:
+        parser.error("--append-only only applies to --incremental")
+    return args
 
 
-def iter_records(path: pathlib.Path):
+def input_format(path: pathlib.Path):
+    """'array' when the first non-whitespace character is '[', else 'ndjson'"""
     with path.open("r", encoding="utf-8") as handle:
-        preview = ""
         while True:
-            ch = handle.read(1)
-            if not ch:
-                break
-            if not ch.isspace():
-                preview = ch
-                break
-        handle.seek(0)
-        if preview == "[":
-            data = json.load(handle)
-            for item in data:
-                yield item
+            block = handle.read(SNIFF_SIZE)
+            if not block:
+                return "ndjson"
+            block = block.lstrip()
+            if block:
+                return "array" if block[0] == "[" else "ndjson"
+
+
+def iter_array(handle, read_size=READ_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time
+
+    The text is read in read_size blocks and each element is decoded in place
+    with JSONDecoder.raw_decode, so memory is bounded by about two blocks plus
+    the largest element instead of the whole file. At least read_size
+    characters are kept buffered after the next token, and an element that
+    does not fit in the buffered text is retried with one more block. A value
+    followed only by number characters up to the end of the buffer (1 of
+    "1.5", -2.5 of "-2.5e-07") may be a number cut short, so it is retried too.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    state = "start"  # start -> first -> (value -> delimiter)... -> done
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if not eof and len(buffer) - pos < read_size:
+            chunk = handle.read(read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        if pos == len(buffer):
+            if state == "done":
+                return
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+
+        char = buffer[pos]
+        if state == "done":
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+        if state == "start":
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            pos += 1
+            state = "first"
+        elif state == "delimiter":
+            if char not in ",]":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            state = "value" if char == "," else "done"
+        elif state == "first" and char == "]":
+            pos += 1
+            state = "done"
         else:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                yield json.loads(line)
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                truncated = not eof and _NUMBER_TAIL.fullmatch(buffer, end) is not None
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                truncated = True
+            if truncated:
+                chunk = handle.read(read_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield item
+            pos = end
+            state = "delimiter"
+
+
+def iter_records(path: pathlib.Path):
+    if input_format(path) == "array":
+        with path.open("r", encoding="utf-8") as handle:
+            yield from iter_array(handle)
+    else:
+        yield from iter_ndjson(path)
 
 
 def normalize_string(value, *, allow_empty=False):
@@ -227,29 +433,390 @@ def clean_record(record):
     return cleaned
 
 
+def clean_batch(records, dedupe):
+    """
+    Clean and serialize records in a worker process
+
+    Returns (total, skipped, keys, lines): the output lines of the kept
+    records and, with dedupe, their (ten_mo_hinh, phien_ban) keys so the
+    main process can drop duplicates across chunks.
+    """
+    total = skipped = 0
+    keys, lines = [], []
+    for record in records:
+        total += 1
+        cleaned = clean_record(record)
+        if not cleaned:
+            skipped += 1
+            continue
+        if dedupe:
+            keys.append((cleaned["ten_mo_hinh"], cleaned["phien_ban"]))
+        lines.append(dumps(cleaned) + b"\n")
+    return total, skipped, keys, lines
+
+
+def clean_chunk(path: pathlib.Path, start, end, dedupe):
+    """clean_batch over the NDJSON lines in bytes [start, end) of path"""
+    with path.open("rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    return clean_batch((loads(line) for line in data.splitlines() if line.strip()), dedupe)
+
+
+def plan_chunks(path: pathlib.Path, chunk_bytes):
+    """(start, end) byte ranges of about chunk_bytes covering path, each ending after a newline"""
+    size = path.stat().st_size
+    with path.open("rb") as handle:
+        start = 0
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                handle.seek(end - 1)
+                handle.readline()
+                end = handle.tell()
+            yield start, end
+            start = end
+
+
+def pool_results(fn, tasks, workers, ordered=True):
+    """
+    Yield fn(*task) for each task, computed in a process pool
+
+    At most 2 * workers tasks are in flight, so memory stays bounded by the
+    chunk size rather than the input size. Results come back in task order,
+    or as they complete when ordered is False.
+    """
+    window = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(fn, *task))
+            if len(pending) >= window:
+                yield from _next_results(pending, ordered)
+        while pending:
+            yield from _next_results(pending, ordered)
+
+
+def _next_results(pending, ordered):
+    if ordered:
+        return [pending.popleft().result()]
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+    return [future.result() for future in done]
+
+
+def parallel_results(args):
+    if input_format(args.input) == "array":
+        records = iter_records(args.input)
+        batches = iter(lambda: list(islice(records, ARRAY_BATCH)), [])
+        tasks = ((batch, args.dedupe) for batch in batches)
+        return pool_results(clean_batch, tasks, args.workers, ordered=not args.unordered)
+
+    chunk_bytes = max(1, int(args.chunk_mb * 1024 * 1024))
+    tasks = ((args.input, start, end, args.dedupe) for start, end in plan_chunks(args.input, chunk_bytes))
+    return pool_results(clean_chunk, tasks, args.workers, ordered=not args.unordered)
+
+
+def parse_timestamp(text):
+    """Aware datetime for an ISO updatedAt (naive means UTC); None when missing or unparseable"""
+    if not text:
+        return None
+    try:
+        value = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def fingerprint(path: pathlib.Path, end):
+    """
+    Hash of the first and last FINGERPRINT_BYTES of path's first `end` bytes
+
+    Cheap enough to check on every run, but it only tells a replaced file from
+    the same one: a same-size edit in between the two ends keeps the hash.
+    """
+    digest = hashlib.blake2b(str(end).encode(), digest_size=16)
+    with path.open("rb") as handle:
+        digest.update(handle.read(min(end, FINGERPRINT_BYTES)))
+        handle.seek(max(0, end - FINGERPRINT_BYTES))
+        digest.update(handle.read(end - handle.tell()))
+    return digest.hexdigest()
+
+
+def load_state(path: pathlib.Path):
+    if not path.exists():
+        return {"version": STATE_VERSION}
+    with path.open("r", encoding="utf-8") as handle:
+        state = json.load(handle)
+    if state.get("version") != STATE_VERSION:
+        raise ValueError(f"{path}: unsupported state version {state.get('version')!r}")
+    return state
+
+
+def save_state(path: pathlib.Path, state):
+    """Write the state atomically, so a crash leaves the previous checkpoint"""
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2, ensure_ascii=False)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
+def resumable(run, input_path: pathlib.Path, delta_path: pathlib.Path):
+    """
+    Whether an interrupted run can continue: same input (possibly appended to) and its delta intact
+
+    "Same input" is the ends-only fingerprint, so an in-place edit of the
+    middle of the file between the interruption and the resume is not seen.
+    """
+    size = input_path.stat().st_size
+    if run["input"] != str(input_path) or size < run["input_size"]:
+        return False
+    if fingerprint(input_path, run["input_size"]) != run["input_fingerprint"]:
+        return False
+    return run["phase"] == "merge" or (delta_path.exists() and delta_path.stat().st_size >= run["delta_bytes"])
+
+
+def new_run(state, input_path: pathlib.Path, output_path: pathlib.Path, append_only=False):
+    size = input_path.stat().st_size
+    watermark = state.get("watermark") if output_path.exists() else None
+    start = 0
+    scanned_to = state.get("scanned_to")
+    if (
+        append_only
+        and watermark is not None
+        and state.get("input") == str(input_path)
+        and scanned_to is not None
+        and scanned_to <= size
+        and fingerprint(input_path, scanned_to) == state.get("fingerprint")
+    ):
+        start = scanned_to  # same file, appended to (as promised): the head was cleaned last time
+    return {
+        "phase": "scan",
+        "input": str(input_path),
+        "input_size": size,
+        "input_fingerprint": fingerprint(input_path, size),
+        "watermark": watermark,
+        "start": start,
+        "offset": start,
+        "delta_bytes": 0,
+        "max_updated": None,
+        "total": 0,
+        "unchanged": 0,
+        "skipped": 0,
+        "changed": 0,
+    }
+
+
+def scan_delta(args, state_path: pathlib.Path, state, delta_path: pathlib.Path):
+    """Clean the records at or after the watermark into delta_path, checkpointing the input offset"""
+    run = state["run"]
+    watermark = parse_timestamp(run["watermark"])
+    max_updated = parse_timestamp(run["max_updated"])
+    offset = run["offset"]
+    pending = 0
+
+    def checkpoint():
+        out.flush()
+        delta.flush()
+        run.update(
+            offset=offset,
+            delta_bytes=delta.tell(),
+            max_updated=max_updated.isoformat() if max_updated else None,
+        )
+        save_state(state_path, state)
+
+    with args.input.open("rb") as handle, delta_path.open("ab") as delta, LineWriter(delta) as out:
+        delta.truncate(run["delta_bytes"])
+        handle.seek(offset)
+        for line in iter(handle.readline, b""):
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            run["total"] += 1
+            record = loads(line)
+            updated = parse_timestamp(normalize_datetime(record.get("updatedAt")))
+            if watermark is not None and updated is not None and updated < watermark:
+                run["unchanged"] += 1
+            else:
+                cleaned = clean_record(record)
+                if not cleaned:
+                    run["skipped"] += 1
+                else:
+                    out.write(cleaned)
+                    run["changed"] += 1
+                    if updated is not None and (max_updated is None or updated > max_updated):
+                        max_updated = updated
+            pending += 1
+            if pending >= args.checkpoint_every:
+                checkpoint()
+                pending = 0
+        checkpoint()
+
+
+def merge_delta(output_path: pathlib.Path, delta_path: pathlib.Path):
+    """
+    Merge the delta records into output_path by key; returns (replaced, added, output records)
+
+    Only the delta's keys and line offsets are held in memory; the output is
+    streamed into a temp file that replaces it at the end.
+    """
+    index = {}  # key -> [updatedAt, offset in delta, written]
+    with delta_path.open("rb") as delta:
+        offset = 0
+        for line in delta:
+            record = loads(line)
+            key = (record["ten_mo_hinh"], record["phien_ban"])
+            updated = parse_timestamp(record.get("updatedAt"))
+            current = index.get(key)
+            if current is None or current[0] is None or updated is None or updated >= current[0]:
+                index[key] = [updated, offset, False]
+            offset += len(line)
+    if not index:
+        return 0, 0, None
+
+    replaced = added = written = 0
+    tmp = output_path.with_name(output_path.name + ".tmp")
+    with delta_path.open("rb") as delta, tmp.open("wb") as handle, LineWriter(handle) as out:
+
+        def write_delta(entry):
+            delta.seek(entry[1])
+            out.write_line(delta.readline())
+            entry[2] = True
+
+        if output_path.exists():
+            with output_path.open("rb") as base:
+                for line in base:
+                    stripped = line.strip()
+                    if not stripped:
+                        continue
+                    record = loads(stripped)
+                    entry = index.get((record["ten_mo_hinh"], record["phien_ban"]))
+                    if entry is None:
+                        out.write_line(stripped + b"\n")
+                        written += 1
+                    elif not entry[2]:
+                        write_delta(entry)
+                        replaced += 1
+                        written += 1
+                    # else: an older duplicate of a key already replaced
+        for entry in index.values():
+            if not entry[2]:
+                write_delta(entry)
+                added += 1
+                written += 1
+        out.flush()
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, output_path)
+    return replaced, added, written
+
+
+def run_incremental(args):
+    if input_format(args.input) != "ndjson":
+        raise ValueError("--incremental needs NDJSON input: checkpoints are byte offsets")
+    state_path = args.state or args.output.with_name(args.output.name + ".state.json")
+    delta_path = args.output.with_name(args.output.name + ".delta")
+    state = load_state(state_path)
+
+    run = state.get("run")
+    resumed = run is not None and resumable(run, args.input, delta_path)
+    if run is not None and not resumed:
+        print("Input changed since the interrupted run; starting over")
+    if not resumed:
+        delta_path.unlink(missing_ok=True)
+        state["run"] = run = new_run(state, args.input, args.output, args.append_only)
+        save_state(state_path, state)
+    if resumed:
+        print(f"Resuming {run['phase']} at input byte {run['offset']:,}")
+
+    if run["phase"] == "scan":
+        scan_delta(args, state_path, state, delta_path)
+        run["phase"] = "merge"
+        save_state(state_path, state)
+    replaced, added, written = merge_delta(args.output, delta_path)
+
+    watermarks = [parse_timestamp(value) for value in (run["watermark"], run["max_updated"])]
+    watermarks = [value for value in watermarks if value is not None]
+    state = {
+        "version": STATE_VERSION,
+        "watermark": max(watermarks).isoformat() if watermarks else None,
+        "input": run["input"],
+        "scanned_to": run["offset"],
+        "fingerprint": fingerprint(args.input, run["offset"]),
+    }
+    save_state(state_path, state)
+    delta_path.unlink(missing_ok=True)
+
+    print("Incremental cleaning completed")
+    print(f"Watermark:       {run['watermark'] or '-'} -> {state['watermark'] or '-'}")
+    if run["start"]:
+        print(f"Skipped head:    {run['start']:,} bytes (--append-only)")
+    print(f"Input records:   {run['total']:,}")
+    print(f"Unchanged:       {run['unchanged']:,}")
+    print(f"Skipped invalid: {run['skipped']:,}")
+    print(f"Changed records: {run['changed']:,}")
+    print(f"Replaced / new:  {replaced:,} / {added:,}")
+    if written is not None:
+        print(f"Output records:  {written:,}")
+    print(f"Output path:     {args.output}")
+    print(f"State path:      {state_path}")
+
+
 def main():
     args = parse_args()
     args.output.parent.mkdir(parents=True, exist_ok=True)
+    if args.incremental:
+        run_incremental(args)
+        return
+    if args.workers <= 0:
+        args.workers = os.cpu_count() or 1
 
     total = kept = skipped = duplicates = 0
-    seen_keys = set()
-
-    with args.output.open("w", encoding="utf-8") as out:
-        for record in iter_records(args.input):
-            total += 1
-            cleaned = clean_record(record)
-            if not cleaned:
-                skipped += 1
-                continue
+    store = None
+    if args.dedupe:
+        store = make_store(
+            args.dedupe_store,
+            path=args.dedupe_db,
+            bloom_capacity=args.bloom_capacity if args.bloom else None,
+            bloom_error=args.bloom_error,
+        )
+
+    with store or nullcontext(), args.output.open("wb") as handle, LineWriter(handle) as out:
+        if args.workers > 1:
+            for chunk_total, chunk_skipped, keys, lines in parallel_results(args):
+                total += chunk_total
+                skipped += chunk_skipped
+                if not args.dedupe:
+                    out.write_lines(lines)
+                    kept += len(lines)
+                    continue
+                for dedupe_key, line in zip(keys, lines):
+                    if not store.add(dedupe_key):
+                        duplicates += 1
+                        continue
+                    out.write_line(line)
+                    kept += 1
+        else:
+            for record in iter_records(args.input):
+                total += 1
+                cleaned = clean_record(record)
+                if not cleaned:
+                    skipped += 1
+                    continue
 
-            dedupe_key = (cleaned["ten_mo_hinh"], cleaned["phien_ban"])
-            if args.dedupe and dedupe_key in seen_keys:
-                duplicates += 1
-                continue
-            seen_keys.add(dedupe_key)
+                if store is not None and not store.add((cleaned["ten_mo_hinh"], cleaned["phien_ban"])):
+                    duplicates += 1
+                    continue
 
-            out.write(json.dumps(cleaned, ensure_ascii=False) + "\n")
-            kept += 1
+                out.write(cleaned)
+                kept += 1
+        dedupe_summary = store.summary() if store is not None else None
 
     print("Cleaning completed")
     print(f"Input records:   {total:,}")
@@ -257,6 +824,9 @@ def main():
     print(f"Skipped invalid: {skipped:,}")
     if args.dedupe:
         print(f"Duplicate drops: {duplicates:,}")
+        print(f"Dedupe store:    {dedupe_summary}")
+    if args.workers > 1:
+        print(f"Workers:         {args.workers}")
     print(f"Output path:     {args.output}")
 
 
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Seen-key stores for `clean_dataset.py --dedupe`.
+
+A store answers "was this (ten_mo_hinh, phien_ban) key seen before?" and
+records it. Keys are encoded to bytes once (length-prefixed UTF-8 parts, so
+distinct tuples never share an encoding):
+
+- MemoryKeyStore: a set of 64-bit BLAKE2b digests, ~80 bytes per key instead
+  of ~220 for a tuple of two strings. Two different keys share a digest with
+  probability about n^2 / 2^65 (3e-4 at 100M keys); such a record would be
+  dropped as a duplicate.
+- SqliteKeyStore: exact keys in an on-disk SQLite table (WITHOUT ROWID primary
+  key), for exports whose keys do not fit in RAM. Memory is bounded by the
+  page cache (cache_mb). The file is temporary unless a path is given; a
+  given path must not exist yet, and that file is kept after the run.
+
+Either store can sit behind a BloomFilter pre-check: a key the filter has
+never seen is new for sure and is recorded without a lookup (SqliteKeyStore
+batches those inserts), so only the filter's positives (real duplicates plus
+~error_rate of new keys) reach the store's own check.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+
+STORES = ("memory", "sqlite")
+
+
+def encode_key(parts):
+    """Unambiguous bytes for a tuple of strings"""
+    chunks = []
+    for part in parts:
+        data = part.encode("utf-8")
+        chunks.append(len(data).to_bytes(4, "little"))
+        chunks.append(data)
+    return b"".join(chunks)
+
+
+def format_bytes(size):
+    return f"{size / (1024 * 1024):,.1f} MiB"
+
+
+class BloomFilter:
+    """Bit array with `hashes` probes per key, sized for capacity keys at error_rate"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("Bloom filter needs capacity > 0 and 0 < error_rate < 1")
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, data):
+        """Set data's bits; returns True when they were all set already (maybe seen)"""
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        bits = self.bits
+        seen = True
+        for i in range(self.hashes):
+            position = (first + i * step) % self.size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                seen = False
+        return seen
+
+    def memory_bytes(self):
+        return sys.getsizeof(self.bits)
+
+
+class KeyStore:
+    """Base class: add(key) records key and returns True when it was not seen before"""
+
+    name = None
+
+    def __init__(self, bloom=None):
+        self.bloom = bloom
+        self.keys = 0
+
+    def add(self, key):
+        data = encode_key(key)
+        if self.bloom is not None and not self.bloom.add(data):
+            self._insert_new(data)
+            new = True
+        else:
+            new = self._add(data)
+        self.keys += new
+        return new
+
+    def _add(self, data):
+        raise NotImplementedError
+
+    def _insert_new(self, data):
+        """Record a key known to be new (the Bloom filter had not seen it)"""
+        self._add(data)
+
+    def memory_bytes(self):
+        return self.bloom.memory_bytes() if self.bloom is not None else 0
+
+    def disk_bytes(self):
+        return 0
+
+    def summary(self):
+        label = self.name + ("+bloom" if self.bloom is not None else "")
+        text = f"{label}, {self.keys:,} keys, ~{format_bytes(self.memory_bytes())} in memory"
+        if self.bloom is not None:
+            text += f" (bloom {format_bytes(self.bloom.memory_bytes())})"
+        if self.disk_bytes():
+            text += f", {format_bytes(self.disk_bytes())} on disk"
+        return text
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemoryKeyStore(KeyStore):
+    name = "memory"
+
+    def __init__(self, bloom=None):
+        super().__init__(bloom)
+        self._digests = set()
+
+    def _add(self, data):
+        digest = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def memory_bytes(self):
+        digests = sys.getsizeof(self._digests) + sum(map(sys.getsizeof, self._digests))
+        return digests + super().memory_bytes()
+
+
+class SqliteKeyStore(KeyStore):
+    name = "sqlite"
+
+    def __init__(self, path=None, bloom=None, cache_mb=64, batch=10_000):
+        super().__init__(bloom)
+        self.temporary = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix="dedupe-", suffix=".sqlite")
+            os.close(handle)  # an empty file is a valid, empty SQLite database
+        self.path = os.fspath(path)
+        if not self.temporary and os.path.exists(self.path):
+            # Never reuse or remove a file the caller named: it may hold anything
+            raise FileExistsError(f"Dedupe database {self.path} already exists; choose a new path")
+        self.cache_bytes = int(cache_mb * 1024 * 1024)
+        self.batch = batch
+        self._pending = []
+
+        self.connection = sqlite3.connect(self.path, isolation_level=None)
+        # A scratch table: durability does not matter, speed does
+        self.connection.execute("PRAGMA journal_mode=OFF")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.execute(f"PRAGMA cache_size=-{max(1, self.cache_bytes // 1024)}")
+        self.connection.execute("CREATE TABLE keys (key BLOB PRIMARY KEY) WITHOUT ROWID")
+        self.connection.execute("BEGIN")
+
+    def _add(self, data):
+        self._flush()
+        cursor = self.connection.execute("INSERT OR IGNORE INTO keys VALUES (?)", (data,))
+        return cursor.rowcount == 1
+
+    def _insert_new(self, data):
+        self._pending.append((data,))
+        if len(self._pending) >= self.batch:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self.connection.executemany("INSERT INTO keys VALUES (?)", self._pending)
+            self._pending.clear()
+
+    def disk_bytes(self):
+        page_count = self.connection.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    def memory_bytes(self):
+        # The page cache only grows to cache_size, and not beyond the file
+        return min(self.cache_bytes, self.disk_bytes()) + super().memory_bytes()
+
+    def close(self):
+        if self.connection is None:
+            return
+        self._flush()
+        self.connection.execute("COMMIT")
+        self.connection.close()
+        self.connection = None
+        if self.temporary:
+            os.remove(self.path)
+
+
+def make_store(kind="memory", path=None, bloom_capacity=None, bloom_error=0.01, cache_mb=64):
+    """Store by name (STORES); bloom_capacity (expected keys) adds a Bloom pre-check"""
+    bloom = BloomFilter(bloom_capacity, bloom_error) if bloom_capacity else None
+    if kind == "memory":
+        return MemoryKeyStore(bloom)
+    if kind == "sqlite":
+        return SqliteKeyStore(path, bloom, cache_mb)
+    raise ValueError(f"Unknown dedupe store {kind!r}; expected one of {', '.join(STORES)}")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Attrition feature pipeline shared by the offline scripts and the ML service.
+
+reduce_dim.py fits the transformers below and saves them as a "feature bundle"
+(a plain dict, like the scaler/model bundle written by train_model.py):
+
+    {
+        "numeric_cols": [...],        # IMPORTANT_NUMERIC present at fit time
+        "categorical_cols": [...],    # IMPORTANT_CATEGORICAL present at fit time
+        "scaler": StandardScaler,     # numeric columns
+        "encoder": OneHotEncoder,     # categorical columns
+        "pca": PCA,                   # [scaled numeric | one-hot] -> components
+    }
+
+train_model.py embeds it under "features" in attrition_lr.joblib, so the
+whole flatten -> scale -> one-hot -> PCA -> scaler -> LR chain ships as one
+artifact and raw cleaned records can be scored without the PCA CSV.
+
+Only NumPy is imported here so the service can use it without pandas.
+"""
+
+import numpy as np
+
+IMPORTANT_CATEGORICAL = [
+    "loai_mo_hinh",
+    "ung_dung",
+    "trang_thai",
+    "ca_nhan_phong_ban",
+    "cong_viec_vi_tri_cong_viec",
+    "cong_viec_cap_bac",
+]
+
+IMPORTANT_NUMERIC = [
+    "accuracy",
+    "f1_score",
+    "ca_nhan_tuoi",
+    "ca_nhan_so_nam_lam_viec",
+    "cong_viec_muc_luong_hien_tai",
+    "cong_viec_so_gio_moi_tuan",
+    "cong_viec_gio_ot",
+    "cong_viec_so_du_an_tham_gia",
+    "hieu_suat_diem_kpi",
+    "hieu_suat_gio_dao_tao",
+    "hieu_suat_so_lan_thang_chuc",
+    "hieu_suat_thang_tu_lan_thang_chuc_cuoi",
+    "phuc_loi_muc_do_hai_long",
+    "phuc_loi_can_bang_cong_viec",
+    "phuc_loi_so_ngay_nghi_phep",
+    "phuc_loi_so_lan_di_muon",
+    "phuc_loi_diem_gan_ket",
+]
+
+
+def flatten_record(record):
+    base = {
+        "ten_mo_hinh": record["ten_mo_hinh"],
+        "phien_ban": record["phien_ban"],
+        "loai_mo_hinh": record["loai_mo_hinh"],
+        "ung_dung": record["ung_dung"],
+        "accuracy": record["accuracy"],
+        "f1_score": record["f1_score"],
+        "trang_thai": record["trang_thai"],
+    }
+    dl = record["du_lieu_gia_lap"]
+    personal = dl["thong_tin_ca_nhan"]
+    job = dl["thong_tin_cong_viec"]
+    perf = dl["thong_tin_hieu_suat"]
+    wellbeing = dl["thai_do_phuc_loi"]
+
+    for prefix, data in [
+        ("ca_nhan", personal),
+        ("cong_viec", job),
+        ("hieu_suat", perf),
+        ("phuc_loi", wellbeing),
+    ]:
+        for key, value in data.items():
+            base[f"{prefix}_{key}"] = value
+    return base
+
+
+def build_feature_bundle(numeric_cols, categorical_cols, scaler, encoder, pca):
+    return {
+        "numeric_cols": list(numeric_cols),
+        "categorical_cols": list(categorical_cols),
+        "scaler": scaler,
+        "encoder": encoder,
+        "pca": pca,
+    }
+
+
+def records_to_arrays(records, numeric_cols, categorical_cols):
+    """
+    Flatten nested records into a float matrix of numeric columns and an
+    object matrix of categorical columns (column order as given).
+
+    Raises ValueError when a record lacks a field or has a non-numeric value
+    in a numeric column. Missing categorical values become "" and, like any
+    unseen category, encode to all zeros.
+    """
+    flattened = []
+    for index, record in enumerate(records):
+        try:
+            flattened.append(flatten_record(record))
+        except (KeyError, TypeError) as error:
+            raise ValueError(f"record {index}: missing field {error}") from error
+
+    try:
+        numeric = np.array(
+            [[row.get(col) for col in numeric_cols] for row in flattened],
+            dtype=float,
+        ).reshape(len(flattened), len(numeric_cols))
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"numeric feature is not a number: {error}") from error
+    bad_rows, bad_cols = np.nonzero(np.isnan(numeric))
+    if bad_rows.size:
+        raise ValueError(f"record {int(bad_rows[0])}: missing numeric field {numeric_cols[bad_cols[0]]!r}")
+
+    categorical = np.array(
+        [["" if row.get(col) is None else str(row.get(col)) for col in categorical_cols] for row in flattened],
+        dtype=object,
+    ).reshape(len(flattened), len(categorical_cols))
+    return numeric, categorical
+
+
+def transform_arrays(features, numeric, categorical):
+    """Scale + one-hot + PCA for already flattened feature arrays"""
+    combined = np.hstack([features["scaler"].transform(numeric), features["encoder"].transform(categorical)])
+    return features["pca"].transform(combined)
+
+
+def transform_records(features, records):
+    """PCA components for cleaned nested records, in one vectorized pass per transformer"""
+    numeric, categorical = records_to_arrays(records, features["numeric_cols"], features["categorical_cols"])
+    return transform_arrays(features, numeric, categorical)
@@ -13,6 +13,9 @@ Usage examples:
     python dataset/infer_attrition.py \
         --model dataset/models/attrition_lr.joblib \
         --sample '{"component_1":0.12,"component_2":-0.34,...}'
+
+Scoring uses the bundle's compiled linear scorer (expit(X @ w + b), see
+linear_scorer.py); bundles saved before it existed are compiled on load.
 """
 
 import argparse
@@ -23,6 +26,8 @@ import joblib
 import numpy as np
 import pandas as pd
 
+from linear_scorer import load_compiled, score_components
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Run inference using trained attrition model")
@@ -55,17 +60,13 @@ def parse_args():
 
 
 def load_model(path):
-    bundle = joblib.load(path)
-    scaler = bundle["scaler"]
-    model = bundle["model"]
-    return scaler, model
+    return load_compiled(joblib.load(path))
 
 
-def predict_df(df, scaler, model, threshold):
+def predict_df(df, compiled, threshold):
     feature_cols = [col for col in df.columns if col.startswith("component_")]
-    X = df[feature_cols].values
-    X_scaled = scaler.transform(X)
-    probs = model.predict_proba(X_scaled)[:, 1]
+    X = df[feature_cols].to_numpy(dtype=float)
+    probs = score_components(compiled, X)
     labels = (probs >= threshold).astype(int)
     result = df.copy()
     result["prob_quit"] = probs
@@ -75,18 +76,18 @@ def predict_df(df, scaler, model, threshold):
 
 def main():
     args = parse_args()
-    scaler, model = load_model(args.model)
+    compiled = load_model(args.model)
 
     if args.input:
         df = pd.read_csv(args.input)
-        result = predict_df(df, scaler, model, args.threshold)
+        result = predict_df(df, compiled, args.threshold)
         output_path = args.output or args.input.with_suffix(".predictions.csv")
         result.to_csv(output_path, index=False, encoding="utf-8")
         print(f"Predictions saved to {output_path}")
     else:
         sample = json.loads(args.sample)
         df = pd.DataFrame([sample])
-        result = predict_df(df, scaler, model, args.threshold)
+        result = predict_df(df, compiled, args.threshold)
         print(json.dumps(result[["prob_quit", "pred_label"]].iloc[0].to_dict(), indent=2))
 
 
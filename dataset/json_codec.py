@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+JSON codec shared by the dataset scripts (clean_dataset, reduce_dim, reduce_dim_cnn).
+
+Decoding uses the fastest parser installed, orjson > msgspec > stdlib json,
+directly on bytes: NDJSON files are opened in binary mode and split into lines
+without decoding them to str first. A document the fast parser rejects but the
+stdlib accepts (NaN/Infinity literals, a UTF-8 BOM, lone surrogate escapes) is
+decoded again with json.loads, so the records are the same whichever codec runs.
+orjson reads an integer outside the 64-bit range as a float without an error
+(123456789012345678901234 -> 1.2345678901234569e+23), which would change a
+numeric ma_nhan_vien / phien_ban / ma_quan_ly once normalize_string turns it
+into text; a document holding a run of 19 or more digits is therefore decoded
+with json.loads directly (a cheap scan; such runs are rare in the exports).
+
+Encoding always goes through the stdlib encoder: the output must stay
+byte-identical to json.dumps(obj, ensure_ascii=False) in UTF-8, and orjson /
+msgspec write compact separators, different float spellings (1e-5 vs 1e-05)
+and null for NaN/Infinity. The encoder instance is reused (json.dumps builds a
+new one per call for non-default options) and LineWriter batches the writes.
+
+Environment
+-----------
+DATASET_JSON_CODEC   auto (default) | orjson | msgspec | json
+"""
+
+import json
+import os
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+CODECS = ("orjson", "msgspec", "json")
+# Digit runs that may be an integer beyond 64 bits, which the fast parsers do not keep exact
+_LONG_DIGITS = re.compile(rb"[0-9]{19,}")
+_LONG_DIGITS_TEXT = re.compile(r"[0-9]{19,}")
+# Lines per write() call in LineWriter
+WRITE_BATCH = 1024
+
+
+def _select_codec(requested):
+    available = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+    if requested == "auto":
+        return next(name for name in CODECS if available[name])
+    if requested not in available:
+        raise ValueError(f"DATASET_JSON_CODEC must be auto or one of {', '.join(CODECS)}, got {requested!r}")
+    if not available[requested]:
+        raise ImportError(f"DATASET_JSON_CODEC={requested} but {requested} is not installed")
+    return requested
+
+
+CODEC = _select_codec(os.getenv("DATASET_JSON_CODEC", "auto").strip().lower())
+
+if CODEC == "orjson":
+    _fast_loads, _fast_error = orjson.loads, orjson.JSONDecodeError
+elif CODEC == "msgspec":
+    _fast_loads, _fast_error = msgspec.json.Decoder().decode, msgspec.DecodeError
+else:
+    _fast_loads, _fast_error = None, None
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def loads(data):
+    """Decode one JSON document (bytes or str) like json.loads"""
+    if _fast_loads is not None:
+        long_digits = _LONG_DIGITS if isinstance(data, bytes) else _LONG_DIGITS_TEXT
+        if long_digits.search(data) is None:
+            try:
+                return _fast_loads(data)
+            except _fast_error:
+                pass
+    return json.loads(data)
+
+
+def dumps(obj):
+    """UTF-8 bytes of json.dumps(obj, ensure_ascii=False)"""
+    return _ENCODER.encode(obj).encode("utf-8")
+
+
+def iter_ndjson(path):
+    """Decoded objects of a newline-delimited JSON file, skipping blank lines"""
+    with open(path, "rb") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield loads(line)
+
+
+class LineWriter:
+    """
+    NDJSON writer on a binary handle: one record per line, written `batch`
+    lines at a time instead of one write() per record
+    """
+
+    def __init__(self, handle, batch=WRITE_BATCH):
+        self.handle = handle
+        self.batch = batch
+        self._pending = []
+
+    def write(self, record):
+        self.write_line(dumps(record) + b"\n")
+
+    def write_line(self, line):
+        """Queue an already encoded line (bytes ending with a newline)"""
+        self._pending.append(line)
+        if len(self._pending) >= self.batch:
+            self.flush()
+
+    def write_lines(self, lines):
+        self._pending.extend(lines)
+        if len(self._pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.handle.write(b"".join(self._pending))
+            self._pending.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Compiled linear scorer for the attrition model.
+
+Everything before the sigmoid is affine:
+
+    raw:        [numeric | one-hot] -> StandardScaler/one-hot -> PCA -> StandardScaler -> LR
+    components: PCA components -> StandardScaler -> LR
+
+so both chains collapse into one weight vector and bias at export time, and
+scoring is `expit(X @ w + b)` in NumPy. For raw records the one-hot block
+becomes a per-column lookup table {category: weight}; unseen categories weigh
+0, matching OneHotEncoder(handle_unknown="ignore").
+
+Compiled format (plain dict, stored under "compiled" in attrition_lr.joblib):
+
+    {
+        "format": "linear-v1",
+        "weights": ndarray (n_components,),  "bias": float,
+        "raw": None | {
+            "numeric_cols": [...], "categorical_cols": [...],
+            "numeric_weights": ndarray (n_numeric,),
+            "category_weights": [{category: weight}, ...],
+            "bias": float,
+        },
+    }
+
+Only NumPy is imported here so the service can use it without sklearn calls.
+"""
+
+import numpy as np
+
+from feature_pipeline import records_to_arrays
+
+COMPILED_FORMAT = "linear-v1"
+TOLERANCE = 1e-9
+
+
+def expit(x):
+    """Numerically stable logistic sigmoid"""
+    return np.exp(-np.logaddexp(0.0, -x))
+
+
+def _scaler_params(scaler):
+    mean = scaler.mean_ if getattr(scaler, "with_mean", True) and scaler.mean_ is not None else 0.0
+    scale = scaler.scale_ if getattr(scaler, "with_std", True) and scaler.scale_ is not None else 1.0
+    return mean, scale
+
+
+def compile_bundle(bundle):
+    """Fold the scaler/model bundle (and its feature pipeline, if any) into a linear scorer"""
+    scaler, model = bundle["scaler"], bundle["model"]
+    if model.coef_.shape[0] != 1:
+        raise ValueError("only binary logistic regression can be compiled")
+
+    # components -> scaler -> LR:  ((p - m) / s) @ c + i  =  p @ (c / s) + (i - (m / s) @ c)
+    coef = model.coef_[0].astype(float)
+    mean, scale = _scaler_params(scaler)
+    weights = coef / scale
+    bias = float(model.intercept_[0] - np.sum(mean * weights))
+    compiled = {"format": COMPILED_FORMAT, "weights": weights, "bias": bias, "raw": None}
+
+    features = bundle.get("features")
+    if features is not None:
+        compiled["raw"] = _compile_features(features, weights, bias)
+    return compiled
+
+
+def _compile_features(features, weights, bias):
+    pca = features["pca"]
+    # combined -> PCA:  (x - mu) @ V.T  (/ sqrt(var) when whitened)
+    projection = pca.components_.T
+    if getattr(pca, "whiten", False):
+        projection = projection / np.sqrt(pca.explained_variance_)
+    combined_weights = projection @ weights
+    bias = bias - float(pca.mean_ @ combined_weights)
+
+    n_numeric = len(features["numeric_cols"])
+    mean, scale = _scaler_params(features["scaler"])
+    numeric_weights = combined_weights[:n_numeric] / scale
+    bias -= float(np.sum(mean * numeric_weights))
+
+    category_weights, offset = [], n_numeric
+    for categories in features["encoder"].categories_:
+        block = combined_weights[offset : offset + len(categories)]
+        category_weights.append({str(category): float(w) for category, w in zip(categories, block)})
+        offset += len(categories)
+
+    return {
+        "numeric_cols": list(features["numeric_cols"]),
+        "categorical_cols": list(features["categorical_cols"]),
+        "numeric_weights": numeric_weights,
+        "category_weights": category_weights,
+        "bias": bias,
+    }
+
+
+def load_compiled(bundle):
+    """The bundle's compiled scorer, compiling on the fly for bundles saved before it existed"""
+    compiled = bundle.get("compiled")
+    if compiled is None or compiled.get("format") != COMPILED_FORMAT:
+        compiled = compile_bundle(bundle)
+    return compiled
+
+
+def decision_components(compiled, matrix):
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim != 2 or matrix.shape[1] != compiled["weights"].shape[0]:
+        raise ValueError(
+            f"expected {compiled['weights'].shape[0]} components per sample, got shape {matrix.shape}"
+        )
+    return matrix @ compiled["weights"] + compiled["bias"]
+
+
+def score_components(compiled, matrix):
+    """Attrition probability for rows of PCA components"""
+    return expit(decision_components(compiled, matrix))
+
+
+def score_arrays(compiled, numeric, categorical):
+    """Attrition probability for flattened numeric / categorical arrays (see records_to_arrays)"""
+    raw = compiled["raw"]
+    decision = np.asarray(numeric, dtype=float) @ raw["numeric_weights"] + raw["bias"]
+    for column, table in enumerate(raw["category_weights"]):
+        decision += np.fromiter((table.get(value, 0.0) for value in categorical[:, column]), float, len(decision))
+    return expit(decision)
+
+
+def score_records(compiled, records):
+    """Attrition probability for cleaned nested records"""
+    raw = compiled["raw"]
+    if raw is None:
+        raise ValueError("compiled model has no feature pipeline")
+    numeric, categorical = records_to_arrays(records, raw["numeric_cols"], raw["categorical_cols"])
+    return score_arrays(compiled, numeric, categorical)
+
+
+def verify_compiled(bundle, compiled, components=None, n_samples=1000, seed=42):
+    """
+    Max absolute difference between the compiled scorer and the sklearn chain
+
+    Components default to random rows around the scaler's mean; raw inputs are
+    random numeric rows plus categories drawn from the encoder (including one
+    unseen category per column).
+    """
+    rng = np.random.default_rng(seed)
+    scaler, model = bundle["scaler"], bundle["model"]
+    if components is None:
+        mean, scale = _scaler_params(scaler)
+        components = mean + scale * rng.standard_normal((n_samples, scaler.n_features_in_))
+    reference = model.predict_proba(scaler.transform(components))[:, 1]
+    report = {"components_max_abs_diff": float(np.max(np.abs(score_components(compiled, components) - reference)))}
+
+    features = bundle.get("features")
+    if features is not None and compiled["raw"] is not None:
+        mean, scale = _scaler_params(features["scaler"])
+        numeric = mean + scale * rng.standard_normal((n_samples, len(features["numeric_cols"])))
+        categorical = np.empty((n_samples, len(features["categorical_cols"])), dtype=object)
+        for column, categories in enumerate(features["encoder"].categories_):
+            choices = [str(c) for c in categories] + ["<unseen>"]
+            categorical[:, column] = [choices[i] for i in rng.integers(0, len(choices), n_samples)]
+        combined = np.hstack([features["scaler"].transform(numeric), features["encoder"].transform(categorical)])
+        reference = model.predict_proba(scaler.transform(features["pca"].transform(combined)))[:, 1]
+        got = score_arrays(compiled, numeric, categorical)
+        report["raw_max_abs_diff"] = float(np.max(np.abs(got - reference)))
+    return report
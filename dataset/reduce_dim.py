@@ -7,17 +7,24 @@ Example:
         --input dataset/test.ai_model_metadata.clean.json \
         --output dataset/test.ai_model_metadata.pca.csv \
         --method pca --components 20
+
+The fitted scaler / one-hot encoder / PCA are saved to --pipeline-out so that
+train_model.py can bundle them with the classifier (see feature_pipeline.py).
 """
 
 import argparse
 import json
 import pathlib
 
+import joblib
 import numpy as np
 import pandas as pd
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from feature_pipeline import IMPORTANT_CATEGORICAL, IMPORTANT_NUMERIC, build_feature_bundle, flatten_record
+from json_codec import iter_ndjson
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Dimensionality reduction for HR dataset")
@@ -45,86 +52,29 @@ def parse_args():
         default=20,
         help="Number of output components (for PCA)",
     )
+    parser.add_argument(
+        "--pipeline-out",
+        type=pathlib.Path,
+        default=pathlib.Path("dataset/models/attrition_features.joblib"),
+        help="Path to save the fitted feature pipeline (scaler, encoder, PCA)",
+    )
     return parser.parse_args()
 
 
 def load_records(path: pathlib.Path):
-    records = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            records.append(json.loads(line))
-    return records
-
-
-IMPORTANT_CATEGORICAL = [
-    "loai_mo_hinh",
-    "ung_dung",
-    "trang_thai",
-    "ca_nhan_phong_ban",
-    "cong_viec_vi_tri_cong_viec",
-    "cong_viec_cap_bac",
-]
-
-IMPORTANT_NUMERIC = [
-    "accuracy",
-    "f1_score",
-    "ca_nhan_tuoi",
-    "ca_nhan_so_nam_lam_viec",
-    "cong_viec_muc_luong_hien_tai",
-    "cong_viec_so_gio_moi_tuan",
-    "cong_viec_gio_ot",
-    "cong_viec_so_du_an_tham_gia",
-    "hieu_suat_diem_kpi",
-    "hieu_suat_gio_dao_tao",
-    "hieu_suat_so_lan_thang_chuc",
-    "hieu_suat_thang_tu_lan_thang_chuc_cuoi",
-    "phuc_loi_muc_do_hai_long",
-    "phuc_loi_can_bang_cong_viec",
-    "phuc_loi_so_ngay_nghi_phep",
-    "phuc_loi_so_lan_di_muon",
-    "phuc_loi_diem_gan_ket",
-]
-
-
-def flatten_record(record):
-    base = {
-        "ten_mo_hinh": record["ten_mo_hinh"],
-        "phien_ban": record["phien_ban"],
-        "loai_mo_hinh": record["loai_mo_hinh"],
-        "ung_dung": record["ung_dung"],
-        "accuracy": record["accuracy"],
-        "f1_score": record["f1_score"],
-        "trang_thai": record["trang_thai"],
-    }
-    dl = record["du_lieu_gia_lap"]
-    personal = dl["thong_tin_ca_nhan"]
-    job = dl["thong_tin_cong_viec"]
-    perf = dl["thong_tin_hieu_suat"]
-    wellbeing = dl["thai_do_phuc_loi"]
-
-    for prefix, data in [
-        ("ca_nhan", personal),
-        ("cong_viec", job),
-        ("hieu_suat", perf),
-        ("phuc_loi", wellbeing),
-    ]:
-        for key, value in data.items():
-            base[f"{prefix}_{key}"] = value
-    return base
+    return list(iter_ndjson(path))
 
 
 def reduce_pca(df, n_components):
     numeric_cols = [col for col in IMPORTANT_NUMERIC if col in df.columns]
     categorical_cols = [col for col in IMPORTANT_CATEGORICAL if col in df.columns]
 
+    # Fit on plain arrays so the service can transform arrays without feature-name checks
     scaler = StandardScaler()
-    scaled_numeric = scaler.fit_transform(df[numeric_cols])
+    scaled_numeric = scaler.fit_transform(df[numeric_cols].to_numpy(dtype=float))
 
     encoder = OneHotEncoder(sparse_output=False, handle_unknown="ignore")
-    encoded_cat = encoder.fit_transform(df[categorical_cols])
+    encoded_cat = encoder.fit_transform(df[categorical_cols].fillna("").astype(str).to_numpy(dtype=object))
 
     combined = np.hstack([scaled_numeric, encoded_cat])
 
@@ -139,8 +89,11 @@ def reduce_pca(df, n_components):
     meta = {
         "explained_variance_ratio": pca.explained_variance_ratio_.tolist(),
         "n_original_features": combined.shape[1],
+        "numeric_cols": numeric_cols,
+        "categorical_cols": categorical_cols,
     }
-    return reduced_df, meta
+    features = build_feature_bundle(numeric_cols, categorical_cols, scaler, encoder, pca)
+    return reduced_df, meta, features
 
 
 def main():
@@ -150,7 +103,7 @@ def main():
     df = pd.DataFrame(flattened)
 
     if args.method == "pca":
-        reduced_df, meta = reduce_pca(df, args.components)
+        reduced_df, meta, features = reduce_pca(df, args.components)
     else:
         raise NotImplementedError(f"Method {args.method} not supported yet.")
 
@@ -161,8 +114,12 @@ def main():
     with meta_path.open("w", encoding="utf-8") as handle:
         json.dump(meta, handle, indent=2)
 
+    args.pipeline_out.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(features, args.pipeline_out)
+
     print(f"Reduced dataset saved to {args.output}")
     print(f"Metadata saved to {meta_path}")
+    print(f"Feature pipeline saved to {args.pipeline_out}")
     print(f"Original samples: {len(df):,}")
     print(f"PCA components shape: {reduced_df.shape}")
 
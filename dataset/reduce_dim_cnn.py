@@ -22,6 +22,8 @@ from sklearn.neural_network import MLPRegressor
 import joblib
 import os
 
+from json_codec import iter_ndjson
+
 # Set random seeds for reproducibility
 np.random.seed(42)
 if TORCH_AVAILABLE:
@@ -31,10 +33,7 @@ if TORCH_AVAILABLE:
 
 def load_and_prepare_data(input_path):
     """Load cleaned JSON and prepare features"""
-    records = []
-    with open(input_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            records.append(json.loads(line))
+    records = list(iter_ndjson(input_path))
     
     df = pd.DataFrame(records)
     
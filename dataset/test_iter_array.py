@@ -0,0 +1,55 @@
+"""iter_array must decode exactly what json.loads does, whatever the block size"""
+
+import io
+import json
+import random
+
+import pytest
+
+from clean_dataset import iter_array
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 2 else 4)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return rng.choice([0.1, -2.5e-07, 1.5e10, 1e-5, 123.456, -0.0, rng.uniform(-1e6, 1e6)])
+    if kind == 2:
+        return rng.choice(["", "a", "Nữ", "x y\n", '"quoted"', "\\", "é€"])
+    if kind == 3:
+        return rng.choice([True, False, None])
+    if kind == 4:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+
+
+def random_document(rng):
+    items = [random_value(rng) for _ in range(rng.randrange(8))]
+    separators = rng.choice([(",", ":"), (", ", ": "), (" ,\n ", " : ")])
+    indent = rng.choice([None, 2])
+    return json.dumps(items, ensure_ascii=rng.random() < 0.5, separators=separators, indent=indent)
+
+
+FIXED = ["[0.1]", "[1.5e10, 2]", "[-2.5e-07]", "[ 10 , 20 ]", "[]", " [ ] ", "[true,null,false]", '["a", {"b": [1.25]}]']
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7])
+@pytest.mark.parametrize("text", FIXED)
+def test_fixed(text, read_size):
+    assert list(iter_array(io.StringIO(text), read_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3])
+def test_random(read_size):
+    rng = random.Random(read_size)
+    for _ in range(300):
+        text = random_document(rng)
+        assert list(iter_array(io.StringIO(text), read_size)) == json.loads(text), text
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 1 << 20])
+@pytest.mark.parametrize("text", ["", "[1", "[1 2]", "[1,]", "[1] 2", "{}"])
+def test_invalid(text, read_size):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array(io.StringIO(text), read_size))
@@ -7,11 +7,26 @@ Example:
         --train dataset/train_quit.csv \
         --val dataset/val_quit.csv \
         --model-out dataset/models/attrition_lr.joblib
+
+When the feature pipeline written by reduce_dim.py exists (--features), it is
+stored in the same bundle so the model can score raw cleaned records.
+
+The bundle also carries a compiled linear scorer (see linear_scorer.py) that
+folds scaler(s), PCA and LR into one weight vector; it is checked against the
+sklearn chain before saving.
+
+With --registry the bundle is also published as <registry>/<version>.joblib
+for the ML service's model registry (--activate also points CURRENT at it):
+
+    python dataset/train_model.py --train ... --val ... \
+        --registry dataset/models/registry --activate
 """
 
 import argparse
 import json
+import os
 import pathlib
+import time
 
 import joblib
 import numpy as np
@@ -26,6 +41,8 @@ from sklearn.metrics import (
 )
 from sklearn.preprocessing import StandardScaler
 
+from linear_scorer import TOLERANCE, compile_bundle, verify_compiled
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Train attrition model on PCA features")
@@ -43,6 +60,27 @@ def parse_args():
         default=pathlib.Path("dataset/models/attrition_metrics.json"),
         help="Path to save metrics JSON",
     )
+    parser.add_argument(
+        "--features",
+        type=pathlib.Path,
+        default=pathlib.Path("dataset/models/attrition_features.joblib"),
+        help="Feature pipeline from reduce_dim.py to bundle with the model (skipped if missing)",
+    )
+    parser.add_argument(
+        "--registry",
+        type=pathlib.Path,
+        help="Also publish the bundle to this model registry directory",
+    )
+    parser.add_argument(
+        "--version",
+        default=None,
+        help="Registry version name (default: UTC timestamp, e.g. 20240101-120000)",
+    )
+    parser.add_argument(
+        "--activate",
+        action="store_true",
+        help="Point the registry's CURRENT file at the new version",
+    )
     return parser.parse_args()
 
 
@@ -54,6 +92,20 @@ def load_dataset(path: pathlib.Path):
     return X, y
 
 
+def publish(bundle, registry, version, activate):
+    """Write <registry>/<version>.joblib via a temp file + rename so watchers never see a partial bundle"""
+    registry.mkdir(parents=True, exist_ok=True)
+    target = registry / f"{version}.joblib"
+    tmp = registry / f".{version}.joblib.tmp"
+    joblib.dump(bundle, tmp)
+    os.replace(tmp, target)
+    if activate:
+        pointer_tmp = registry / ".CURRENT.tmp"
+        pointer_tmp.write_text(version + "\n", encoding="utf-8")
+        os.replace(pointer_tmp, registry / "CURRENT")
+    return target
+
+
 def main():
     args = parse_args()
     X_train, y_train = load_dataset(args.train)
@@ -77,14 +129,37 @@ def main():
         "classification_report": classification_report(y_val, val_preds, output_dict=True),
     }
 
+    bundle = {"scaler": scaler, "model": model}
+    if args.features.exists():
+        features = joblib.load(args.features)
+        if features["pca"].n_components_ != X_train.shape[1]:
+            raise ValueError(
+                f"Feature pipeline {args.features} outputs {features['pca'].n_components_} components, "
+                f"training data has {X_train.shape[1]}"
+            )
+        bundle["features"] = features
+    else:
+        print(f"Feature pipeline not found at {args.features}; /predict/raw will be unavailable")
+
+    compiled = compile_bundle(bundle)
+    parity = verify_compiled(bundle, compiled, components=X_val)
+    if max(parity.values()) > TOLERANCE:
+        raise ValueError(f"Compiled scorer differs from sklearn by more than {TOLERANCE:g}: {parity}")
+    bundle["compiled"] = compiled
+    metrics["compiled_parity"] = parity
+
     args.model_out.parent.mkdir(parents=True, exist_ok=True)
-    joblib.dump({"scaler": scaler, "model": model}, args.model_out)
+    joblib.dump(bundle, args.model_out)
 
     args.metrics_out.parent.mkdir(parents=True, exist_ok=True)
     with args.metrics_out.open("w", encoding="utf-8") as handle:
         json.dump(metrics, handle, indent=2)
 
     print(f"Model saved to {args.model_out}")
+    if args.registry:
+        version = args.version or time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+        target = publish(bundle, args.registry, version, args.activate)
+        print(f"Published version {version} to {target}" + (" (active)" if args.activate else ""))
     print(f"Metrics saved to {args.metrics_out}")
     print("Validation scores:")
     print(f"  Accuracy : {metrics['accuracy']:.4f}")
@@ -3,36 +3,180 @@
 FastAPI service for attrition inference.
 
 Loads the trained scaler + logistic regression model from dataset/models/attrition_lr.joblib
-and exposes POST /predict endpoint that accepts PCA component arrays.
+and exposes POST /predict endpoint that accepts PCA component arrays. When the bundle also
+holds the feature pipeline (see dataset/feature_pipeline.py), POST /predict/raw scores
+cleaned du_lieu_gia_lap records directly. Both score with the compiled linear model
+(expit(X @ w + b), see dataset/linear_scorer.py) instead of calling sklearn per request.
+
+Attrition models come from a versioned registry (model_registry.py); a retrained
+bundle is swapped in with POST /admin/models/reload (or the optional file watch)
+without restarting, and /predict?model_version=... scores with any registered version.
+
+Models are loaded by a background warmup thread at startup: /healthz is the
+liveness probe, /readyz turns 200 only once every model is loaded and warmed up.
+
+GET /metrics exposes request counts, batch sizes, per-stage latency histograms
+(parse / tokenize / forward / postprocess / serialize), model load times and
+cache hit rates in the Prometheus text format (see metrics.py).
+
+With ML_PROFILING=1, an X-Profile header (or ?profile=) runs a request's model
+call under cProfile / pyinstrument / torch.profiler (see profiling.py).
 """
 
+import asyncio
+import os
+import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-import joblib
 import numpy as np
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel, Field, model_validator
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+import metrics
+import profiling
+from batching import MicroBatcher
+from inference_pool import InferencePool, QueueFullError
+from matrix_codec import BINARY_MEDIA_TYPES, decode_matrix, encode_predictions, media_type
+from model_registry import ModelRegistry
+from sentiment_cache import get_result_cache
+from warmup import ModelWarmup
 
-# Import BERT sentiment analyzer
 try:
-    from sentiment_bert import get_analyzer
-    BERT_AVAILABLE = True
+  import orjson
 except ImportError:
-    BERT_AVAILABLE = False
-    print("Warning: BERT sentiment analyzer not available. Install transformers and torch.")
+  orjson = None
+  print("Warning: orjson not installed; /predict responses use the slower stdlib JSON encoder")
+
+# BERT sentiment analyzer; torch/transformers are only imported when the model is built
+from sentiment_bert import RULES_ONLY, get_analyzer, transformers_available
+
+# SENTIMENT_BACKEND=rules serves keyword-rule sentiment without torch/transformers
+BERT_AVAILABLE = RULES_ONLY or transformers_available()
+if not BERT_AVAILABLE:
+  print("Warning: BERT sentiment analyzer not available. Install transformers and torch.")
 
 BASE_DIR = Path(__file__).resolve().parent
-MODEL_PATH = BASE_DIR.parent / "dataset" / "models" / "attrition_lr.joblib"
+DATASET_DIR = BASE_DIR.parent / "dataset"
+MODEL_PATH = DATASET_DIR / "models" / "attrition_lr.joblib"
+
+# Versioned bundles (see model_registry.py); MODEL_PATH is served as version "default"
+MODEL_DIR = Path(os.getenv("ATTRITION_MODEL_DIR", DATASET_DIR / "models" / "registry"))
+MODEL_WATCH_S = float(os.getenv("ATTRITION_MODEL_WATCH_S", "0"))
+MODEL_CACHE = int(os.getenv("ATTRITION_MODEL_CACHE", "3"))
+# Read-only memory-mapped bundle arrays, shared across uvicorn workers
+MODEL_MMAP = os.getenv("ATTRITION_MODEL_MMAP", "r")
+# Required in X-Admin-Token for /admin endpoints when set
+ADMIN_TOKEN = os.getenv("ML_ADMIN_TOKEN", "")
+
+# Compiled scorer shared with the offline scripts
+sys.path.insert(0, str(DATASET_DIR))
+import linear_scorer  # noqa: E402
+
+registry = ModelRegistry(
+  MODEL_DIR,
+  linear_scorer.load_compiled,
+  default_path=MODEL_PATH,
+  max_loaded=MODEL_CACHE,
+  mmap_mode=MODEL_MMAP,
+)
 
-if not MODEL_PATH.exists():
-  raise RuntimeError(f"Model file not found at {MODEL_PATH}")
+# Load PhoBERT in the background at startup instead of on the first /sentiment request
+WARMUP_SENTIMENT = os.getenv("ML_WARMUP_SENTIMENT", "1") != "0"
+# Whether /readyz waits for it: off by default, so a slow or failed PhoBERT load (or
+# download) does not keep /predict traffic away from an otherwise healthy pod
+REQUIRE_SENTIMENT = os.getenv("ML_REQUIRE_SENTIMENT", "0") == "1"
 
-bundle = joblib.load(MODEL_PATH)
-SCALER = bundle["scaler"]
-MODEL = bundle["model"]
+# Blocking sklearn/torch work runs on a bounded thread pool, never on the event loop
+INFERENCE_WORKERS = int(os.getenv("ML_INFERENCE_WORKERS", "2"))
+INFERENCE_MAX_PENDING = int(os.getenv("ML_INFERENCE_MAX_PENDING", "64"))
+INFERENCE_TIMEOUT_S = float(os.getenv("ML_INFERENCE_TIMEOUT_S", "30"))
+
+# Concurrent /sentiment requests are coalesced into one analyze_batch() call
+SENTIMENT_MAX_BATCH_SIZE = int(os.getenv("SENTIMENT_MAX_BATCH_SIZE", "16"))
+SENTIMENT_MAX_WAIT_MS = float(os.getenv("SENTIMENT_MAX_WAIT_MS", "5"))
+SENTIMENT_MAX_QUEUE = int(os.getenv("SENTIMENT_MAX_QUEUE", "256"))
 
 app = FastAPI(title="HR Attrition Predictor", version="1.0.0")
+app.add_middleware(metrics.RequestMetricsMiddleware)
+
+inference_pool = InferencePool(
+  max_workers=INFERENCE_WORKERS,
+  max_pending=INFERENCE_MAX_PENDING,
+  timeout=INFERENCE_TIMEOUT_S,
+)
+
+
+async def run_inference(awaitable):
+  """Await pooled inference, mapping backpressure and timeouts to HTTP errors"""
+  try:
+    return await asyncio.wait_for(awaitable, INFERENCE_TIMEOUT_S)
+  except QueueFullError as error:
+    raise HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "1"}) from error
+  except asyncio.TimeoutError as error:
+    raise HTTPException(
+      status_code=504,
+      detail=f"Inference did not finish within {INFERENCE_TIMEOUT_S:g}s",
+    ) from error
+
+
+def timed(model, stage, fn, *args):
+  """fn(*args) timed as one metrics stage; runs on the inference thread, so queueing is not counted"""
+  with metrics.stage(model, stage):
+    return fn(*args)
+
+
+def profile_mode(request):
+  """Profiler requested with X-Profile / ?profile= (always None unless ML_PROFILING=1)"""
+  try:
+    mode = profiling.requested_mode(request.headers, request.query_params)
+  except ValueError as error:
+    raise HTTPException(status_code=400, detail=str(error)) from error
+  if mode is not None:
+    check_admin(request.headers.get("x-admin-token"))
+  return mode
+
+
+async def infer(profile, name, fn, *args):
+  """
+  Run fn(*args) on the inference pool; returns (result, profile file stem or None)
+
+  With a profile mode the call runs under that profiler on the inference thread.
+  """
+  if profile is None:
+    return await run_inference(inference_pool.run(fn, *args)), None
+  return await run_inference(inference_pool.run(profiling.run_profiled, profile, name, fn, *args))
+
+
+def run_sentiment_batch(items, mode=None, use_cache=True):
+  """Score (text, rating) pairs queued by the sentiment batcher"""
+  analyzer = get_analyzer()
+  return analyzer.analyze_batch(
+    [text for text, _ in items], [rating for _, rating in items], mode=mode, use_cache=use_cache
+  )
+
+
+def run_coalesced_sentiment(items):
+  metrics.observe_batch("sentiment_coalesced", len(items))
+  return run_sentiment_batch(items)
+
+
+sentiment_batcher = MicroBatcher(
+  run_coalesced_sentiment,
+  max_batch_size=SENTIMENT_MAX_BATCH_SIZE,
+  max_wait_ms=SENTIMENT_MAX_WAIT_MS,
+  max_queue=SENTIMENT_MAX_QUEUE,
+  run=inference_pool.run,
+)
+
+
+@app.on_event("shutdown")
+async def stop_inference():
+  registry.stop()
+  await sentiment_batcher.stop()
+  inference_pool.shutdown()
 
 
 class PCASample(BaseModel):
@@ -55,33 +199,396 @@ class BatchRequest(BaseModel):
     return self
 
 
+class RawBatchRequest(BaseModel):
+  records: List[Dict[str, Any]] = Field(
+    ..., description="Cleaned records with nested du_lieu_gia_lap (clean_dataset.py output)"
+  )
+
+  @model_validator(mode="after")
+  def check_records(self):
+    if not self.records:
+      raise ValueError("records list must contain at least one entry")
+    return self
+
+
+def load_attrition_model():
+  if not registry.versions():
+    raise RuntimeError(f"No model found in {MODEL_DIR} or at {MODEL_PATH}")
+  entry = registry.activate()
+  if entry.compiled["raw"] is None:
+    print("Warning: model bundle has no feature pipeline; /predict/raw is disabled")
+  return entry
+
+
+def warm_attrition_model(entry):
+  linear_scorer.score_components(entry.compiled, np.zeros((1, entry.compiled["weights"].shape[0])))
+
+
+def warm_sentiment_model(analyzer):
+  # Bypass the result cache: a persistent cache would otherwise answer the
+  # warmup sentence on every restart and the forward pass would never run
+  analyzer.analyze_batch(["Tôi rất hài lòng với môi trường làm việc."], use_cache=False)
+
+
+warmup = ModelWarmup()
+warmup.register("attrition", load_attrition_model, warm_attrition_model)
+if BERT_AVAILABLE and WARMUP_SENTIMENT:
+  warmup.register("sentiment", get_analyzer, warm_sentiment_model, required=REQUIRE_SENTIMENT)
+
+
+@app.on_event("startup")
+async def start_warmup():
+  warmup.start()
+  registry.watch(MODEL_WATCH_S)
+
+
 @app.get("/healthz")
 async def health_check():
-  return {"status": "ok", "model_path": str(MODEL_PATH)}
+  """Liveness: the process is up and the event loop responds"""
+  active = registry.active
+  return {
+    "status": "ok",
+    "model_path": str(active.path if active is not None else MODEL_PATH),
+    "model_version": active.version if active is not None else None,
+    "ready": warmup.is_ready(),
+  }
+
+
+@app.get("/readyz")
+async def readiness_check():
+  """Readiness: every required model is loaded and warmed up; includes per-model startup times"""
+  report = warmup.report()
+  if not report["ready"]:
+    return JSONResponse(status_code=503, content=report)
+  return report
+
+
+def threshold_key(value):
+  return f"{value:g}"
+
+
+def select_predictions(probs, threshold, thresholds=None, top_k=None):
+  """
+  Labels for every requested threshold from one probability vector
+
+  Returns (index, probs, labels, threshold_labels, positives, mean_probability):
+  - index: rows kept by top_k, highest risk first (None without top_k)
+  - probs / labels: for the kept rows; labels at `threshold`
+  - threshold_labels: {"0.3": labels, ...} for the kept rows (None without thresholds)
+  - positives: {"0.3": count, ...} over the whole batch, before top_k
+  - mean_probability: mean over the whole batch, before top_k (None without thresholds / top_k)
+  """
+  threshold_labels = positives = mean_probability = None
+  cutoffs = np.array(sorted(set(thresholds))) if thresholds else None
+  if cutoffs is not None:
+    positives = {threshold_key(c): int(n) for c, n in zip(cutoffs, (probs[:, None] >= cutoffs).sum(axis=0))}
+  if (cutoffs is not None or top_k is not None) and len(probs):
+    mean_probability = float(probs.mean())
+
+  index = None
+  if top_k is not None:
+    if top_k < len(probs):
+      # O(n) selection of the k largest, then sort only those k
+      index = np.argpartition(-probs, top_k - 1)[:top_k]
+      index = index[np.argsort(-probs[index], kind="stable")]
+    else:
+      index = np.argsort(-probs, kind="stable")
+    probs = probs[index]
+
+  labels = (probs >= threshold).astype(int)
+  if cutoffs is not None:
+    # One row per threshold so every label vector is contiguous
+    matrix = (probs >= cutoffs[:, None]).astype(int)
+    threshold_labels = {threshold_key(c): matrix[j] for j, c in enumerate(cutoffs)}
+  return index, probs, labels, threshold_labels, positives, mean_probability
+
+
+def plain(value):
+  """Python value for a numpy array or scalar (for the stdlib JSON encoder); anything else as is"""
+  return value.tolist() if isinstance(value, (np.ndarray, np.generic)) else value
+
+
+def prediction_response(
+  probs, labels, layout="rows", extra_columns=None, threshold_labels=None, positives=None, mean_probability=None
+):
+  """
+  Serialize predictions without jsonable_encoder
+
+  rows:    [{"probability": p, "label": l}, ...]   (default, the original shape)
+  columns: {"probability": [...], "label": [...]}
+  `extra_columns` (name -> list) are added to every row / as extra columns.
+  `threshold_labels` adds "labels": {"0.3": l, ...} per row, or {"0.3": [...], ...}
+  with columns (which also carries the whole-batch "positives" counts).
+  `mean_probability` (whole batch, before top_k) is added with columns.
+  """
+  extra_columns = extra_columns or {}
+  if layout == "columns":
+    content = {**extra_columns, "probability": probs, "label": labels}
+    if threshold_labels is not None:
+      content["labels"] = threshold_labels
+      content["positives"] = positives
+    if mean_probability is not None:
+      content["mean_probability"] = mean_probability
+    if orjson is None:
+      content = {
+        name: {key: plain(v) for key, v in values.items()} if isinstance(values, dict) else plain(values)
+        for name, values in content.items()
+      }
+  else:
+    # Rows are built from Python values, so the stdlib fallback never meets numpy scalars
+    columns = {name: plain(values) for name, values in extra_columns.items()}
+    columns.update(probability=probs.tolist(), label=labels.tolist())
+    if threshold_labels is not None:
+      keys = list(threshold_labels)
+      matrix = np.column_stack(list(threshold_labels.values())).tolist()
+      columns["labels"] = [dict(zip(keys, row)) for row in matrix]
+    names = list(columns)
+    content = [dict(zip(names, values)) for values in zip(*columns.values())]
+  if orjson is None:
+    return JSONResponse(content=content)
+  return Response(content=orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY), media_type="application/json")
+
+
+def parse_json(schema, body):
+  """Validate a JSON body with Pydantic's Rust parser, reported like FastAPI's own body errors"""
+  try:
+    return schema.model_validate_json(body)
+  except ValidationError as error:
+    errors = [{**item, "loc": ("body", *item["loc"])} for item in error.errors(include_url=False)]
+    raise RequestValidationError(errors) from error
+
+
+def json_response(content, model):
+  """Serialize a plain JSON result (orjson when installed), timed as the serialize stage"""
+  with metrics.stage(model, "serialize"):
+    if orjson is None:
+      return JSONResponse(content=content)
+    return Response(content=orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY), media_type="application/json")
+
+
+def json_body(schema):
+  """openapi_extra documenting a body that the endpoint reads and validates itself"""
+  return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema.model_json_schema()}}}}
+
+
+async def resolve_model(version=None):
+  """
+  Model entry for a request: the active one, or `version` (loaded on first use)
+
+  The entry is taken once per request, so a concurrent reload never changes
+  the model under a request that is already running.
+  """
+  entry = registry.get(version)
+  if entry is None and version is not None:
+    try:
+      entry = await run_inference(inference_pool.run(registry.load, version))
+    except HTTPException:
+      raise
+    except KeyError as error:
+      raise HTTPException(status_code=404, detail=str(error.args[0])) from error
+    except Exception as error:
+      raise HTTPException(status_code=500, detail=f"Could not load model version {version}: {error}") from error
+  if entry is None:
+    raise HTTPException(status_code=503, detail="Attrition model is not loaded yet", headers={"Retry-After": "1"})
+  return entry
+
+
+MODEL_VERSION_QUERY = Query(None, description="Registry version to score with (default: the active model)")
+
+
+PREDICT_BODY = {
+  "requestBody": {
+    "required": True,
+    "content": {
+      "application/json": {"schema": BatchRequest.model_json_schema()},
+      **{kind: {"schema": {"type": "string", "format": "binary"}} for kind in BINARY_MEDIA_TYPES},
+    },
+  },
+}
+
+
+def check_thresholds(thresholds):
+  for value in thresholds or []:
+    if not 0.0 < value < 1.0:
+      raise HTTPException(status_code=400, detail=f"thresholds must be between 0 and 1, got {value}")
+
+
+THRESHOLDS_QUERY = Query(None, description="Extra thresholds (repeat the parameter); adds per-threshold labels")
+TOP_K_QUERY = Query(None, ge=1, description="Return only the k highest-risk rows, with their request index")
 
 
-@app.post("/predict")
-async def predict(batch: BatchRequest, threshold: float = Query(0.5, gt=0.0, lt=1.0)):
+@app.post("/predict", openapi_extra=PREDICT_BODY)
+async def predict(
+  request: Request,
+  threshold: float = Query(0.5, gt=0.0, lt=1.0),
+  thresholds: Optional[List[float]] = THRESHOLDS_QUERY,
+  top_k: Optional[int] = TOP_K_QUERY,
+  layout: Literal["rows", "columns"] = Query("rows", description="JSON response shape"),
+  model_version: Optional[str] = MODEL_VERSION_QUERY,
+):
+  """
+  Score PCA component rows
+
+  JSON ({"samples": [{"components": [...]}]}) by default; application/x-npy or
+  application/octet-stream bodies are decoded without per-float validation and
+  answered in the same format (see matrix_codec.py). JSON answers are a list of
+  {"probability", "label"} rows, or {"probability": [...], "label": [...]} with
+  layout=columns.
+
+  `thresholds=0.3&thresholds=0.7` adds labels for each threshold from the same
+  probabilities; `top_k=20` keeps only the 20 highest-risk rows (sorted, with
+  their "index" in the request). `model_version` scores with another registry
+  version (e.g. to shadow-compare a candidate); the version used is returned
+  in the X-Model-Version header.
+  """
+  check_thresholds(thresholds)
+  profile = profile_mode(request)
+
+  content_type = media_type(request.headers.get("content-type"))
+  if content_type in BINARY_MEDIA_TYPES and (thresholds or top_k):
+    raise HTTPException(status_code=400, detail="thresholds and top_k are only supported for JSON requests")
+  entry = await resolve_model(model_version)
+  body = await request.body()
+  with metrics.stage("attrition", "parse"):
+    if content_type in BINARY_MEDIA_TYPES:
+      try:
+        matrix = decode_matrix(body, content_type, request.headers, entry.compiled["weights"].shape[0])
+      except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    else:
+      batch = parse_json(BatchRequest, body)
+      try:
+        matrix = np.array([sample.components for sample in batch.samples], dtype=float)
+      except Exception as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+  metrics.observe_batch("predict", matrix.shape[0])
+
   try:
-    matrix = np.array([sample.components for sample in batch.samples], dtype=float)
-    scaled = SCALER.transform(matrix)
-    probs = MODEL.predict_proba(scaled)[:, 1]
+    probs, profile = await infer(
+      profile, "predict", timed, "attrition", "forward", linear_scorer.score_components, entry.compiled, matrix
+    )
+  except HTTPException:
+    raise
+  except Exception as error:
+    raise HTTPException(status_code=400, detail=str(error)) from error
+
+  if content_type in BINARY_MEDIA_TYPES:
     labels = (probs >= threshold).astype(int)
-    return [
-      {"probability": float(prob), "label": int(label)}
-      for prob, label in zip(probs, labels)
-    ]
+    with metrics.stage("attrition", "serialize"):
+      payload, headers = encode_predictions(probs, labels, content_type)
+    headers["X-Model-Version"] = entry.version
+    if profile:
+      headers[profiling.HEADER] = profile
+    return Response(content=payload, media_type=content_type, headers=headers)
+
+  with metrics.stage("attrition", "postprocess"):
+    index, probs, labels, threshold_labels, positives, mean_probability = select_predictions(
+      probs, threshold, thresholds, top_k
+    )
+  extra_columns = {"index": index} if index is not None else None
+  with metrics.stage("attrition", "serialize"):
+    response = prediction_response(probs, labels, layout, extra_columns, threshold_labels, positives, mean_probability)
+  response.headers["X-Model-Version"] = entry.version
+  if profile:
+    response.headers[profiling.HEADER] = profile
+  return response
+
+
+@app.post("/predict/raw", openapi_extra=json_body(RawBatchRequest))
+async def predict_raw(
+  request: Request,
+  threshold: float = Query(0.5, gt=0.0, lt=1.0),
+  thresholds: Optional[List[float]] = THRESHOLDS_QUERY,
+  top_k: Optional[int] = TOP_K_QUERY,
+  layout: Literal["rows", "columns"] = Query("rows", description="JSON response shape"),
+  model_version: Optional[str] = MODEL_VERSION_QUERY,
+):
+  """Score cleaned nested records: flatten, PCA features and classifier in one vectorized pass"""
+  check_thresholds(thresholds)
+  profile = profile_mode(request)
+  entry = await resolve_model(model_version)
+  body = await request.body()
+  with metrics.stage("attrition", "parse"):
+    batch = parse_json(RawBatchRequest, body)
+  if entry.compiled["raw"] is None:
+    raise HTTPException(
+      status_code=503,
+      detail="Model bundle has no feature pipeline. Re-run reduce_dim.py and train_model.py.",
+    )
+
+  metrics.observe_batch("predict_raw", len(batch.records))
+  try:
+    probs, profile = await infer(
+      profile, "predict_raw", timed, "attrition", "forward", linear_scorer.score_records, entry.compiled, batch.records
+    )
+  except HTTPException:
+    raise
   except Exception as error:
     raise HTTPException(status_code=400, detail=str(error)) from error
 
+  with metrics.stage("attrition", "postprocess"):
+    index, probs, labels, threshold_labels, positives, mean_probability = select_predictions(
+      probs, threshold, thresholds, top_k
+    )
+  records = batch.records if index is None else [batch.records[i] for i in index.tolist()]
+  ids = {
+    "ten_mo_hinh": [record.get("ten_mo_hinh") for record in records],
+    "phien_ban": [record.get("phien_ban") for record in records],
+  }
+  if index is not None:
+    ids = {"index": index, **ids}
+  with metrics.stage("attrition", "serialize"):
+    response = prediction_response(probs, labels, layout, ids, threshold_labels, positives, mean_probability)
+  response.headers["X-Model-Version"] = entry.version
+  if profile:
+    response.headers[profiling.HEADER] = profile
+  return response
+
+
+def check_admin(token):
+  if ADMIN_TOKEN and token != ADMIN_TOKEN:
+    raise HTTPException(status_code=403, detail="Invalid or missing X-Admin-Token")
+
+
+@app.get("/admin/models")
+async def list_models(x_admin_token: Optional[str] = Header(None)):
+  """Registry versions, the active model and the versions loaded in memory"""
+  check_admin(x_admin_token)
+  return registry.info()
+
+
+@app.post("/admin/models/reload")
+async def reload_model(
+  version: Optional[str] = Query(None, description="Version to activate (default: CURRENT / newest)"),
+  make_current: bool = Query(False, description="Also point CURRENT at the version so restarts keep it"),
+  x_admin_token: Optional[str] = Header(None),
+):
+  """
+  Load a model version in the background and swap it in atomically
+
+  Requests already running finish on the previous model; if loading fails the
+  previous model stays active.
+  """
+  check_admin(x_admin_token)
+  loop = asyncio.get_running_loop()
+  try:
+    entry = await loop.run_in_executor(None, registry.activate, version)
+    if make_current:
+      registry.set_current(entry.version)
+  except KeyError as error:
+    raise HTTPException(status_code=404, detail=str(error.args[0])) from error
+  except Exception as error:
+    raise HTTPException(status_code=500, detail=f"Reload failed, previous model kept: {error}") from error
+  return {"active": entry.info(), "current": registry.current_version()}
+
 
 class SentimentRequest(BaseModel):
   text: str = Field(..., description="Text to analyze")
   rating: Optional[float] = Field(None, ge=1.0, le=5.0, description="Optional rating (1-5)")
 
 
-@app.post("/sentiment")
-async def analyze_sentiment(request: SentimentRequest):
+@app.post("/sentiment", openapi_extra=json_body(SentimentRequest))
+async def analyze_sentiment(request: Request):
   """
   Analyze sentiment using BERT model (PhoBERT for Vietnamese)
   """
@@ -91,12 +598,170 @@ async def analyze_sentiment(request: SentimentRequest):
       detail="BERT sentiment analyzer not available. Please install transformers and torch."
     )
   
+  profile = profile_mode(request)
+  body = await request.body()
+  with metrics.stage("sentiment", "parse"):
+    item = parse_json(SentimentRequest, body)
   try:
-    analyzer = get_analyzer()
-    result = analyzer.analyze(request.text, request.rating)
-    return result
+    if profile is None:
+      result = await run_inference(sentiment_batcher.submit((item.text, item.rating)))
+    else:
+      # Profile this text alone instead of the micro-batch it would have joined, and
+      # past the result cache: a cache hit would profile a dict lookup, not the model
+      results, profile = await infer(profile, "sentiment", run_sentiment_batch, [(item.text, item.rating)], None, False)
+      result = results[0]
+  except HTTPException:
+    raise
   except Exception as error:
     raise HTTPException(status_code=500, detail=f"Sentiment analysis error: {str(error)}") from error
+  response = json_response(result, "sentiment")
+  if profile:
+    response.headers[profiling.HEADER] = profile
+  return response
+
+
+class SentimentBatchRequest(BaseModel):
+  items: List[SentimentRequest] = Field(..., description="List of texts (with optional ratings) to analyze")
+  mode: Optional[Literal["fast", "accurate"]] = Field(
+    None, description="Token budget: fast (short max length) or accurate; defaults to SENTIMENT_MODE"
+  )
+
+  @model_validator(mode="after")
+  def check_items(self):
+    if not self.items:
+      raise ValueError("items list must contain at least one entry")
+    return self
+
+
+@app.post("/sentiment/batch", openapi_extra=json_body(SentimentBatchRequest))
+async def analyze_sentiment_batch(request: Request):
+  """
+  Analyze many texts in one call; results are returned in request order
+  """
+  if not BERT_AVAILABLE:
+    raise HTTPException(
+      status_code=503,
+      detail="BERT sentiment analyzer not available. Please install transformers and torch."
+    )
+
+  profile = profile_mode(request)
+  body = await request.body()
+  with metrics.stage("sentiment", "parse"):
+    batch = parse_json(SentimentBatchRequest, body)
+  metrics.observe_batch("sentiment_request", len(batch.items))
+  try:
+    results, profile = await infer(
+      profile,
+      "sentiment_batch",
+      run_sentiment_batch,
+      [(item.text, item.rating) for item in batch.items],
+      batch.mode,
+      profile is None,  # a profiled call skips the result cache
+    )
+  except HTTPException:
+    raise
+  except Exception as error:
+    raise HTTPException(status_code=500, detail=f"Sentiment analysis error: {str(error)}") from error
+  response = json_response(results, "sentiment")
+  if profile:
+    response.headers[profiling.HEADER] = profile
+  return response
+
+
+@app.get("/sentiment/buckets")
+async def sentiment_bucket_stats():
+  """Per length-bucket batch latency, for tuning SENTIMENT_LENGTH_BUCKETS"""
+  analyzer = get_analyzer(create=False) if BERT_AVAILABLE else None
+  return analyzer.bucket_stats() if analyzer is not None else {}
+
+
+@app.get("/sentiment/cache")
+async def sentiment_cache_stats():
+  """Hit/miss counters and size of the sentiment result cache"""
+  cache = get_result_cache()
+  if cache is None:
+    return {"backend": "off"}
+  return cache.stats()
+
+
+@app.delete("/sentiment/cache")
+async def clear_sentiment_cache(x_admin_token: Optional[str] = Header(None)):
+  """Drop every cached result (shared by all workers with the sqlite backend)"""
+  check_admin(x_admin_token)
+  cache = get_result_cache()
+  if cache is not None:
+    cache.clear()
+  return {"status": "cleared"}
+
+
+def collect_model_timings():
+  report = warmup.report()
+  for name, status in report["models"].items():
+    yield "ml_model_load_seconds", {"model": name}, status.get("load_seconds")
+  for entry in registry.loaded():
+    yield "ml_model_load_seconds", {"model": f"attrition:{entry.version}"}, entry.load_seconds
+
+
+def collect_model_ready():
+  active = registry.active
+  for name in warmup.report()["models"]:
+    yield "ml_model_ready", {"model": name}, int(warmup.is_ready(name))
+  for entry in registry.loaded():
+    yield "ml_model_ready", {"model": f"attrition:{entry.version}"}, int(active is entry)
+
+
+def cache_stat(field, metric):
+  def collect():
+    cache = get_result_cache()
+    if cache is not None:
+      yield metric, {"cache": cache.backend}, cache.stats()[field]
+  return collect
+
+
+metrics.REGISTRY.collector(
+  "ml_model_load_seconds", "gauge",
+  "Seconds to load each model (warmup step, or one loaded attrition registry version)",
+  collect_model_timings,
+)
+metrics.REGISTRY.collector(
+  "ml_model_warmup_seconds", "gauge", "Seconds of the warmup forward pass after loading",
+  lambda: [
+    ("ml_model_warmup_seconds", {"model": name}, status.get("warmup_seconds"))
+    for name, status in warmup.report()["models"].items()
+  ],
+)
+metrics.REGISTRY.collector(
+  "ml_model_ready", "gauge", "1 when the model is loaded and warmed up (attrition versions: 1 = active)",
+  collect_model_ready,
+)
+metrics.REGISTRY.collector(
+  "ml_sentiment_cache_hits_total", "counter", "Sentiment result cache hits",
+  cache_stat("hits", "ml_sentiment_cache_hits_total"),
+)
+metrics.REGISTRY.collector(
+  "ml_sentiment_cache_misses_total", "counter", "Sentiment result cache misses",
+  cache_stat("misses", "ml_sentiment_cache_misses_total"),
+)
+metrics.REGISTRY.collector(
+  "ml_sentiment_cache_hit_ratio", "gauge", "Sentiment result cache hits / lookups since startup",
+  cache_stat("hit_rate", "ml_sentiment_cache_hit_ratio"),
+)
+metrics.REGISTRY.collector(
+  "ml_sentiment_cache_entries", "gauge", "Entries held by the sentiment result cache",
+  cache_stat("size", "ml_sentiment_cache_entries"),
+)
+metrics.REGISTRY.collector(
+  "ml_inference_pending", "gauge", "Calls running or queued on the inference thread pool",
+  lambda: [("ml_inference_pending", {}, inference_pool.pending)],
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+  """Prometheus text exposition of this worker's metrics"""
+  if not metrics.ENABLED:
+    raise HTTPException(status_code=404, detail="Metrics are disabled (ML_METRICS=0)")
+  return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 
 if __name__ == "__main__":
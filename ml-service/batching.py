@@ -0,0 +1,116 @@
+"""
+Micro-batching request coalescer
+
+Concurrent callers submit one item at a time; a background task groups queued
+items into batches of at most `max_batch_size`, waiting at most `max_wait_ms`
+after the first item of a batch arrives, runs each batch through a single call
+of `batch_fn` and fans the results back out to the awaiting coroutines.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+from inference_pool import QueueFullError
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 0,
+        run: Optional[Callable[..., Awaitable[Any]]] = None,
+    ):
+        """
+        Args:
+            batch_fn: Blocking function mapping a list of items to a list of results
+                (same length, same order); it runs outside the event loop
+            max_batch_size: Upper bound on items handed to batch_fn at once
+            max_wait_ms: Longest time the first queued item waits for company
+            max_queue: Items allowed to wait in the queue before QueueFullError (0 = unbounded)
+            run: Coroutine function `run(batch_fn, items)` used to execute a batch,
+                e.g. InferencePool.run; defaults to the loop's default executor
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_queue = max(0, int(max_queue))
+        self.run = run
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background worker on the running event loop (idempotent)"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker and fail any item still waiting in the queue"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("batcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+        self.start()
+        if self.max_queue and self._queue.qsize() >= self.max_queue:
+            raise QueueFullError(f"batch queue is full ({self.max_queue} waiting)")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """Wait for one item, then gather more until the batch is full or max_wait elapses"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Items that are already queued never wait
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Skip callers that gave up (client disconnect, timeout) while queued
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                items = [item for item, _ in batch]
+                if self.run is not None:
+                    results = await self.run(self.batch_fn, items)
+                else:
+                    results = await loop.run_in_executor(None, self.batch_fn, items)
+                if len(results) != len(batch):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the ML service
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+fails when the cumulative import time exceeds the budget or when a heavy
+package (torch, transformers) is pulled in at import. Those are meant to load
+lazily, in the background warmup, when the sentiment model is first built.
+
+Usage
+-----
+python ml-service/check_import_time.py                      # import app, 1.5 s budget
+python ml-service/check_import_time.py --module sentiment_bert --budget-ms 300 --top 15
+"""
+
+import argparse
+import os
+import pathlib
+import subprocess
+import sys
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent
+FORBIDDEN = ("torch", "transformers", "onnxruntime")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fail when importing the service is too slow")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Maximum cumulative import time")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to print")
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=list(FORBIDDEN),
+        help="Top-level packages that must not be imported (default: %(default)s)",
+    )
+    return parser.parse_args()
+
+
+def measure(module):
+    """Return [(cumulative_us, self_us, name)] parsed from -X importtime output"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(BASE_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"import {module} failed:\n{tail}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), int(parts[0]), parts[2].rstrip()))
+    return rows
+
+
+def main():
+    args = parse_args()
+    try:
+        rows = measure(args.module)
+    except RuntimeError as error:
+        print(error)
+        return 2
+
+    target = next((row for row in rows if row[2].strip() == args.module), None)
+    total_ms = (target[0] if target else sum(row[1] for row in rows)) / 1000
+    imported = {row[2].strip() for row in rows}
+    leaked = sorted(name for name in args.forbid if name in imported)
+
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms), {len(rows)} modules")
+    print(f"Slowest {args.top} by cumulative time:")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:9.1f} ms  (self {self_us / 1000:7.1f} ms)  {name.strip()}")
+
+    failed = False
+    if leaked:
+        print(f"FAIL: heavy packages imported eagerly: {', '.join(leaked)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("Import budget OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
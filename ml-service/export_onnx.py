@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Export / convert the sentiment models for the CPU inference backends and
+check their accuracy against the fp32 torch models.
+
+Usage
+-----
+# Export encoder.onnx + nli.onnx (and their int8-quantized copies)
+python ml-service/export_onnx.py export --quantize
+
+# Compare every backend against torch on the fixture set
+python ml-service/export_onnx.py check --backends torch-int8 onnx onnx-int8
+
+# Write memory-mappable fp32 weights shared by all uvicorn workers (see mmap_weights.py)
+python ml-service/export_onnx.py mmap
+
+The service picks a backend with SENTIMENT_BACKEND (see inference_backend.py).
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+import time
+
+# The reference side of the parity check must be plain fp32 torch, uncached and
+# loaded from the original checkpoint
+os.environ["SENTIMENT_BACKEND"] = "torch"
+os.environ["SENTIMENT_CACHE"] = "off"
+os.environ["SENTIMENT_MMAP"] = "0"
+
+import numpy as np
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE_DIR))
+
+from inference_backend import BACKENDS, ONNX_DIR, export_onnx, load_backend, onnx_path, quantize_onnx  # noqa: E402
+from mmap_weights import WEIGHTS_DIR, export_weights  # noqa: E402
+
+DEFAULT_FIXTURES = BASE_DIR / "fixtures" / "sentiment_parity.json"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export and validate sentiment inference backends")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Export encoder and NLI models to ONNX")
+    export.add_argument("--model", default=None, help="HF model name (default: sentiment_bert.MODEL_NAME)")
+    export.add_argument("--out-dir", type=pathlib.Path, default=ONNX_DIR, help="Directory for the .onnx files")
+    export.add_argument("--opset", type=int, default=14, help="ONNX opset version")
+    export.add_argument("--quantize", action="store_true", help="Also write int8-quantized graphs (*.int8.onnx)")
+    export.add_argument("--seed", type=int, default=42, help="Seed for heads that are not in the checkpoint")
+
+    mmap = sub.add_parser("mmap", help="Export fp32 weights for memory-mapped loading")
+    mmap.add_argument("--model", default=None, help="HF model name (default: sentiment_bert.MODEL_NAME)")
+    mmap.add_argument("--out-dir", type=pathlib.Path, default=WEIGHTS_DIR, help="Directory for <role>/weights.pt")
+    mmap.add_argument("--seed", type=int, default=42, help="Seed for heads that are not in the checkpoint")
+
+    check = sub.add_parser("check", help="Accuracy/latency parity of backends against torch fp32")
+    check.add_argument("--backends", nargs="+", default=["torch-int8", "onnx", "onnx-int8"], choices=BACKENDS)
+    check.add_argument("--fixtures", type=pathlib.Path, default=DEFAULT_FIXTURES, help="JSON list of texts")
+    check.add_argument("--onnx-dir", type=pathlib.Path, default=ONNX_DIR, help="Directory holding the .onnx files")
+    check.add_argument("--min-cosine", type=float, default=0.99, help="Minimum [CLS] cosine similarity")
+    check.add_argument("--max-score-diff", type=float, default=0.05, help="Maximum zero-shot score difference")
+    check.add_argument("--min-agreement", type=float, default=0.95, help="Minimum top-label agreement ratio")
+    check.add_argument("--report", type=pathlib.Path, help="Optional path to write the JSON report")
+    check.add_argument("--seed", type=int, default=42, help="Must match the seed used for export")
+    return parser.parse_args()
+
+
+def build_reference(model_name, seed):
+    """
+    Load the analyzer exactly as the service does
+
+    The base checkpoint ships no NLI head, so transformers initializes the
+    classification head randomly; seeding makes export and check see the same head.
+    """
+    from transformers import set_seed
+
+    import sentiment_bert
+
+    set_seed(seed)
+    return sentiment_bert.BERTSentimentAnalyzer(model_name or sentiment_bert.MODEL_NAME)
+
+
+def run_export(args):
+    analyzer = build_reference(args.model, args.seed)
+    models = {}
+    if analyzer.model is not None:
+        models["encoder"] = (analyzer.model, analyzer.tokenizer)
+    if analyzer.zero_shot_pipeline is not None:
+        models["nli"] = (analyzer.zero_shot_pipeline.model, analyzer.zero_shot_pipeline.tokenizer)
+    if not models:
+        print("No transformer model could be loaded; nothing to export")
+        return 1
+
+    written = []
+    for role, (model, tokenizer) in models.items():
+        path = export_onnx(model, tokenizer, role, onnx_path(role, onnx_dir=args.out_dir), opset=args.opset)
+        written.append(path)
+        print(f"Exported {role} graph to {path}")
+        if args.quantize:
+            quantized = quantize_onnx(path, onnx_path(role, quantized=True, onnx_dir=args.out_dir))
+            written.append(quantized)
+            print(f"Quantized {role} graph to {quantized}")
+
+    meta_path = args.out_dir / "export.meta.json"
+    with meta_path.open("w", encoding="utf-8") as handle:
+        json.dump(
+            {
+                "model": analyzer.model_name,
+                "seed": args.seed,
+                "opset": args.opset,
+                "files": [path.name for path in written],
+                "size_bytes": {path.name: path.stat().st_size for path in written},
+            },
+            handle,
+            indent=2,
+        )
+    print(f"Metadata saved to {meta_path}")
+    return 0
+
+
+def run_mmap(args):
+    analyzer = build_reference(args.model, args.seed)
+    models = {}
+    if analyzer.model is not None:
+        models["encoder"] = analyzer.model
+    if analyzer.zero_shot_pipeline is not None:
+        models["nli"] = analyzer.zero_shot_pipeline.model
+    if not models:
+        print("No transformer model could be loaded; nothing to export")
+        return 1
+    for role, model in models.items():
+        path = export_weights(model, role, args.out_dir)
+        print(f"Saved {role} weights to {path} ({path.stat().st_size / 1e6:.1f} MB)")
+    return 0
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _measure(analyzer, texts, label_sets):
+    """Per-text [CLS] embeddings, zero-shot outputs and latencies for the analyzer's current backends"""
+    embeddings, zero_shot, encoder_ms, nli_ms = [], [], [], []
+    for text in texts:
+        if analyzer.encoder_backend is not None:
+            embedding, elapsed = _timed(analyzer._encode_cls, [text])
+            embeddings.append(embedding[0])
+            encoder_ms.append(elapsed)
+        if analyzer.nli_backend is not None:
+            outputs, elapsed = _timed(analyzer._zero_shot_fused, [text], label_sets)
+            zero_shot.append([group[0] for group in outputs])
+            nli_ms.append(elapsed)
+    return embeddings, zero_shot, encoder_ms, nli_ms
+
+
+def _mean(values):
+    return float(np.mean(values)) if values else None
+
+
+def run_check(args):
+    import sentiment_bert
+
+    with args.fixtures.open("r", encoding="utf-8") as handle:
+        texts = json.load(handle)
+    label_sets = [sentiment_bert.SENTIMENT_LABELS, sentiment_bert.TOPIC_LABELS]
+
+    analyzer = build_reference(None, args.seed)
+    reference_backends = (analyzer.encoder_backend, analyzer.nli_backend)
+    ref_emb, ref_zs, ref_enc_ms, ref_nli_ms = _measure(analyzer, texts, label_sets)
+
+    report = {
+        "fixtures": str(args.fixtures),
+        "n_texts": len(texts),
+        "torch": {"encoder_ms": _mean(ref_enc_ms), "nli_ms": _mean(ref_nli_ms)},
+        "backends": {},
+    }
+    failed = False
+
+    for kind in args.backends:
+        if analyzer.model is not None:
+            analyzer.encoder_backend = load_backend(analyzer.model, "encoder", kind, args.onnx_dir)
+        if analyzer.zero_shot_pipeline is not None:
+            analyzer.nli_backend = load_backend(analyzer.zero_shot_pipeline.model, "nli", kind, args.onnx_dir)
+        loaded = {b.name for b in (analyzer.encoder_backend, analyzer.nli_backend) if b is not None}
+        if loaded != {kind}:
+            print(f"[{kind}] backend could not be loaded (got {sorted(loaded)}), skipping")
+            report["backends"][kind] = {"error": "backend not available"}
+            failed = True
+            continue
+
+        emb, zs, enc_ms, nli_ms = _measure(analyzer, texts, label_sets)
+        result = {"encoder_ms": _mean(enc_ms), "nli_ms": _mean(nli_ms)}
+
+        if emb:
+            cosines = [
+                float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12))
+                for a, b in zip(ref_emb, emb)
+            ]
+            result["min_cls_cosine"] = min(cosines)
+            failed |= result["min_cls_cosine"] < args.min_cosine
+        if zs:
+            diffs, agree = [], 0
+            for ref_groups, groups in zip(ref_zs, zs):
+                for ref, got in zip(ref_groups, groups):
+                    ref_scores = dict(zip(ref["labels"], ref["scores"]))
+                    diffs.extend(abs(ref_scores[label] - score) for label, score in zip(got["labels"], got["scores"]))
+                    agree += ref["labels"][0] == got["labels"][0]
+            result["max_score_diff"] = max(diffs)
+            result["top_label_agreement"] = agree / (len(zs) * len(label_sets))
+            failed |= result["max_score_diff"] > args.max_score_diff
+            failed |= result["top_label_agreement"] < args.min_agreement
+        if result["encoder_ms"] and report["torch"]["encoder_ms"]:
+            result["encoder_speedup"] = report["torch"]["encoder_ms"] / result["encoder_ms"]
+        if result["nli_ms"] and report["torch"]["nli_ms"]:
+            result["nli_speedup"] = report["torch"]["nli_ms"] / result["nli_ms"]
+
+        report["backends"][kind] = result
+        print(f"[{kind}] " + ", ".join(f"{k}={v:.4f}" for k, v in result.items() if v is not None))
+
+    analyzer.encoder_backend, analyzer.nli_backend = reference_backends
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        with args.report.open("w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Report saved to {args.report}")
+
+    print("Parity check " + ("FAILED" if failed else "passed"))
+    return 1 if failed else 0
+
+
+def main():
+    args = parse_args()
+    if args.command == "export":
+        return run_export(args)
+    if args.command == "mmap":
+        return run_mmap(args)
+    return run_check(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
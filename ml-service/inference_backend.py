@@ -0,0 +1,158 @@
+"""
+Selectable CPU inference backends for the PhoBERT models
+
+The sentiment analyzer runs two transformer models: the base encoder
+(AutoModel, [CLS] embeddings) and the zero-shot NLI classifier. Both are
+wrapped in a backend that takes tokenizer output and returns the model's
+primary output (last_hidden_state or logits) as a NumPy array:
+
+- "torch":      fp32 PyTorch model (default)
+- "torch-int8": PyTorch dynamic int8 quantization of all nn.Linear layers
+- "onnx":       graph exported with export_onnx.py, run by onnxruntime
+- "onnx-int8":  the exported graph after onnxruntime dynamic int8 quantization
+
+SENTIMENT_BACKEND=rules loads no model at all; sentiment_bert.py then scores
+with its keyword rules (e.g. for benchmarks or hosts without torch).
+
+Configuration (environment):
+    SENTIMENT_BACKEND    torch | torch-int8 | onnx | onnx-int8 | rules   (default: torch)
+    SENTIMENT_ONNX_DIR   directory holding encoder.onnx / nli.onnx (default: ml-service/models/onnx)
+    SENTIMENT_ONNX_THREADS  intra-op threads for onnxruntime (default: 0 = library default)
+"""
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")
+ONNX_DIR = Path(os.getenv("SENTIMENT_ONNX_DIR", Path(__file__).resolve().parent / "models" / "onnx"))
+ONNX_THREADS = int(os.getenv("SENTIMENT_ONNX_THREADS", "0"))
+
+# Graph names written by export_onnx.py; the primary output of each graph
+ONNX_GRAPHS = {
+    "encoder": "last_hidden_state",
+    "nli": "logits",
+}
+
+
+def onnx_path(role: str, quantized: bool = False, onnx_dir: Path = ONNX_DIR) -> Path:
+    suffix = ".int8.onnx" if quantized else ".onnx"
+    return Path(onnx_dir) / f"{role}{suffix}"
+
+
+class TorchBackend:
+    """Runs a (possibly quantized) PyTorch model"""
+
+    tensor_type = "pt"
+
+    def __init__(self, model, name: str = "torch"):
+        import torch
+
+        self._torch = torch
+        self.model = model
+        self.name = name
+        try:
+            self.device = next(model.parameters()).device
+        except StopIteration:
+            self.device = torch.device("cpu")
+
+    def __call__(self, inputs: Dict) -> np.ndarray:
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with self._torch.no_grad():
+            outputs = self.model(**inputs)
+        return outputs[0].cpu().numpy()
+
+
+class OnnxBackend:
+    """Runs an exported ONNX graph with onnxruntime on CPU"""
+
+    tensor_type = "np"
+
+    def __init__(self, path: Path, name: str = "onnx"):
+        import onnxruntime as ort
+
+        if not Path(path).exists():
+            raise FileNotFoundError(f"ONNX graph not found at {path}; run export_onnx.py export first")
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if ONNX_THREADS:
+            options.intra_op_num_threads = ONNX_THREADS
+        self.session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_names = [item.name for item in self.session.get_inputs()]
+        self.path = Path(path)
+        self.name = name
+
+    def __call__(self, inputs: Dict) -> np.ndarray:
+        feed = {k: np.asarray(v, dtype=np.int64) for k, v in inputs.items() if k in self.input_names}
+        return self.session.run(None, feed)[0]
+
+
+def quantize_torch(model):
+    """Dynamic int8 quantization of nn.Linear layers (weights int8, activations quantized on the fly)"""
+    import torch
+
+    quantized = torch.quantization.quantize_dynamic(model.to("cpu"), {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+
+def load_backend(model, role: str, kind: str = BACKEND, onnx_dir: Path = ONNX_DIR):
+    """
+    Wrap `model` (the fp32 torch model for `role`) in the requested backend
+
+    Falls back to the plain torch backend, with a warning, when the requested
+    backend cannot be created (missing onnxruntime, graph not exported, ...).
+    """
+    if kind not in BACKENDS:
+        print(f"Warning: unknown SENTIMENT_BACKEND {kind!r}, using torch")
+        kind = "torch"
+    try:
+        if kind == "torch-int8":
+            return TorchBackend(quantize_torch(model), name=kind)
+        if kind in ("onnx", "onnx-int8"):
+            return OnnxBackend(onnx_path(role, kind == "onnx-int8", onnx_dir), name=kind)
+    except Exception as error:
+        print(f"Warning: could not load {kind} backend for {role} ({error}); using torch")
+    return TorchBackend(model)
+
+
+def export_onnx(model, tokenizer, role: str, path: Path, opset: int = 14, sample_text: Optional[str] = None):
+    """Export `model` to an ONNX graph with dynamic batch and sequence axes"""
+    import torch
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sample_text = sample_text or "Tôi rất hài lòng với dịch vụ này"
+    if role == "nli":
+        sample = tokenizer([sample_text], ["This example is Tích cực."], return_tensors="pt")
+    else:
+        sample = tokenizer([sample_text], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    output_name = ONNX_GRAPHS[role]
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[output_name] = {0: "batch", 1: "sequence"} if role == "encoder" else {0: "batch"}
+
+    model = model.to("cpu").eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(path),
+            input_names=input_names,
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    return path
+
+
+def quantize_onnx(source: Path, target: Path):
+    """Dynamic int8 quantization of an exported ONNX graph"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+    return Path(target)
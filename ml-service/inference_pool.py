@@ -0,0 +1,70 @@
+"""
+Bounded thread pool for blocking model inference
+
+sklearn and torch calls are synchronous; running them inline in an `async def`
+handler blocks the event loop (and /healthz with it). InferencePool runs them
+on a fixed number of worker threads (torch and numpy release the GIL inside
+their kernels), rejects work once too many calls are in flight and bounds how
+long a caller waits for its result.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the pool already holds its maximum number of pending calls"""
+
+
+class InferencePool:
+    def __init__(self, max_workers: int = 2, max_pending: int = 64, timeout: Optional[float] = 30.0):
+        """
+        Args:
+            max_workers: Number of inference threads
+            max_pending: Calls allowed in flight (running + queued) before QueueFullError
+            timeout: Default seconds a caller waits for a result (None = no limit)
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(self.max_workers, int(max_pending))
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) on the pool and await its result
+
+        Raises:
+            QueueFullError: max_pending calls are already in flight
+            asyncio.TimeoutError: the result did not arrive within the timeout
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"inference queue is full ({self.max_pending} pending)")
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is freed when the work really finishes, not when the caller
+        # stops waiting, so timed-out calls still count against max_pending
+        future.add_done_callback(self._release)
+
+        limit = self.timeout if timeout is None else timeout
+        # A timeout cancels the call if it has not started yet
+        return await asyncio.wait_for(asyncio.wrap_future(future), limit)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,85 @@
+"""
+Multi-pattern keyword matcher (Aho–Corasick)
+
+The sentiment rules check several Vietnamese phrase lists with
+`sum(1 for kw in keywords if kw in text)`, i.e. one substring scan per phrase.
+KeywordMatcher compiles every lexicon into one automaton at construction time
+and finds all phrases of all lexicons in a single pass over the text.
+"""
+from collections import Counter, deque
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class KeywordMatcher:
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        """
+        Args:
+            lexicons: Mapping of lexicon name to its phrases. A phrase may belong
+                to several lexicons; a phrase listed twice in one lexicon counts twice,
+                matching the behaviour of summing over the list.
+        """
+        self.lexicons = {name: list(phrases) for name, phrases in lexicons.items()}
+        # phrase -> {lexicon name: number of times the phrase is listed}
+        self._weights: Dict[str, Counter] = {}
+        for name, phrases in self.lexicons.items():
+            for phrase in phrases:
+                if phrase:
+                    self._weights.setdefault(phrase, Counter())[name] += 1
+        self._build(self._weights.keys())
+
+    def _build(self, phrases: Iterable[str]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[set] = [set()]
+        for phrase in phrases:
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(phrase)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                fail[nxt] = goto[link].get(ch, 0) if goto[link].get(ch, 0) != nxt else 0
+                # Fold the suffix state's outputs in so search never walks fail links for output
+                outputs[nxt] |= outputs[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs: List[FrozenSet[str]] = [frozenset(out) for out in outputs]
+
+    def find(self, text: str) -> set:
+        """Return the set of distinct phrases that occur in text"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        found = set()
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Count, per lexicon, the phrases that occur in text
+
+        Equivalent to `{name: sum(1 for kw in phrases if kw in text)}` for every lexicon.
+        """
+        counts = dict.fromkeys(self.lexicons, 0)
+        for phrase in self.find(text):
+            for name, weight in self._weights[phrase].items():
+                counts[name] += weight
+        return counts
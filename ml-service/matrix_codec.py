@@ -0,0 +1,116 @@
+"""
+Binary matrix formats for /predict
+
+JSON bodies make Pydantic validate every float as a Python object before NumPy
+copies them again; for large batches parsing costs more than scoring. /predict
+also accepts a 2-D float matrix as raw bytes, decoded zero-copy with
+np.frombuffer, and answers in the same format:
+
+- "application/x-npy": a .npy file (np.save). Little-endian float32/float64,
+  C or Fortran order.
+- "application/octet-stream": raw little-endian floats. Shape and dtype come
+  from the X-Matrix-Shape ("rows,cols") and X-Matrix-Dtype ("float64" (default)
+  or "float32") headers.
+
+Binary responses are an (n, 2) float64 matrix: column 0 is the probability,
+column 1 the 0/1 label. Raw responses set X-Matrix-Shape / X-Matrix-Dtype.
+"""
+import io
+from typing import Mapping, Optional, Tuple
+
+import numpy as np
+
+NPY_MEDIA_TYPE = "application/x-npy"
+RAW_MEDIA_TYPE = "application/octet-stream"
+BINARY_MEDIA_TYPES = (NPY_MEDIA_TYPE, RAW_MEDIA_TYPE)
+
+SHAPE_HEADER = "X-Matrix-Shape"
+DTYPE_HEADER = "X-Matrix-Dtype"
+
+RAW_DTYPES = {
+    "float64": np.dtype("<f8"),
+    "f8": np.dtype("<f8"),
+    "float32": np.dtype("<f4"),
+    "f4": np.dtype("<f4"),
+}
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """Bare media type of a Content-Type header ("application/json; charset=utf-8" -> "application/json")"""
+    return (content_type or "application/json").split(";", 1)[0].strip().lower()
+
+
+def _check_matrix(matrix: np.ndarray, n_features: Optional[int]) -> np.ndarray:
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        raise ValueError(f"expected a non-empty 2-D matrix, got shape {matrix.shape}")
+    if n_features is not None and matrix.shape[1] != n_features:
+        raise ValueError(f"expected {n_features} components per sample, got {matrix.shape[1]}")
+    return matrix
+
+
+def decode_npy(body: bytes, n_features: Optional[int] = None) -> np.ndarray:
+    """Parse the .npy header and view the payload with np.frombuffer (no copy)"""
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    except ValueError as error:
+        raise ValueError(f"invalid .npy body: {error}") from error
+    if dtype.kind != "f" or dtype.itemsize not in (4, 8) or dtype.byteorder == ">":
+        raise ValueError(f"unsupported .npy dtype {dtype}; send little-endian float32 or float64")
+    if len(shape) != 2:
+        raise ValueError(f"expected a 2-D matrix, got shape {shape}")
+    offset = stream.tell()
+    count = shape[0] * shape[1]
+    if len(body) - offset != count * dtype.itemsize:
+        raise ValueError(f".npy payload is {len(body) - offset} bytes, shape {shape} needs {count * dtype.itemsize}")
+    flat = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+    matrix = flat.reshape(shape, order="F" if fortran_order else "C")
+    return _check_matrix(matrix, n_features)
+
+
+def parse_shape(value: Optional[str]) -> Tuple[int, int]:
+    try:
+        rows, cols = (int(part) for part in (value or "").split(","))
+    except ValueError as error:
+        raise ValueError(f"{SHAPE_HEADER} header must be 'rows,cols', got {value!r}") from error
+    if rows < 1 or cols < 1:
+        raise ValueError(f"{SHAPE_HEADER} must be positive, got {value!r}")
+    return rows, cols
+
+
+def decode_raw(body: bytes, headers: Mapping[str, str], n_features: Optional[int] = None) -> np.ndarray:
+    """View a raw little-endian float buffer as a (rows, cols) matrix (no copy)"""
+    dtype_name = (headers.get(DTYPE_HEADER) or "float64").lower()
+    if dtype_name not in RAW_DTYPES:
+        raise ValueError(f"unsupported {DTYPE_HEADER} {dtype_name!r}; use float64 or float32")
+    dtype = RAW_DTYPES[dtype_name]
+    rows, cols = parse_shape(headers.get(SHAPE_HEADER))
+    if len(body) != rows * cols * dtype.itemsize:
+        raise ValueError(f"body is {len(body)} bytes, shape {rows},{cols} of {dtype_name} needs {rows * cols * dtype.itemsize}")
+    matrix = np.frombuffer(body, dtype=dtype).reshape(rows, cols)
+    return _check_matrix(matrix, n_features)
+
+
+def decode_matrix(body: bytes, content_type: str, headers: Mapping[str, str], n_features: Optional[int] = None):
+    kind = media_type(content_type)
+    if kind == NPY_MEDIA_TYPE:
+        return decode_npy(body, n_features)
+    if kind == RAW_MEDIA_TYPE:
+        return decode_raw(body, headers, n_features)
+    raise ValueError(f"unsupported content type {kind!r}")
+
+
+def encode_predictions(probs: np.ndarray, labels: np.ndarray, content_type: str) -> Tuple[bytes, dict]:
+    """(body, headers) for an (n, 2) float64 [probability, label] matrix in the request's format"""
+    matrix = np.empty((len(probs), 2), dtype="<f8")
+    matrix[:, 0] = probs
+    matrix[:, 1] = labels
+    if media_type(content_type) == NPY_MEDIA_TYPE:
+        buffer = io.BytesIO()
+        np.save(buffer, matrix, allow_pickle=False)
+        return buffer.getvalue(), {}
+    return matrix.tobytes(), {SHAPE_HEADER: f"{matrix.shape[0]},{matrix.shape[1]}", DTYPE_HEADER: "float64"}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Measure per-worker memory of `uvicorn app:app --workers N`
+
+Starts the service, waits until /readyz reports ready, then reads
+/proc/<pid>/smaps_rollup of every worker process:
+
+- rss: resident pages, counting shared pages in full for every worker
+- pss: proportional share (shared pages divided among the processes using them)
+- uss: private pages only, i.e. what each extra worker really costs
+
+With --compare the service is measured twice, with memory-mapped model
+artifacts disabled ("copy") and enabled ("mmap"), see mmap_weights.py and
+ATTRITION_MODEL_MMAP in model_registry.py. Linux only.
+
+Usage
+-----
+python ml-service/export_onnx.py mmap          # once, writes models/mmap/
+python ml-service/measure_rss.py --workers 4 --compare --report rss.json
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent
+
+SCENARIOS = {
+    "copy": {"SENTIMENT_MMAP": "0", "ATTRITION_MODEL_MMAP": ""},
+    "mmap": {"SENTIMENT_MMAP": "1", "ATTRITION_MODEL_MMAP": "r"},
+}
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Per-worker RSS/PSS/USS of the ML service")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn --workers")
+    parser.add_argument("--port", type=int, default=8011, help="Port for the measured server")
+    parser.add_argument("--compare", action="store_true", help="Measure with mmap disabled and enabled")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds to wait for readiness")
+    parser.add_argument("--settle", type=float, default=5.0, help="Seconds to wait after readiness")
+    parser.add_argument("--report", type=pathlib.Path, help="Optional path to write the JSON report")
+    return parser.parse_args()
+
+
+def read_smaps(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r", encoding="utf-8") as handle:
+        for line in handle:
+            name, _, rest = line.partition(":")
+            if name in SMAPS_FIELDS:
+                values[name] = int(rest.split()[0])  # kB
+    return values
+
+
+def children(pid):
+    """All descendant pids of `pid`"""
+    found = []
+    for task in pathlib.Path(f"/proc/{pid}/task").iterdir():
+        try:
+            ids = (task / "children").read_text().split()
+        except OSError:
+            continue
+        for child in map(int, ids):
+            found.append(child)
+            found.extend(children(child))
+    return found
+
+
+def cmdline(pid):
+    try:
+        return pathlib.Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ").decode().strip()
+    except OSError:
+        return ""
+
+
+def wait_ready(port, workers, timeout):
+    """Poll /readyz until it answers 200 often enough in a row that every worker has likely answered"""
+    deadline = time.time() + timeout
+    streak = 0
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/readyz", timeout=5) as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError, OSError):
+            streak = 0
+        if streak >= 4 * workers:
+            return True
+        time.sleep(0.25)
+    return False
+
+
+def measure(args, name, overrides):
+    env = dict(os.environ, **overrides)
+    command = [
+        sys.executable, "-m", "uvicorn", "app:app",
+        "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(args.workers),
+        "--log-level", "warning",
+    ]
+    print(f"[{name}] starting {args.workers} workers ({', '.join(f'{k}={v!r}' for k, v in overrides.items())})")
+    server = subprocess.Popen(command, cwd=str(BASE_DIR), env=env)
+    try:
+        if not wait_ready(args.port, args.workers, args.timeout):
+            raise RuntimeError(f"[{name}] service not ready after {args.timeout:.0f}s")
+        time.sleep(args.settle)
+        workers = []
+        for pid in children(server.pid):
+            line = cmdline(pid)
+            if "resource_tracker" in line or "semaphore_tracker" in line:
+                continue
+            smaps = read_smaps(pid)
+            workers.append({
+                "pid": pid,
+                "rss_mb": smaps["Rss"] / 1024,
+                "pss_mb": smaps["Pss"] / 1024,
+                "uss_mb": (smaps["Private_Clean"] + smaps["Private_Dirty"]) / 1024,
+                "shared_mb": (smaps["Shared_Clean"] + smaps["Shared_Dirty"]) / 1024,
+            })
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    summary = {
+        "scenario": name,
+        "env": overrides,
+        "workers": workers,
+        "total_rss_mb": sum(w["rss_mb"] for w in workers),
+        "total_pss_mb": sum(w["pss_mb"] for w in workers),
+        "mean_uss_mb": sum(w["uss_mb"] for w in workers) / max(1, len(workers)),
+    }
+    for worker in workers:
+        print(
+            f"[{name}] pid {worker['pid']:>7}: rss {worker['rss_mb']:8.1f} MB  "
+            f"pss {worker['pss_mb']:8.1f} MB  uss {worker['uss_mb']:8.1f} MB"
+        )
+    print(
+        f"[{name}] total rss {summary['total_rss_mb']:.1f} MB, total pss {summary['total_pss_mb']:.1f} MB, "
+        f"mean uss {summary['mean_uss_mb']:.1f} MB"
+    )
+    return summary
+
+
+def main():
+    args = parse_args()
+    if not pathlib.Path("/proc/self/smaps_rollup").exists():
+        print("smaps_rollup not available; this script needs Linux >= 4.14")
+        return 2
+
+    scenarios = SCENARIOS if args.compare else {"current": {}}
+    report = {"workers": args.workers, "scenarios": []}
+    for name, overrides in scenarios.items():
+        report["scenarios"].append(measure(args, name, overrides))
+
+    if args.compare:
+        before, after = report["scenarios"]
+        report["pss_saved_mb"] = before["total_pss_mb"] - after["total_pss_mb"]
+        print(f"Total PSS saved by mmap: {report['pss_saved_mb']:.1f} MB")
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        with args.report.open("w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Report saved to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Prometheus metrics for the ML service, without a client library
+
+GET /metrics renders every metric in the Prometheus text exposition format
+(version 0.0.4), so any Prometheus-compatible scraper can read it and a human
+can curl it; nothing has to run next to the service.
+
+Request latency is split by stage so a slow path can be attributed:
+
+    parse        request body -> validated Python objects / NumPy matrix
+    tokenize     text -> token ids, padding into model inputs (sentiment)
+    forward      model forward pass (encoder / NLI backend, compiled linear scorer)
+    postprocess  softmax, label scoring, thresholds / top_k
+    serialize    response object -> JSON / binary bytes
+
+Values are per process: with `uvicorn --workers N` every worker keeps its own
+counters, so scrape each worker (one port per worker) or read the totals as
+"one worker's share". ml_process_start_time_seconds shows counter resets.
+
+Configuration (environment):
+    ML_METRICS   1 = record metrics and serve /metrics, 0 = off (default: 1)
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+ENABLED = os.getenv("ML_METRICS", "1") != "0"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+# (metric name, labels, value) produced by a collector at scrape time
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self._labels(k))} {_format_value(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        # key -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        if not ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the seconds spent in the with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Tuple[List[int], float, int]]:
+        with self._lock:
+            return {key: (list(state[0]), state[1], state[2]) for key, state in self._values.items()}
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, (counts, total, count) in sorted(self.snapshot().items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Collector:
+    """Metrics read from other components at scrape time (gauges and their counters)"""
+
+    def __init__(self, name: str, kind: str, documentation: str, collect: Callable[[], Iterable[Sample]]):
+        self.name = name
+        self.kind = kind
+        self.documentation = documentation
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        try:
+            samples = list(self.collect())
+        except Exception as error:
+            return [f"# {self.name} collection failed: {_escape(error)}"]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in samples:
+            if value is not None:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(
+        self,
+        name: str,
+        kind: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Sample]],
+    ) -> Collector:
+        """Register `collect()`, called on every scrape; it yields (name, labels, value) samples"""
+        return self._add(Collector(name, kind, documentation, collect))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter(
+    "ml_requests_total", "HTTP requests by route, method and status code", ("endpoint", "method", "status")
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "ml_request_duration_seconds", "End-to-end HTTP request latency", ("endpoint", "method")
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "ml_stage_duration_seconds", "Latency of one request-processing stage", ("model", "stage")
+)
+BATCH_SIZE = REGISTRY.histogram(
+    "ml_batch_size", "Items per batch at each batching point", ("batch",), buckets=BATCH_BUCKETS
+)
+
+_STARTED_AT = time.time()
+REGISTRY.collector(
+    "ml_process_start_time_seconds", "gauge", "Unix time the process started (counter resets)",
+    lambda: [("ml_process_start_time_seconds", {}, _STARTED_AT)],
+)
+
+
+def stage(model: str, name: str):
+    """Context manager timing one stage: `with stage("sentiment", "tokenize"): ...`"""
+    return STAGE_SECONDS.time(model=model, stage=name)
+
+
+def observe_batch(batch: str, size: int):
+    BATCH_SIZE.observe(size, batch=batch)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route template
+
+    The route template (/predict, not the raw URL) keeps label cardinality
+    bounded; unmatched paths are reported as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, method=method)
+            REQUESTS.inc(endpoint=endpoint, method=method, status=str(status["code"]))
+
@@ -0,0 +1,88 @@
+"""
+Memory-mapped PhoBERT weights shared across worker processes
+
+`uvicorn app:app --workers N` starts N processes that each used to
+from_pretrained() their own copy of the encoder and NLI weights, so memory
+grew linearly with workers. `export_onnx.py mmap` writes every model's state
+dict once with torch.save; workers then torch.load(mmap=True) it and assign
+the tensors to the parameters without copying, so the weights live in
+read-only file-backed pages that the OS shares between all workers.
+
+Layout of SENTIMENT_WEIGHTS_DIR:
+
+    encoder/config.json, encoder/weights.pt    AutoModel ([CLS] embeddings)
+    nli/config.json,     nli/weights.pt        AutoModelForSequenceClassification (zero-shot)
+
+The NLI checkpoint ships no classification head, so from_pretrained draws a
+random one per process; the exported head is fixed, which also makes every
+worker score identically.
+
+Sharing holds for the fp32 "torch" backend on CPU. torch-int8 quantizes into
+new per-process tensors and onnxruntime builds its own initializers, so those
+backends only gain a cheaper load.
+
+Needs torch >= 2.1 (torch.load(mmap=True) and load_state_dict(assign=True)),
+the floor in requirements.txt.
+
+Configuration (environment):
+    SENTIMENT_MMAP          1 = load exported weights when present, 0 = always from_pretrained (default: 1)
+    SENTIMENT_WEIGHTS_DIR   export directory (default: ml-service/models/mmap)
+"""
+import contextlib
+import os
+from pathlib import Path
+
+WEIGHTS_DIR = Path(os.getenv("SENTIMENT_WEIGHTS_DIR", Path(__file__).resolve().parent / "models" / "mmap"))
+MMAP_ENABLED = os.getenv("SENTIMENT_MMAP", "1") != "0"
+
+MODEL_CLASSES = {
+    "encoder": "AutoModel",
+    "nli": "AutoModelForSequenceClassification",
+}
+
+
+def weights_path(role: str, weights_dir: Path = WEIGHTS_DIR) -> Path:
+    return Path(weights_dir) / role / "weights.pt"
+
+
+def available(role: str, weights_dir: Path = WEIGHTS_DIR) -> bool:
+    """Whether exported weights for `role` exist and memory mapping is enabled"""
+    path = weights_path(role, weights_dir)
+    return MMAP_ENABLED and path.exists() and (path.parent / "config.json").exists()
+
+
+def export_weights(model, role: str, weights_dir: Path = WEIGHTS_DIR) -> Path:
+    """Save config + state dict of `model` in a torch.load(mmap=True) compatible file"""
+    import torch
+
+    path = weights_path(role, weights_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    model.config.save_pretrained(path.parent)
+    state = {name: tensor.detach().to("cpu").contiguous() for name, tensor in model.state_dict().items()}
+    tmp = path.with_suffix(".pt.tmp")
+    torch.save(state, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def load_mmap(role: str, weights_dir: Path = WEIGHTS_DIR):
+    """Build the model for `role` with its parameters backed by the memory-mapped weights file"""
+    import torch
+    import transformers
+
+    path = weights_path(role, weights_dir)
+    config = transformers.AutoConfig.from_pretrained(path.parent)
+    model_class = getattr(transformers, MODEL_CLASSES[role])
+    try:
+        from transformers.modeling_utils import no_init_weights
+    except ImportError:
+        no_init_weights = contextlib.nullcontext
+    # Random init would be overwritten anyway; skip it
+    with no_init_weights():
+        model = model_class.from_config(config)
+
+    state = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    # assign=True keeps the mmap-backed tensors instead of copying into fresh parameters
+    model.load_state_dict(state, strict=True, assign=True)
+    model.eval()
+    return model
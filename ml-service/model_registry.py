@@ -0,0 +1,248 @@
+"""
+Versioned attrition model registry with hot reload
+
+Bundles written by dataset/train_model.py live in a registry directory:
+
+    <registry>/<version>.joblib     one bundle per version
+    <registry>/CURRENT              name of the active version (optional)
+
+Without CURRENT the newest version (by name) is active; without any version
+the legacy dataset/models/attrition_lr.joblib is served as version "default".
+
+Each loaded version is an immutable ModelEntry. Activating a version loads it
+first and then replaces the active reference in one assignment, so requests
+that already took the old entry finish on it and new requests see the new
+one; a failed load leaves the active model untouched. Other versions can be
+loaded on demand (/predict?model_version=...) for shadow comparison.
+
+Configuration (environment):
+    ATTRITION_MODEL_DIR       registry directory (default: dataset/models/registry)
+    ATTRITION_MODEL_WATCH_S   poll interval for CURRENT / bundle changes, 0 = off (default: 0)
+    ATTRITION_MODEL_CACHE     maximum number of loaded versions kept in memory (default: 3)
+    ATTRITION_MODEL_MMAP      joblib mmap_mode for bundle arrays, "" = load into memory (default: r)
+
+With mmap_mode="r" the NumPy arrays of an (uncompressed) bundle are read-only
+memory maps, so uvicorn workers share their pages instead of holding copies.
+"""
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import joblib
+
+DEFAULT_VERSION = "default"
+CURRENT_FILE = "CURRENT"
+BUNDLE_SUFFIX = ".joblib"
+
+
+class ModelEntry:
+    """One loaded model version; never mutated after construction"""
+
+    def __init__(
+        self,
+        version: str,
+        path: Path,
+        bundle: Dict[str, Any],
+        compiled: Dict[str, Any],
+        load_seconds: float = 0.0,
+    ):
+        self.version = version
+        self.path = path
+        self.bundle = bundle
+        self.compiled = compiled
+        self.load_seconds = load_seconds
+        self.mtime = path.stat().st_mtime
+        self.loaded_at = time.time()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "path": str(self.path),
+            "n_components": int(self.compiled["weights"].shape[0]),
+            "raw": self.compiled["raw"] is not None,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 4),
+        }
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        root: Path,
+        compile_fn: Callable[[Dict[str, Any]], Dict[str, Any]],
+        default_path: Optional[Path] = None,
+        max_loaded: int = 3,
+        mmap_mode: Optional[str] = "r",
+    ):
+        """
+        Args:
+            root: Registry directory holding <version>.joblib bundles
+            compile_fn: Turns a loaded bundle into the scorer used for requests
+            default_path: Legacy single-bundle path served as version "default"
+            max_loaded: Maximum loaded versions kept in memory (the active one is never evicted)
+            mmap_mode: joblib.load mmap_mode ("r" shares array pages between processes, None copies)
+        """
+        self.root = Path(root)
+        self.compile_fn = compile_fn
+        self.default_path = Path(default_path) if default_path else None
+        self.max_loaded = max(1, int(max_loaded))
+        self.mmap_mode = mmap_mode or None
+        self._active: Optional[ModelEntry] = None
+        self._loaded: "OrderedDict[str, ModelEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes loads so two reloads of one version do not both read the file
+        self._load_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_error: Optional[str] = None
+
+    # Discovery
+
+    def versions(self) -> Dict[str, Path]:
+        found = {}
+        if self.root.is_dir():
+            for path in sorted(self.root.glob(f"*{BUNDLE_SUFFIX}")):
+                found[path.name[: -len(BUNDLE_SUFFIX)]] = path
+        if self.default_path is not None and self.default_path.exists():
+            found.setdefault(DEFAULT_VERSION, self.default_path)
+        return found
+
+    def current_version(self) -> str:
+        """Version named by CURRENT, else the newest registry version, else "default\""""
+        pointer = self.root / CURRENT_FILE
+        if pointer.exists():
+            name = pointer.read_text(encoding="utf-8").strip()
+            if name:
+                return name
+        names = [name for name in self.versions() if name != DEFAULT_VERSION]
+        return names[-1] if names else DEFAULT_VERSION
+
+    def path_for(self, version: str) -> Path:
+        path = self.versions().get(version)
+        if path is None:
+            raise KeyError(f"unknown model version {version!r}")
+        return path
+
+    # Loading
+
+    def load(self, version: str) -> ModelEntry:
+        """Load (or return the already loaded, unchanged) entry for a version"""
+        path = self.path_for(version)
+        with self._load_lock:
+            with self._lock:
+                entry = self._loaded.get(version)
+                if entry is not None and entry.path == path and entry.mtime == path.stat().st_mtime:
+                    self._loaded.move_to_end(version)
+                    return entry
+            started = time.perf_counter()
+            bundle = joblib.load(path, mmap_mode=self.mmap_mode)
+            compiled = self.compile_fn(bundle)
+            entry = ModelEntry(version, path, bundle, compiled, time.perf_counter() - started)
+            with self._lock:
+                self._loaded[version] = entry
+                self._loaded.move_to_end(version)
+                self._evict()
+            return entry
+
+    def _evict(self):
+        active = self._active.version if self._active is not None else None
+        while len(self._loaded) > self.max_loaded:
+            victim = next((name for name in self._loaded if name != active), None)
+            if victim is None:
+                break
+            del self._loaded[victim]
+
+    def activate(self, version: Optional[str] = None) -> ModelEntry:
+        """Load a version (default: current_version()) and make it active atomically"""
+        version = version or self.current_version()
+        try:
+            entry = self.load(version)
+        except Exception as error:
+            self.last_error = f"{version}: {error}"
+            raise
+        with self._lock:
+            previous = self._active
+            self._active = entry
+        self.last_error = None
+        if previous is None or previous is not entry:
+            print(f"Attrition model version {entry.version} active ({entry.path})")
+        return entry
+
+    def set_current(self, version: str):
+        """Point CURRENT at a version (written atomically via rename)"""
+        self.path_for(version)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f".{CURRENT_FILE}.tmp"
+        tmp.write_text(version + "\n", encoding="utf-8")
+        tmp.replace(self.root / CURRENT_FILE)
+
+    # Lookup
+
+    @property
+    def active(self) -> Optional[ModelEntry]:
+        return self._active
+
+    def get(self, version: Optional[str] = None) -> Optional[ModelEntry]:
+        """Active entry, or an already loaded entry for `version` (None if not loaded)"""
+        if version is None:
+            return self._active
+        with self._lock:
+            return self._loaded.get(version)
+
+    def loaded(self) -> List[ModelEntry]:
+        """Entries currently held in memory, least recently used first"""
+        with self._lock:
+            return list(self._loaded.values())
+
+    # Watching
+
+    def _snapshot(self):
+        """(current version, its bundle path, bundle mtime); changes when CURRENT or the bundle changes"""
+        try:
+            version = self.current_version()
+            path = self.path_for(version)
+            return version, path, path.stat().st_mtime
+        except (KeyError, OSError):
+            return None
+
+    def watch(self, interval: float):
+        """
+        Poll CURRENT and the current bundle in a daemon thread and activate on change
+
+        Only changes on disk trigger a reload, so a version activated through
+        activate() / the admin endpoint stays active until the files change.
+        """
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def loop():
+            last = self._snapshot()
+            while not self._stop.wait(interval):
+                snapshot = self._snapshot()
+                if snapshot is None or snapshot == last:
+                    continue
+                last = snapshot
+                try:
+                    self.activate(snapshot[0])
+                except Exception as error:
+                    print(f"Warning: attrition model reload failed: {error}")
+
+        self._watcher = threading.Thread(target=loop, name="model-registry-watch", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def info(self) -> Dict[str, Any]:
+        active = self._active
+        loaded = [entry.info() for entry in self.loaded()]
+        return {
+            "root": str(self.root),
+            "active": active.info() if active is not None else None,
+            "current": self.current_version(),
+            "versions": list(self.versions()),
+            "loaded": loaded,
+            "last_error": self.last_error,
+        }
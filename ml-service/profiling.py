@@ -0,0 +1,132 @@
+"""
+Opt-in per-request profiling for debugging slow inputs
+
+With ML_PROFILING=1, a request carrying `X-Profile: <mode>` (or `?profile=<mode>`)
+runs its inference call under a profiler and the result is written to
+ML_PROFILE_DIR; the response names the files in the X-Profile header. Without
+ML_PROFILING=1 the header and query flag are ignored, so production traffic can
+never switch a profiler on.
+
+Modes:
+    cprofile      stdlib cProfile; <name>.prof (snakeviz / pstats) + <name>.txt (top functions)
+    pyinstrument  sampling profiler, if installed; <name>.html + <name>.txt (call tree)
+    torch         torch.profiler (CPU operators); <name>.json (chrome://tracing) + <name>.txt (top ops)
+
+Only the work on the inference thread is profiled (the model call, e.g.
+BERTSentimentAnalyzer.analyze_batch); a profiled /sentiment request bypasses the
+micro-batcher so the profile only contains its own text. Profiled calls are
+serialized, as torch.profiler is process-wide.
+
+Configuration (environment):
+    ML_PROFILING      1 = honour X-Profile / ?profile= (default: 0)
+    ML_PROFILE_DIR    output directory (default: ml-service/profiles)
+    ML_PROFILE_TOP    rows in the text summaries (default: 40)
+"""
+import cProfile
+import importlib.util
+import io
+import os
+import pstats
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+ENABLED = os.getenv("ML_PROFILING", "0") == "1"
+PROFILE_DIR = Path(os.getenv("ML_PROFILE_DIR", Path(__file__).resolve().parent / "profiles"))
+TOP_N = int(os.getenv("ML_PROFILE_TOP", "40"))
+
+HEADER = "X-Profile"
+QUERY_PARAM = "profile"
+MODES = ("cprofile", "pyinstrument", "torch")
+
+_REQUIRES = {"pyinstrument": "pyinstrument", "torch": "torch"}
+
+_lock = threading.Lock()
+
+
+def requested_mode(headers: Mapping[str, str], query: Mapping[str, str]) -> Optional[str]:
+    """
+    Profiling mode asked for by a request, or None
+
+    Always None unless ML_PROFILING=1. Raises ValueError for an unknown mode or
+    a profiler that is not installed.
+    """
+    if not ENABLED:
+        return None
+    mode = headers.get(HEADER) or query.get(QUERY_PARAM)
+    if not mode:
+        return None
+    mode = mode.strip().lower()
+    if mode in ("1", "true"):
+        mode = "cprofile"
+    if mode not in MODES:
+        raise ValueError(f"unknown profile mode {mode!r}; use one of {', '.join(MODES)}")
+    package = _REQUIRES.get(mode)
+    if package and importlib.util.find_spec(package) is None:
+        raise ValueError(f"profile mode {mode!r} needs {package}, which is not installed")
+    return mode
+
+
+def _output_stem(name: str, mode: str) -> Path:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return PROFILE_DIR / f"{stamp}-{name}-{mode}-{uuid.uuid4().hex[:6]}"
+
+
+def _run_cprofile(stem: Path, fn: Callable[..., Any], args) -> Any:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return fn(*args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(stem.with_suffix(".prof"))
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(TOP_N)
+        stem.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+
+
+def _run_pyinstrument(stem: Path, fn: Callable[..., Any], args) -> Any:
+    from pyinstrument import Profiler
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        return fn(*args)
+    finally:
+        profiler.stop()
+        stem.with_suffix(".html").write_text(profiler.output_html(), encoding="utf-8")
+        stem.with_suffix(".txt").write_text(profiler.output_text(), encoding="utf-8")
+
+
+def _run_torch(stem: Path, fn: Callable[..., Any], args) -> Any:
+    from torch.profiler import ProfilerActivity, profile
+
+    with profile(activities=[ProfilerActivity.CPU], record_shapes=True) as profiler:
+        result = fn(*args)
+    profiler.export_chrome_trace(str(stem.with_suffix(".json")))
+    table = profiler.key_averages(group_by_input_shape=True).table(sort_by="self_cpu_time_total", row_limit=TOP_N)
+    stem.with_suffix(".txt").write_text(table, encoding="utf-8")
+    return result
+
+
+_RUNNERS = {
+    "cprofile": _run_cprofile,
+    "pyinstrument": _run_pyinstrument,
+    "torch": _run_torch,
+}
+
+
+def run_profiled(mode: str, name: str, fn: Callable[..., Any], *args) -> Tuple[Any, str]:
+    """
+    Run fn(*args) under the `mode` profiler (blocking; call it on the inference thread)
+
+    Returns:
+        (fn's result, output file stem relative to PROFILE_DIR)
+    """
+    with _lock:
+        stem = _output_stem(name, mode)
+        result = _RUNNERS[mode](stem, fn, args)
+    return result, stem.name
@@ -1,39 +1,198 @@
 """
 BERT-based Sentiment Analysis Service for Vietnamese text
 Uses PhoBERT or multilingual BERT for sentiment classification
+
+torch and transformers are imported when the analyzer is first built, not at
+module import, so processes that only serve /predict never pay for them.
 """
+import importlib.util
 import os
-import sys
-from typing import Dict, List, Optional
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 
-try:
-    # Import without pipeline first to avoid torchvision dependency
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from inference_backend import BACKEND, TorchBackend, load_backend
+from keyword_matcher import KeywordMatcher
+from metrics import observe_batch, stage
+import mmap_weights
+from sentiment_cache import get_result_cache, make_key
+
+
+# SENTIMENT_BACKEND=rules skips PhoBERT entirely and scores with the keyword rules
+RULES_ONLY = BACKEND == "rules"
+
+
+def transformers_available() -> bool:
+    """Whether torch and transformers are installed (checked without importing them)"""
+    return all(importlib.util.find_spec(name) is not None for name in ("torch", "transformers"))
+
+
+def _import_transformers():
+    """Import the sentiment stack on first use; returns (torch, AutoTokenizer, AutoModel, pipeline)"""
     import torch
+    # Import without pipeline first to avoid torchvision dependency
+    from transformers import AutoModel, AutoTokenizer
     # Try to import pipeline separately
     try:
         from transformers import pipeline
     except ImportError:
         pipeline = None
         print("Warning: pipeline not available, will use direct model inference")
-except ImportError:
-    print("Installing transformers and torch...")
-    os.system(f"{sys.executable} -m pip install transformers torch")
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    import torch
-    try:
-        from transformers import pipeline
-    except ImportError:
-        pipeline = None
+    return torch, AutoTokenizer, AutoModel, pipeline
 
 # Model configuration
 # Try Vietnamese sentiment model first, fallback to base model
 MODEL_NAME = "vinai/phobert-base-v2"  # Vietnamese BERT model
 # Alternative: "distilbert-base-multilingual-cased" (lighter, faster)
 
+# Sentiment labels scored by the zero-shot pipeline
+SENTIMENT_LABELS = ["Tích cực", "Trung lập", "Tiêu cực"]
+
+# Maximum number of texts per forward pass in analyze_batch()
+BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "16"))
+
+# Token budget per mode; both are capped at the tokenizer's model_max_length
+MAX_LENGTH_BY_MODE = {
+    "fast": int(os.getenv("SENTIMENT_FAST_MAX_LENGTH", "128")),
+    "accurate": int(os.getenv("SENTIMENT_ACCURATE_MAX_LENGTH", "512")),
+}
+DEFAULT_MODE = os.getenv("SENTIMENT_MODE", "accurate")
+
+# Upper token-length bounds of the batching buckets: texts of similar length are
+# batched together so one long complaint does not pad (and slow) a batch of short ones
+LENGTH_BUCKETS = sorted(
+    int(bound) for bound in os.getenv("SENTIMENT_LENGTH_BUCKETS", "32,64,128,256,512").split(",") if bound.strip()
+)
+
+# Over-long texts: "truncate" keeps the first tokens, "head_tail" keeps the first
+# SENTIMENT_HEAD_RATIO of the budget from the start and the rest from the end
+LONG_TEXT_STRATEGY = os.getenv("SENTIMENT_LONG_TEXT", "truncate")
+HEAD_RATIO = float(os.getenv("SENTIMENT_HEAD_RATIO", "0.25"))
+
+# Bump when the scoring logic changes so cached results from older code are not reused
+SCORING_VERSION = "3"
+
+# "fused": score sentiment + topic labels for a text in one batched NLI forward pass
+# "pipeline": call the transformers zero-shot pipeline once per label set
+ZERO_SHOT_MODE = os.getenv("SENTIMENT_ZERO_SHOT_MODE", "fused")
+
+# Topic keywords mapping (mapped to model enum values)
+TOPIC_KEYWORDS = {
+    "Lương": [
+        "lương", "thưởng", "tăng lương", "mức lương", "lương thấp", 
+        "lương cao", "bonus", "tiền lương", "lương bổng", "lương quá"
+    ],
+    "Môi trường": [
+        "môi trường", "đồng nghiệp", "văn phòng", "không gian", 
+        "làm việc", "nơi làm việc", "văn hóa", "team", "phòng ban"
+    ],
+    "Quản lý": [
+        "sếp", "quản lý", "trưởng phòng", "leader", "manager", 
+        "giám đốc", "điều hành", "lãnh đạo", "thiên vị", "công bằng"
+    ],
+    "Phúc lợi": [
+        "phúc lợi", "bảo hiểm", "nghỉ phép", "du lịch", "đào tạo", 
+        "khám sức khỏe", "gym", "ăn trưa", "xe đưa đón"
+    ],
+    "Khen ngợi": [
+        "tuyệt vời", "xuất sắc", "tốt", "cảm ơn", "đánh giá cao",
+        "hài lòng", "thích", "yêu thích"
+    ],
+    "Khiếu nại": [
+        "khiếu nại", "phàn nàn", "thất vọng", "không hài lòng",
+        "bất công", "nghỉ việc", "muốn nghỉ"
+    ],
+    "Góp ý": [
+        "góp ý", "đề xuất", "cải thiện", "tối ưu", "suggest"
+    ]
+}
+
+# Topic labels scored by the zero-shot pipeline
+TOPIC_LABELS = list(TOPIC_KEYWORDS.keys())
+
+# Keywords that indicate high satisfaction (rating prediction)
+RATING_POSITIVE_KEYWORDS = [
+    "rất hài lòng", "tuyệt vời", "xuất sắc", "tốt", "tốt lắm",
+    "thích", "yêu thích", "cảm ơn", "đánh giá cao", "ưng ý"
+]
+
+# Keywords that indicate low satisfaction (rating prediction)
+RATING_NEGATIVE_KEYWORDS = [
+    "không hài lòng", "thất vọng", "tệ", "kém", "tồi tệ",
+    "muốn nghỉ", "nghỉ việc", "bất công", "thiên vị", "không đủ"
+]
+
+# Strong negative indicators
+STRONG_NEGATIVE_PHRASES = [
+    "quá", "không có", "không hoạt động", "không tốt", "không đủ",
+    "thường xuyên bị lỗi", "bị lỗi", "cũ", "khó", "rất nóng",
+    "ồn ào", "không công bằng", "thiên vị", "bất công",
+    "muốn nghỉ", "nghỉ việc", "thất vọng", "không hài lòng",
+    "kém", "tồi tệ", "tệ", "xấu", "chậm", "bực"
+]
+
+# Moderate negative indicators
+MODERATE_NEGATIVE_PHRASES = [
+    "vấn đề", "khó khăn", "thách thức", "cần cải thiện",
+    "chưa tốt", "chưa đủ", "hạn chế", "thiếu"
+]
+
+# Expanded positive words (rule-based fallback)
+FALLBACK_POSITIVE_WORDS = [
+    "tốt", "tuyệt", "hài lòng", "đẹp", "nhanh", "chuyên nghiệp",
+    "xuất sắc", "tuyệt vời", "cảm ơn", "đánh giá cao", "thích",
+    "yêu thích", "ưng ý", "tốt lắm", "rất tốt", "rất hài lòng"
+]
+
+# Expanded negative words (rule-based fallback)
+FALLBACK_NEGATIVE_WORDS = [
+    "xấu", "tệ", "chậm", "bực", "không hài lòng", "khiếu nại",
+    "thất vọng", "kém", "tồi tệ", "không tốt", "không đủ",
+    "quá", "ồn ào", "cũ", "bị lỗi", "khó", "nóng", "thiên vị",
+    "bất công", "nghỉ việc", "muốn nghỉ"
+]
+
+# All lexicons compiled once into one automaton: a single pass over the
+# lower-cased text yields the match count of every lexicon
+KEYWORD_MATCHER = KeywordMatcher({
+    "rating_positive": RATING_POSITIVE_KEYWORDS,
+    "rating_negative": RATING_NEGATIVE_KEYWORDS,
+    "strong_negative": STRONG_NEGATIVE_PHRASES,
+    "moderate_negative": MODERATE_NEGATIVE_PHRASES,
+    "fallback_positive": FALLBACK_POSITIVE_WORDS,
+    "fallback_negative": FALLBACK_NEGATIVE_WORDS,
+    **{f"topic:{topic}": keywords for topic, keywords in TOPIC_KEYWORDS.items()},
+})
+
+
+def keyword_counts(text: str) -> Dict[str, int]:
+    """Number of matched phrases per lexicon (keys of KEYWORD_MATCHER.lexicons)"""
+    return KEYWORD_MATCHER.count(text.lower())
+
 class BERTSentimentAnalyzer:
-    def __init__(self, model_name: str = MODEL_NAME):
+    def __init__(self, model_name: str = MODEL_NAME, cache=None):
+        self.model_name = model_name
+        # Result cache (see sentiment_cache.py); None disables caching
+        self.cache = cache if cache is not None else get_result_cache()
+        self._bucket_stats: Dict[str, Dict] = {}
+        self._bucket_lock = threading.Lock()
+        # (id(tokenizer), pair) -> special-token layout, see _special_layout
+        self._special_layouts: Dict[Tuple[int, bool], List[Tuple[Optional[int], Dict]]] = {}
+        
+        if RULES_ONLY:
+            print("SENTIMENT_BACKEND=rules; using rule-based sentiment")
+            self._init_rule_based()
+            return
+        try:
+            torch, AutoTokenizer, AutoModel, pipeline = _import_transformers()
+        except ImportError as e:
+            # Dependencies are installed from requirements.txt, never at runtime
+            print(f"transformers/torch not installed ({e}); using rule-based sentiment")
+            self._init_rule_based()
+            return
+        
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         print(f"Loading BERT model: {model_name} on {self.device}")
         
@@ -42,8 +201,11 @@ class BERTSentimentAnalyzer:
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
             # Try to load base model (AutoModel handles different architectures)
             try:
-                from transformers import AutoModel
-                self.model = AutoModel.from_pretrained(model_name)
+                if mmap_weights.available("encoder"):
+                    # Shared read-only pages across workers (see mmap_weights.py)
+                    self.model = mmap_weights.load_mmap("encoder")
+                else:
+                    self.model = AutoModel.from_pretrained(model_name)
                 self.model.to(self.device)
                 self.model.eval()
                 print(f"Successfully loaded BERT model: {model_name}")
@@ -54,7 +216,6 @@ class BERTSentimentAnalyzer:
                     alt_model = "distilbert-base-multilingual-cased"
                     print(f"Trying alternative model: {alt_model}")
                     self.tokenizer = AutoTokenizer.from_pretrained(alt_model)
-                    from transformers import AutoModel
                     self.model = AutoModel.from_pretrained(alt_model)
                     self.model.to(self.device)
                     self.model.eval()
@@ -67,9 +228,11 @@ class BERTSentimentAnalyzer:
             # Create zero-shot pipeline as fallback (if available)
             if pipeline is not None:
                 try:
+                    nli_model = mmap_weights.load_mmap("nli") if mmap_weights.available("nli") else model_name
                     self.zero_shot_pipeline = pipeline(
                         "zero-shot-classification",
-                        model=model_name,
+                        model=nli_model,
+                        tokenizer=model_name,
                         device=0 if self.device == "cuda" else -1
                     )
                 except Exception as e:
@@ -83,35 +246,63 @@ class BERTSentimentAnalyzer:
             self.model = None
             self.tokenizer = None
             self.zero_shot_pipeline = None
+        
+        self._init_backends()
+    
+    def _init_rule_based(self):
+        self.device = "cpu"
+        self.model = None
+        self.tokenizer = None
+        self.zero_shot_pipeline = None
+        self._init_backends()
+    
+    def _init_backends(self):
+        """Wrap the loaded torch models in the configured inference backend (SENTIMENT_BACKEND)"""
+        self.encoder_backend = None
+        self.nli_backend = None
+        if self.model is not None:
+            self.encoder_backend = load_backend(self.model, "encoder", BACKEND)
+            if isinstance(self.encoder_backend, TorchBackend):
+                # Keep only the weights the backend runs (drops fp32 copy under torch-int8)
+                self.model = self.encoder_backend.model
+        if self.zero_shot_pipeline is not None:
+            self.nli_backend = load_backend(self.zero_shot_pipeline.model, "nli", BACKEND)
+            if isinstance(self.nli_backend, TorchBackend):
+                self.zero_shot_pipeline.model = self.nli_backend.model
+        kinds = {b.name for b in (self.encoder_backend, self.nli_backend) if b is not None}
+        self.backend = "+".join(sorted(kinds)) or "none"
+        print(f"Sentiment inference backend: {self.backend}")
     
-    def _predict_rating(self, text: str, sentiment_score: float) -> float:
+    @property
+    def model_version(self) -> str:
+        """Identifies the loaded model and scoring path; part of the result cache key"""
+        if self.zero_shot_pipeline:
+            path = f"zero-shot-{ZERO_SHOT_MODE}"
+        elif self.model and self.tokenizer:
+            path = "embedding"
+        else:
+            path = "rule-based"
+        name = getattr(self.model, "name_or_path", None) or self.model_name
+        return f"{name}|{path}|{self.backend}|v{SCORING_VERSION}"
+    
+    def _predict_rating(self, text: str, sentiment_score: float, counts: Optional[Dict[str, int]] = None) -> float:
         """
         Predict satisfaction rating (1-5) from text content and sentiment score
         
         Args:
             text: Input text
             sentiment_score: Sentiment score (0-1)
+            counts: Precomputed keyword_counts(text)
             
         Returns:
             Predicted rating (1-5)
         """
-        text_lower = text.lower()
-        
-        # Keywords that indicate high satisfaction
-        positive_keywords = [
-            "rất hài lòng", "tuyệt vời", "xuất sắc", "tốt", "tốt lắm",
-            "thích", "yêu thích", "cảm ơn", "đánh giá cao", "ưng ý"
-        ]
-        
-        # Keywords that indicate low satisfaction
-        negative_keywords = [
-            "không hài lòng", "thất vọng", "tệ", "kém", "tồi tệ",
-            "muốn nghỉ", "nghỉ việc", "bất công", "thiên vị", "không đủ"
-        ]
+        if counts is None:
+            counts = keyword_counts(text)
         
         # Count positive/negative indicators
-        positive_count = sum(1 for kw in positive_keywords if kw in text_lower)
-        negative_count = sum(1 for kw in negative_keywords if kw in text_lower)
+        positive_count = counts["rating_positive"]
+        negative_count = counts["rating_negative"]
         
         # Base rating from sentiment score (1-5 scale)
         base_rating = 1 + (sentiment_score * 4)  # Map 0-1 to 1-5
@@ -144,131 +335,494 @@ class BERTSentimentAnalyzer:
         Returns:
             Dict with sentiment, sentiment_score, keywords, topic, predicted_rating
         """
-        if not text or not text.strip():
-            return {
-                "sentiment": "Trung lập",
-                "sentiment_score": 0.5,
-                "keywords": [],
-                "topic": "Khác",
-                "topic_confidence": 0.5
-            }
+        return self.analyze_batch([text], [rating])[0]
+    
+    def analyze_batch(
+        self,
+        texts: List[str],
+        ratings: Optional[List[Optional[float]]] = None,
+        batch_size: int = BATCH_SIZE,
+        mode: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> List[Dict]:
+        """
+        Analyze many texts at once, running one forward pass per micro-batch
+        
+        Texts are tokenized once, grouped into LENGTH_BUCKETS by token length
+        and micro-batched within each bucket, so padding stays short.
+        
+        Args:
+            texts: Input texts to analyze
+            ratings: Optional ratings aligned with texts (None entries are auto-predicted)
+            batch_size: Maximum number of texts per forward pass
+            mode: "fast" or "accurate" (token budget, see MAX_LENGTH_BY_MODE); default SENTIMENT_MODE
+            use_cache: False skips the result cache entirely (no lookup, no store, no stats),
+                e.g. for warmup, which must really run the model
+            
+        Returns:
+            List of result dicts in the same order as texts (same shape as analyze())
+        """
+        mode = mode or DEFAULT_MODE
+        if mode not in MAX_LENGTH_BY_MODE:
+            raise ValueError(f"Unknown sentiment mode: {mode}")
+        if ratings is None:
+            ratings = [None] * len(texts)
+        if len(ratings) != len(texts):
+            raise ValueError("texts and ratings must have the same length")
+        
+        results: List[Optional[Dict]] = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                results[index] = {
+                    "sentiment": "Trung lập",
+                    "sentiment_score": 0.5,
+                    "keywords": [],
+                    "topic": "Khác",
+                    "topic_confidence": 0.5
+                }
+            else:
+                pending.append(index)
+        
+        # Serve repeated texts from the result cache
+        keys = {}
+        if self.cache is not None and use_cache and pending:
+            version = f"{self.model_version}|{mode}|{self._length_policy(mode)}"
+            misses = []
+            for index in pending:
+                key = make_key(texts[index].strip(), ratings[index], version)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    results[index] = cached
+                else:
+                    keys[index] = key
+                    misses.append(index)
+            pending = misses
+        
+        if not pending:
+            return results
         
         # Clean text
-        text = text.strip()
+        cleaned = {index: texts[index].strip() for index in pending}
+        tokenizer = self._active_tokenizer()
+        max_length = self._max_length(tokenizer, mode)
+        token_ids = {}
+        buckets: Dict[int, List[int]] = {}
+        if tokenizer is not None:
+            with stage("sentiment", "tokenize"):
+                ids = self._token_ids(tokenizer, [cleaned[index] for index in pending])
+            for index, text_ids in zip(pending, ids):
+                token_ids[index] = text_ids
+                length = min(len(text_ids), max_length)
+                buckets.setdefault(bisect_left(LENGTH_BUCKETS, length), []).append(index)
+        else:
+            buckets[0] = pending
+        
+        batch_size = max(1, batch_size)
+        for bucket in sorted(buckets):
+            members = buckets[bucket]
+            label = self._bucket_label(bucket) if tokenizer is not None else "untokenized"
+            for start in range(0, len(members), batch_size):
+                indices = members[start:start + batch_size]
+                chunk_texts = [cleaned[i] for i in indices]
+                chunk_ratings = [ratings[i] for i in indices]
+                chunk_ids = [token_ids[i] for i in indices] if token_ids else None
+                observe_batch("sentiment_forward", len(indices))
+                started = time.perf_counter()
+                chunk_results, cacheable = self._analyze_chunk(chunk_texts, chunk_ratings, chunk_ids, max_length)
+                self._record_bucket(label, len(indices), time.perf_counter() - started)
+                for index, result in zip(indices, chunk_results):
+                    results[index] = result
+                    if cacheable and index in keys:
+                        self.cache.set(keys[index], result)
+        return results
+    
+    def _active_tokenizer(self):
+        """Tokenizer of the model path analyze_batch will use (None when it tokenizes internally)"""
+        if self.zero_shot_pipeline:
+            return self.zero_shot_pipeline.tokenizer if self._use_fused() else None
+        if self.model and self.tokenizer:
+            return self.tokenizer
+        return None
+    
+    def _use_fused(self) -> bool:
+        # The pipeline only runs torch models, so other backends always use the fused path
+        return ZERO_SHOT_MODE == "fused" or not isinstance(self.nli_backend, TorchBackend)
+    
+    @staticmethod
+    def _max_length(tokenizer, mode: str) -> int:
+        limit = MAX_LENGTH_BY_MODE[mode]
+        model_max = getattr(tokenizer, "model_max_length", None)
+        # Tokenizers without a limit report a huge sentinel value
+        if model_max and model_max < 100000:
+            limit = min(limit, model_max)
+        return limit
+    
+    @staticmethod
+    def _length_policy(mode: str) -> str:
+        """Token budget and long-text settings; part of the result cache key, since they change results"""
+        policy = f"max{MAX_LENGTH_BY_MODE[mode]}|{LONG_TEXT_STRATEGY}"
+        if LONG_TEXT_STRATEGY == "head_tail":
+            policy += f"{HEAD_RATIO:g}"
+        return policy
+    
+    def _special_layout(self, tokenizer, pair: bool) -> List[Tuple[Optional[int], Dict]]:
+        """
+        Where the tokenizer puts its special tokens around one sequence or a pair
         
+        Found once per tokenizer by encoding a probe with special_tokens_mask:
+        a list of (None, {input name: values}) runs of special tokens and
+        (sequence index, {input name: value per token}) slots, e.g.
+        [CLS] a [SEP] b [SEP] for BERT or <s> a </s></s> b </s> for PhoBERT.
+        """
+        key = (id(tokenizer), pair)
+        layout = self._special_layouts.get(key)
+        if layout is not None:
+            return layout
+        probe = tokenizer("a", "b" if pair else None, add_special_tokens=True, return_special_tokens_mask=True)
+        mask = probe.pop("special_tokens_mask")
+        first_length = len(tokenizer("a", add_special_tokens=False)["input_ids"])
+        layout = []
+        content = 0
+        for position, special in enumerate(mask):
+            values = {name: probe[name][position] for name in probe}
+            if special:
+                if not layout or layout[-1][0] is not None:
+                    layout.append((None, {name: [] for name in probe}))
+                for name, value in values.items():
+                    layout[-1][1][name].append(value)
+                continue
+            sequence = 0 if content < first_length else 1
+            content += 1
+            if not layout or layout[-1][0] != sequence:
+                del values["input_ids"]
+                layout.append((sequence, values))
+        if [slot for slot, _ in layout if slot is not None] != ([0, 1] if pair else [0]):
+            raise ValueError(f"Cannot locate the sequences in {type(tokenizer).__name__}'s special tokens")
+        self._special_layouts[key] = layout
+        return layout
+    
+    def _model_inputs(self, tokenizer, ids: List[int], pair_ids: Optional[List[int]] = None) -> Dict[str, List[int]]:
+        """
+        Encoding with special tokens for already fitted ids (and an optional pair)
+        
+        prepare_for_model when the tokenizer has it; transformers 5 fast
+        tokenizers (TokenizersBackend) do not, so the ids are placed into the
+        tokenizer's special-token layout instead (never decoded to text, which
+        would not round-trip every token).
+        """
+        if hasattr(tokenizer, "prepare_for_model"):
+            return tokenizer.prepare_for_model(ids, pair_ids, add_special_tokens=True)
+        sequences = (ids, pair_ids)
+        inputs: Dict[str, List[int]] = {}
+        for slot, values in self._special_layout(tokenizer, pair_ids is not None):
+            if slot is None:
+                for name, run in values.items():
+                    inputs.setdefault(name, []).extend(run)
+                continue
+            inputs.setdefault("input_ids", []).extend(sequences[slot])
+            for name, value in values.items():
+                inputs.setdefault(name, []).extend([value] * len(sequences[slot]))
+        return inputs
+    
+    @staticmethod
+    def _token_ids(tokenizer, texts: List[str]) -> List[List[int]]:
+        """Token ids without special tokens or truncation (policy applied by _fit_length)"""
+        return tokenizer(texts, add_special_tokens=False, truncation=False)["input_ids"]
+    
+    @staticmethod
+    def _fit_length(ids: List[int], limit: int) -> List[int]:
+        """Apply the long-text policy so that ids fit in `limit` tokens"""
+        if len(ids) <= limit:
+            return ids
+        if LONG_TEXT_STRATEGY == "head_tail" and limit > 1:
+            head = max(1, int(limit * HEAD_RATIO))
+            tail = limit - head
+            return ids[:head] + (ids[-tail:] if tail else [])
+        return ids[:limit]
+    
+    @staticmethod
+    def _bucket_label(bucket: int) -> str:
+        if bucket < len(LENGTH_BUCKETS):
+            low = LENGTH_BUCKETS[bucket - 1] + 1 if bucket else 0
+            return f"{low}-{LENGTH_BUCKETS[bucket]}"
+        return f">{LENGTH_BUCKETS[-1]}" if LENGTH_BUCKETS else "all"
+    
+    def _record_bucket(self, label: str, n_texts: int, seconds: float):
+        with self._bucket_lock:
+            stats = self._bucket_stats.setdefault(
+                label, {"batches": 0, "texts": 0, "total_ms": 0.0, "max_batch_ms": 0.0}
+            )
+            elapsed_ms = seconds * 1000
+            stats["batches"] += 1
+            stats["texts"] += n_texts
+            stats["total_ms"] += elapsed_ms
+            stats["max_batch_ms"] = max(stats["max_batch_ms"], elapsed_ms)
+    
+    def bucket_stats(self) -> Dict[str, Dict]:
+        """Latency per length bucket since startup, for tuning LENGTH_BUCKETS and the batch size"""
+        with self._bucket_lock:
+            report = {}
+            for label, stats in self._bucket_stats.items():
+                report[label] = {
+                    **{k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()},
+                    "mean_batch_ms": round(stats["total_ms"] / stats["batches"], 3),
+                    "mean_text_ms": round(stats["total_ms"] / stats["texts"], 3),
+                }
+            return report
+    
+    def _analyze_chunk(
+        self,
+        texts: List[str],
+        ratings: List[Optional[float]],
+        token_ids: Optional[List[List[int]]] = None,
+        max_length: Optional[int] = None,
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Run one micro-batch of non-empty, stripped texts through the model
+        
+        Args:
+            token_ids: Token ids from _token_ids() for the active tokenizer (computed if None)
+            max_length: Token budget per sequence (default: accurate mode)
+        
+        Returns:
+            (results, cacheable) - cacheable is False when a model error forced
+            the rule-based fallback, so degraded results are not cached
+        """
         # Use zero-shot classification if available
         if self.zero_shot_pipeline:
             try:
-                candidate_labels = ["Tích cực", "Trung lập", "Tiêu cực"]
-                result = self.zero_shot_pipeline(text, candidate_labels)
-                
-                # Get top label
-                top_label = result["labels"][0]
-                top_score = result["scores"][0]
-                
-                # Map to sentiment
-                sentiment_map = {
-                    "Tích cực": "Tích cực",
-                    "Trung lập": "Trung lập",
-                    "Tiêu cực": "Tiêu cực"
-                }
-                sentiment = sentiment_map.get(top_label, "Trung lập")
-                
-                # Adjust based on rating if provided
-                if rating is not None:
-                    rating_adjustment = (rating - 3) / 2  # -1 to 1
-                    top_score = np.clip(top_score + rating_adjustment * 0.2, 0, 1)
-                
-                # Convert score to sentiment_score (0-1 scale)
-                sentiment_score = float(top_score)
-                
-                # Apply negative keyword adjustment
-                negative_adjustment = self._check_negative_keywords(text)
-                sentiment_score = np.clip(sentiment_score + negative_adjustment, 0, 1)
-                
-                # Re-determine sentiment after adjustment
-                if sentiment_score >= 0.6:
-                    sentiment = "Tích cực"
-                elif sentiment_score <= 0.4:
-                    sentiment = "Tiêu cực"
+                # classify_topic only blends zero-shot topic scores when the base model loaded,
+                # so topic hypotheses are scored only then
+                with_topics = bool(self.model and self.tokenizer)
+                if self._use_fused():
+                    label_sets = [SENTIMENT_LABELS, TOPIC_LABELS] if with_topics else [SENTIMENT_LABELS]
+                    outputs = self._zero_shot_fused(texts, label_sets, token_ids, max_length)
+                    sentiment_outputs = outputs[0]
+                    topic_outputs = outputs[1] if with_topics else [None] * len(texts)
                 else:
-                    sentiment = "Trung lập"
-                
-                # Extract keywords (simple: take important words)
-                keywords = self._extract_keywords(text)
-                topic_info = self.classify_topic(text)
-                
-                # Auto-predict rating if not provided
-                predicted_rating = rating if rating is not None else self._predict_rating(text, sentiment_score)
-                
-                return {
-                    "sentiment": sentiment,
-                    "sentiment_score": round(sentiment_score, 2),
-                    "keywords": keywords[:5],  # Top 5 keywords
-                    "topic": topic_info["topic"],
-                    "topic_confidence": topic_info["confidence"],
-                    "predicted_rating": predicted_rating
-                }
+                    # The pipeline tokenizes internally, so its whole call counts as forward
+                    with stage("sentiment", "forward"):
+                        sentiment_outputs = self.zero_shot_pipeline(texts, SENTIMENT_LABELS, batch_size=len(texts))
+                    if isinstance(sentiment_outputs, dict):
+                        sentiment_outputs = [sentiment_outputs]
+                    topic_outputs = [None] * len(texts)
+                with stage("sentiment", "postprocess"):
+                    return [
+                        self._score_zero_shot(text, rating, output, topic_output)
+                        for text, rating, output, topic_output in zip(texts, ratings, sentiment_outputs, topic_outputs)
+                    ], True
             except Exception as e:
                 print(f"BERT pipeline error: {e}")
-                return self._fallback_analysis(text, rating)
+                return [self._fallback_analysis(text, rating) for text, rating in zip(texts, ratings)], False
         elif self.model and self.tokenizer:
             # Use BERT embeddings for sentiment (simplified approach)
             try:
-                # Tokenize and get embeddings
-                inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512, padding=True)
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    # Get [CLS] token embedding (first token)
-                    embeddings = outputs.last_hidden_state[:, 0, :].cpu().numpy()[0]
-                
-                # Simple sentiment scoring based on embedding statistics
-                # Positive sentiment tends to have higher mean activation
-                mean_activation = float(np.mean(embeddings))
-                std_activation = float(np.std(embeddings))
-                
-                # Normalize to 0-1 range (rough heuristic)
-                sentiment_score = np.clip((mean_activation + 1) / 2, 0, 1)
-                
-                # Apply negative keyword adjustment
-                negative_adjustment = self._check_negative_keywords(text)
-                sentiment_score = np.clip(sentiment_score + negative_adjustment, 0, 1)
-                
-                # Adjust based on rating
-                if rating is not None:
-                    rating_adjustment = (rating - 3) / 2 * 0.3
-                    sentiment_score = np.clip(sentiment_score + rating_adjustment, 0, 1)
-                
-                # Determine sentiment
-                if sentiment_score >= 0.6:
-                    sentiment = "Tích cực"
-                elif sentiment_score <= 0.4:
-                    sentiment = "Tiêu cực"
-                else:
-                    sentiment = "Trung lập"
-                
-                keywords = self._extract_keywords(text)
-                topic_info = self.classify_topic(text)
-                
-                # Auto-predict rating if not provided
-                predicted_rating = rating if rating is not None else self._predict_rating(text, sentiment_score)
-                
-                return {
-                    "sentiment": sentiment,
-                    "sentiment_score": round(sentiment_score, 2),
-                    "keywords": keywords[:5],
-                    "topic": topic_info["topic"],
-                    "topic_confidence": topic_info["confidence"],
-                    "predicted_rating": predicted_rating
-                }
+                embeddings = self._encode_cls(texts, token_ids, max_length)
+                with stage("sentiment", "postprocess"):
+                    return [
+                        self._score_embedding(text, rating, embedding)
+                        for text, rating, embedding in zip(texts, ratings, embeddings)
+                    ], True
             except Exception as e:
                 print(f"BERT embeddings error: {e}")
-                return self._fallback_analysis(text, rating)
+                return [self._fallback_analysis(text, rating) for text, rating in zip(texts, ratings)], False
         else:
             # Fallback to rule-based
-            return self._fallback_analysis(text, rating)
+            with stage("sentiment", "postprocess"):
+                return [self._fallback_analysis(text, rating) for text, rating in zip(texts, ratings)], True
+    
+    def _encode_cls(
+        self,
+        texts: List[str],
+        token_ids: Optional[List[List[int]]] = None,
+        max_length: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Tokenize texts with dynamic padding and return their [CLS] embeddings
+        
+        Padding only extends to the longest text of the micro-batch and padded
+        positions are masked out, so each row matches the single-text encoding.
+        """
+        backend = self.encoder_backend
+        tokenizer = self.tokenizer
+        with stage("sentiment", "tokenize"):
+            if token_ids is None:
+                token_ids = self._token_ids(tokenizer, texts)
+            max_length = max_length or self._max_length(tokenizer, DEFAULT_MODE)
+            budget = max_length - tokenizer.num_special_tokens_to_add(pair=False)
+            encodings = [
+                self._model_inputs(tokenizer, self._fit_length(ids, budget))
+                for ids in token_ids
+            ]
+            inputs = tokenizer.pad(encodings, padding=True, return_tensors=backend.tensor_type)
+        with stage("sentiment", "forward"):
+            last_hidden_state = backend(dict(inputs))
+        # Get [CLS] token embedding (first token)
+        return last_hidden_state[:, 0, :]
+    
+    def _zero_shot_fused(
+        self,
+        texts: List[str],
+        label_sets: List[List[str]],
+        token_ids: Optional[List[List[int]]] = None,
+        max_length: Optional[int] = None,
+    ) -> List[List[Dict]]:
+        """
+        Score several candidate label sets for each text in one batched NLI forward pass
+        
+        The pipeline runs one forward pass per (text, label) pair and is called
+        once per label set; here every (premise, hypothesis) pair of the
+        micro-batch is tokenized together and run through the model once.
+        Scores are normalized per label set exactly like the pipeline does
+        (softmax over the entailment logits), so results match it.
+        
+        Args:
+            token_ids: Premise token ids from _token_ids() (computed if None)
+            max_length: Token budget per (premise, hypothesis) pair; only the
+                premise is shortened, as with the pipeline's "only_first" truncation
+        
+        Returns:
+            One list per label set, holding a pipeline-style
+            {"labels": [...], "scores": [...]} dict (sorted by score) per text
+        """
+        zero_shot = self.zero_shot_pipeline
+        backend = self.nli_backend
+        template = "This example is {}."
+        tokenizer = zero_shot.tokenizer
+        hypotheses = [template.format(label) for labels in label_sets for label in labels]
+        with stage("sentiment", "tokenize"):
+            hypothesis_ids = self._token_ids(tokenizer, hypotheses)
+            if token_ids is None:
+                token_ids = self._token_ids(tokenizer, texts)
+            max_length = max_length or self._max_length(tokenizer, DEFAULT_MODE)
+            special = tokenizer.num_special_tokens_to_add(pair=True)
+            
+            encodings = []
+            for premise_ids in token_ids:
+                for pair_ids in hypothesis_ids:
+                    budget = max(1, max_length - special - len(pair_ids))
+                    encodings.append(self._model_inputs(tokenizer, self._fit_length(premise_ids, budget), pair_ids))
+            inputs = tokenizer.pad(encodings, padding=True, return_tensors=backend.tensor_type)
+        with stage("sentiment", "forward"):
+            logits = backend(dict(inputs))
+        entail_logits = logits[:, zero_shot.entailment_id].reshape(len(texts), len(hypotheses))
+        
+        results = []
+        offset = 0
+        for labels in label_sets:
+            group = entail_logits[:, offset:offset + len(labels)]
+            offset += len(labels)
+            exp = np.exp(group - group.max(axis=1, keepdims=True))
+            scores = exp / exp.sum(axis=1, keepdims=True)
+            per_text = []
+            for row in scores:
+                order = np.argsort(-row, kind="stable")
+                per_text.append({
+                    "labels": [labels[i] for i in order],
+                    "scores": [float(row[i]) for i in order],
+                })
+            results.append(per_text)
+        return results
+    
+    def _score_zero_shot(
+        self,
+        text: str,
+        rating: Optional[float],
+        result: Dict,
+        topic_result: Optional[Dict] = None,
+    ) -> Dict:
+        """Turn one zero-shot sentiment output (and optional topic output) into the analyze() result"""
+        # Get top label
+        top_label = result["labels"][0]
+        top_score = result["scores"][0]
+        
+        # Map to sentiment
+        sentiment_map = {
+            "Tích cực": "Tích cực",
+            "Trung lập": "Trung lập",
+            "Tiêu cực": "Tiêu cực"
+        }
+        sentiment = sentiment_map.get(top_label, "Trung lập")
+        
+        # Adjust based on rating if provided
+        if rating is not None:
+            rating_adjustment = (rating - 3) / 2  # -1 to 1
+            top_score = np.clip(top_score + rating_adjustment * 0.2, 0, 1)
+        
+        # Convert score to sentiment_score (0-1 scale)
+        sentiment_score = float(top_score)
+        
+        # Apply negative keyword adjustment
+        counts = keyword_counts(text)
+        negative_adjustment = self._check_negative_keywords(text, counts)
+        sentiment_score = np.clip(sentiment_score + negative_adjustment, 0, 1)
+        
+        # Re-determine sentiment after adjustment
+        if sentiment_score >= 0.6:
+            sentiment = "Tích cực"
+        elif sentiment_score <= 0.4:
+            sentiment = "Tiêu cực"
+        else:
+            sentiment = "Trung lập"
+        
+        # Extract keywords (simple: take important words)
+        keywords = self._extract_keywords(text)
+        topic_info = self.classify_topic(text, topic_result, counts)
+        
+        # Auto-predict rating if not provided
+        predicted_rating = rating if rating is not None else self._predict_rating(text, sentiment_score, counts)
+        
+        return {
+            "sentiment": sentiment,
+            "sentiment_score": round(sentiment_score, 2),
+            "keywords": keywords[:5],  # Top 5 keywords
+            "topic": topic_info["topic"],
+            "topic_confidence": topic_info["confidence"],
+            "predicted_rating": predicted_rating
+        }
+    
+    def _score_embedding(self, text: str, rating: Optional[float], embeddings: np.ndarray) -> Dict:
+        """Turn one [CLS] embedding into the analyze() result"""
+        # Simple sentiment scoring based on embedding statistics
+        # Positive sentiment tends to have higher mean activation
+        mean_activation = float(np.mean(embeddings))
+        
+        # Normalize to 0-1 range (rough heuristic)
+        sentiment_score = np.clip((mean_activation + 1) / 2, 0, 1)
+        
+        # Apply negative keyword adjustment
+        counts = keyword_counts(text)
+        negative_adjustment = self._check_negative_keywords(text, counts)
+        sentiment_score = np.clip(sentiment_score + negative_adjustment, 0, 1)
+        
+        # Adjust based on rating
+        if rating is not None:
+            rating_adjustment = (rating - 3) / 2 * 0.3
+            sentiment_score = np.clip(sentiment_score + rating_adjustment, 0, 1)
+        
+        # Determine sentiment
+        if sentiment_score >= 0.6:
+            sentiment = "Tích cực"
+        elif sentiment_score <= 0.4:
+            sentiment = "Tiêu cực"
+        else:
+            sentiment = "Trung lập"
+        
+        keywords = self._extract_keywords(text)
+        topic_info = self.classify_topic(text, counts=counts)
+        
+        # Auto-predict rating if not provided
+        predicted_rating = rating if rating is not None else self._predict_rating(text, sentiment_score, counts)
+        
+        return {
+            "sentiment": sentiment,
+            "sentiment_score": round(sentiment_score, 2),
+            "keywords": keywords[:5],
+            "topic": topic_info["topic"],
+            "topic_confidence": topic_info["confidence"],
+            "predicted_rating": predicted_rating
+        }
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text (simple implementation)"""
@@ -279,67 +833,44 @@ class BERTSentimentAnalyzer:
         # Return unique keywords
         return list(dict.fromkeys(keywords))[:10]
     
-    def classify_topic(self, text: str) -> Dict[str, float]:
+    def classify_topic(
+        self,
+        text: str,
+        zero_shot: Optional[Dict] = None,
+        counts: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, float]:
         """
         Classify topic of feedback using keyword matching and BERT embeddings
         
+        Args:
+            text: Input text
+            zero_shot: Precomputed zero-shot result over TOPIC_LABELS (skips the pipeline call)
+            counts: Precomputed keyword_counts(text)
+        
         Returns:
             Dict with topic name and confidence score
         """
-        text_lower = text.lower()
-        
-        # Topic keywords mapping (mapped to model enum values)
-        topic_keywords = {
-            "Lương": [
-                "lương", "thưởng", "tăng lương", "mức lương", "lương thấp", 
-                "lương cao", "bonus", "tiền lương", "lương bổng", "lương quá"
-            ],
-            "Môi trường": [
-                "môi trường", "đồng nghiệp", "văn phòng", "không gian", 
-                "làm việc", "nơi làm việc", "văn hóa", "team", "phòng ban"
-            ],
-            "Quản lý": [
-                "sếp", "quản lý", "trưởng phòng", "leader", "manager", 
-                "giám đốc", "điều hành", "lãnh đạo", "thiên vị", "công bằng"
-            ],
-            "Phúc lợi": [
-                "phúc lợi", "bảo hiểm", "nghỉ phép", "du lịch", "đào tạo", 
-                "khám sức khỏe", "gym", "ăn trưa", "xe đưa đón"
-            ],
-            "Khen ngợi": [
-                "tuyệt vời", "xuất sắc", "tốt", "cảm ơn", "đánh giá cao",
-                "hài lòng", "thích", "yêu thích"
-            ],
-            "Khiếu nại": [
-                "khiếu nại", "phàn nàn", "thất vọng", "không hài lòng",
-                "bất công", "nghỉ việc", "muốn nghỉ"
-            ],
-            "Góp ý": [
-                "góp ý", "đề xuất", "cải thiện", "tối ưu", "suggest"
-            ]
-        }
+        if counts is None:
+            counts = keyword_counts(text)
         
         # Count keyword matches for each topic
-        topic_scores = {}
-        for topic, keywords in topic_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            topic_scores[topic] = score
+        topic_scores = {topic: counts[f"topic:{topic}"] for topic in TOPIC_KEYWORDS}
         
         # If using BERT, enhance with embeddings
-        if self.model and self.tokenizer:
+        if zero_shot is None and self.model and self.tokenizer:
             try:
                 # Use zero-shot classification if available
                 if self.zero_shot_pipeline:
-                    candidate_labels = list(topic_keywords.keys())
                     try:
-                        result = self.zero_shot_pipeline(text, candidate_labels)
-                        # Merge with keyword scores
-                        for i, label in enumerate(result["labels"]):
-                            topic_scores[label] = topic_scores.get(label, 0) + result["scores"][i] * 2
+                        zero_shot = self.zero_shot_pipeline(text, TOPIC_LABELS)
                     except:
                         pass
             except:
                 pass
+        if zero_shot is not None:
+            # Merge with keyword scores
+            for i, label in enumerate(zero_shot["labels"]):
+                topic_scores[label] = topic_scores.get(label, 0) + zero_shot["scores"][i] * 2
         
         # Find top topic
         if not topic_scores or max(topic_scores.values()) == 0:
@@ -357,31 +888,17 @@ class BERTSentimentAnalyzer:
             "confidence": round(confidence, 2)
         }
     
-    def _check_negative_keywords(self, text: str) -> float:
+    def _check_negative_keywords(self, text: str, counts: Optional[Dict[str, int]] = None) -> float:
         """
         Check for negative keywords and phrases to adjust sentiment
         Returns adjustment factor (-1 to 0, where -1 is very negative)
         """
-        text_lower = text.lower()
-        
-        # Strong negative indicators
-        strong_negative = [
-            "quá", "không có", "không hoạt động", "không tốt", "không đủ",
-            "thường xuyên bị lỗi", "bị lỗi", "cũ", "khó", "rất nóng",
-            "ồn ào", "không công bằng", "thiên vị", "bất công",
-            "muốn nghỉ", "nghỉ việc", "thất vọng", "không hài lòng",
-            "kém", "tồi tệ", "tệ", "xấu", "chậm", "bực"
-        ]
-        
-        # Moderate negative indicators
-        moderate_negative = [
-            "vấn đề", "khó khăn", "thách thức", "cần cải thiện",
-            "chưa tốt", "chưa đủ", "hạn chế", "thiếu"
-        ]
+        if counts is None:
+            counts = keyword_counts(text)
         
         # Count negative indicators
-        strong_count = sum(1 for phrase in strong_negative if phrase in text_lower)
-        moderate_count = sum(1 for phrase in moderate_negative if phrase in text_lower)
+        strong_count = counts["strong_negative"]
+        moderate_count = counts["moderate_negative"]
         
         # Calculate adjustment (more negative = lower score)
         adjustment = -(strong_count * 0.3 + moderate_count * 0.15)
@@ -389,37 +906,18 @@ class BERTSentimentAnalyzer:
     
     def _fallback_analysis(self, text: str, rating: Optional[float] = None) -> Dict:
         """Fallback to rule-based if BERT fails"""
-        text_lower = text.lower()
-        
-        # Expanded positive words
-        positive_words = [
-            "tốt", "tuyệt", "hài lòng", "đẹp", "nhanh", "chuyên nghiệp",
-            "xuất sắc", "tuyệt vời", "cảm ơn", "đánh giá cao", "thích",
-            "yêu thích", "ưng ý", "tốt lắm", "rất tốt", "rất hài lòng"
-        ]
-        
-        # Expanded negative words
-        negative_words = [
-            "xấu", "tệ", "chậm", "bực", "không hài lòng", "khiếu nại",
-            "thất vọng", "kém", "tồi tệ", "không tốt", "không đủ",
-            "quá", "ồn ào", "cũ", "bị lỗi", "khó", "nóng", "thiên vị",
-            "bất công", "nghỉ việc", "muốn nghỉ"
-        ]
+        counts = keyword_counts(text)
         
         score = 0
         
         # Count positive words
-        for word in positive_words:
-            if word in text_lower:
-                score += 1
+        score += counts["fallback_positive"]
         
         # Count negative words (weighted more heavily)
-        for word in negative_words:
-            if word in text_lower:
-                score -= 1.5  # Negative words have more weight
+        score -= counts["fallback_negative"] * 1.5  # Negative words have more weight
         
         # Check for negative phrases
-        negative_adjustment = self._check_negative_keywords(text)
+        negative_adjustment = self._check_negative_keywords(text, counts)
         score += negative_adjustment * 5
         
         # Adjust based on rating if provided
@@ -438,10 +936,10 @@ class BERTSentimentAnalyzer:
         else:
             sentiment = "Trung lập"
         
-        topic_info = self.classify_topic(text)
+        topic_info = self.classify_topic(text, counts=counts)
         
         # Auto-predict rating if not provided
-        predicted_rating = rating if rating is not None else self._predict_rating(text, sentiment_score)
+        predicted_rating = rating if rating is not None else self._predict_rating(text, sentiment_score, counts)
         
         return {
             "sentiment": sentiment,
@@ -455,11 +953,16 @@ class BERTSentimentAnalyzer:
 
 # Global analyzer instance
 _analyzer = None
+_analyzer_lock = threading.Lock()
 
-def get_analyzer():
+def get_analyzer(create: bool = True):
+    """Shared analyzer; with create=False returns None instead of loading the model"""
     global _analyzer
-    if _analyzer is None:
-        _analyzer = BERTSentimentAnalyzer()
+    if _analyzer is None and create:
+        # Inference threads may ask concurrently; load the model only once
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = BERTSentimentAnalyzer()
     return _analyzer
 
 if __name__ == "__main__":
@@ -0,0 +1,248 @@
+"""
+Result cache for sentiment analysis
+
+Feedback often repeats short phrases ("Ổn", "Tốt") or templated complaints, and
+every one of them used to pay a full BERT forward pass. Results are cached
+under a hash of (normalized text, rating, model version) with LRU eviction and
+an optional TTL. Two backends are available:
+
+- "memory": process-local OrderedDict (default)
+- "sqlite": on-disk SQLite table, survives restarts and can be shared by workers
+
+Configuration (environment):
+    SENTIMENT_CACHE        memory | sqlite | off   (default: memory)
+    SENTIMENT_CACHE_SIZE   maximum number of entries (default: 10000)
+    SENTIMENT_CACHE_TTL    entry lifetime in seconds, 0 = no expiry (default: 0)
+    SENTIMENT_CACHE_PATH   SQLite file for the sqlite backend
+"""
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_SQLITE_PATH = Path(__file__).resolve().parent / "cache" / "sentiment_cache.sqlite3"
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize (NFC) and collapse whitespace; case is kept since the model sees it"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(text: str, rating: Optional[float], model_version: str) -> str:
+    rating_part = "" if rating is None else repr(float(rating))
+    payload = "\x1f".join([model_version, rating_part, normalize_text(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with optional TTL"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl) if ttl else 0.0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = _CacheStats()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict):
+        with self._lock:
+            self._data[key] = (time.time(), copy.deepcopy(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                **self._stats.as_dict(),
+            }
+
+
+class SQLiteCache:
+    """
+    LRU cache with optional TTL stored in a SQLite file
+
+    The row count used for eviction is kept in memory and only re-read with
+    COUNT(*) every RECOUNT_EVERY writes (and by stats()), since COUNT(*) scans
+    the table. Workers sharing the file see each other's rows at the next
+    recount, so the table may briefly exceed max_entries by a few thousand rows.
+    """
+
+    backend = "sqlite"
+    RECOUNT_EVERY = 1000
+
+    def __init__(self, path: Path = DEFAULT_SQLITE_PATH, max_entries: int = 10000, ttl: float = 0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl) if ttl else 0.0
+        self._lock = threading.Lock()
+        self._stats = _CacheStats()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS sentiment_cache_accessed ON sentiment_cache (accessed_at)"
+        )
+        self._size = self._count()
+        self._writes = 0
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM sentiment_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            value, stored_at = row
+            if self.ttl and now - stored_at > self.ttl:
+                cursor = self._conn.execute("DELETE FROM sentiment_cache WHERE key = ?", (key,))
+                self._size -= cursor.rowcount
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._conn.execute("UPDATE sentiment_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict):
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            replaced = self._conn.execute(
+                "UPDATE sentiment_cache SET value = ?, stored_at = ?, accessed_at = ? WHERE key = ?",
+                (payload, now, now, key),
+            ).rowcount
+            if not replaced:
+                # OR REPLACE: another worker may have inserted the key meanwhile
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, payload, now, now),
+                )
+                self._size += 1
+            self._writes += 1
+            if self._writes % self.RECOUNT_EVERY == 0:
+                self._size = self._count()
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                evicted = self._conn.execute(
+                    "DELETE FROM sentiment_cache WHERE key IN ("
+                    " SELECT key FROM sentiment_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+                self._size -= evicted
+                self._stats.evictions += evicted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM sentiment_cache")
+            self._size = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._size = self._count()
+            return {
+                "backend": self.backend,
+                "size": self._size,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "path": str(self.path),
+                **self._stats.as_dict(),
+            }
+
+
+def build_cache(backend: str = "memory", max_entries: int = 10000, ttl: float = 0, path: Optional[Path] = None):
+    """Create a cache for the given backend name ("memory", "sqlite" or "off")"""
+    backend = (backend or "off").lower()
+    if backend in ("off", "none", "0", "false"):
+        return None
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteCache(path=path or DEFAULT_SQLITE_PATH, max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Unknown sentiment cache backend: {backend}")
+
+
+_cache = None
+_cache_built = False
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Process-wide cache configured from the environment (None when disabled)"""
+    global _cache, _cache_built
+    if not _cache_built:
+        with _cache_lock:
+            if not _cache_built:
+                _cache = build_cache(
+                    backend=os.getenv("SENTIMENT_CACHE", "memory"),
+                    max_entries=int(os.getenv("SENTIMENT_CACHE_SIZE", "10000")),
+                    ttl=float(os.getenv("SENTIMENT_CACHE_TTL", "0")),
+                    path=os.getenv("SENTIMENT_CACHE_PATH") or None,
+                )
+                _cache_built = True
+    return _cache
@@ -0,0 +1,89 @@
+"""
+Background model warmup with per-model startup timings
+
+Models are loaded in a worker thread after the server starts accepting
+connections, so liveness checks pass immediately while readiness only turns
+green once every required model is loaded and has run a warmup forward pass
+(which allocates buffers and triggers lazy initialization before real traffic).
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ModelWarmup:
+    def __init__(self):
+        self._steps: List[Dict[str, Any]] = []
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def register(
+        self,
+        name: str,
+        load: Callable[[], Any],
+        warmup: Optional[Callable[[Any], Any]] = None,
+        required: bool = True,
+    ):
+        """
+        Args:
+            name: Model name shown in the startup report
+            load: Loads the model and returns it
+            warmup: Optional dummy inference run on the loaded model
+            required: Whether readiness waits for this model
+        """
+        self._steps.append({"name": name, "load": load, "warmup": warmup, "required": required})
+        self._status[name] = {"status": "pending", "required": required}
+
+    def start(self):
+        """Load every registered model in a daemon thread (idempotent)"""
+        if self._thread is not None:
+            return
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+        self._thread.start()
+
+    def _update(self, name: str, **fields):
+        with self._lock:
+            self._status[name].update(fields)
+
+    def _run(self):
+        for step in self._steps:
+            name = step["name"]
+            self._update(name, status="loading")
+            try:
+                started = time.perf_counter()
+                model = step["load"]()
+                self._update(name, load_seconds=round(time.perf_counter() - started, 3))
+                if step["warmup"] is not None:
+                    self._update(name, status="warming")
+                    started = time.perf_counter()
+                    step["warmup"](model)
+                    self._update(name, warmup_seconds=round(time.perf_counter() - started, 3))
+                self._update(name, status="ready")
+            except Exception as error:
+                print(f"Warning: warmup of {name} failed: {error}")
+                self._update(name, status="failed", error=str(error))
+        self.finished_at = time.time()
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        """Readiness of one model, or of all required models when name is None"""
+        with self._lock:
+            if name is not None:
+                return self._status.get(name, {}).get("status") == "ready"
+            return all(s["status"] == "ready" for s in self._status.values() if s["required"])
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {name: dict(status) for name, status in self._status.items()}
+        total = None
+        if self.started_at is not None:
+            total = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "ready": self.is_ready(),
+            "startup_seconds": total,
+            "finished": self.finished_at is not None,
+            "models": models,
+        }